@@ -0,0 +1,172 @@
+"""
+定点金额模块
+
+金额以“整数最小单位 + 小数位数”表示，由金额转换一次性生成，
+后续统计、合并对账和写出都直接使用，避免 float/Decimal/字符串之间的反复转换。
+定点金额不是 float：只与整数、Decimal 和定点金额按精确值比较，
+需要二进制浮点数时必须显式调用 float()。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+from functools import total_ordering
+from typing import Any
+
+from .parsing import try_parse_decimal
+
+# 定点金额支持的最大小数位数与最大整数位数（与 Decimal 默认精度一致）。
+# 超出范围的值直接拒绝，避免 "1e999999999" 这类输入在 10 的幂运算上耗尽时间
+MAX_SCALE = 28
+MAX_INTEGER_DIGITS = 28
+
+
+@total_ordering
+@dataclass(frozen=True, slots=True, eq=False)
+class FixedAmount:
+    """
+    定点金额
+
+    精确值保存在 units（整数最小单位）与 scale（小数位数）中，构建时不做任何浮点运算。
+    相等、大小与哈希按数值计算：FixedAmount(100, 2) 与 FixedAmount(1, 0)、1、Decimal("1") 相等；
+    与 float 比较不受支持，== 返回 False。
+    str() 输出保留全部小数位的十进制文本，format() 按 Decimal 的格式规则以四舍五入输出。
+    """
+
+    units: int
+    scale: int
+
+    def __post_init__(self) -> None:
+        if self.scale < 0:
+            raise ValueError(f"小数位数不能为负数: {self.scale}")
+        if self.scale > MAX_SCALE:
+            raise ValueError(f"小数位数超出支持范围（最多 {MAX_SCALE} 位）: {self.scale}")
+
+    @classmethod
+    def from_decimal(cls, value: Decimal) -> "FixedAmount":
+        """
+        从有限 Decimal 构建定点金额，小数位数取自 Decimal 的指数
+
+        Args:
+            value: 有限 Decimal 值
+
+        Returns:
+            FixedAmount: 精确等值的定点金额
+
+        Raises:
+            ValueError: 当值为 NaN、无穷大，或小数位数、整数位数超出支持范围时抛出
+        """
+        if not value.is_finite():
+            raise ValueError(f"金额必须是有限数值: {value}")
+        sign, digits, exponent = value.as_tuple()
+        exponent = int(exponent)
+        # 先按指数判断范围，再做 10 的幂运算
+        if -exponent > MAX_SCALE or len(digits) + exponent > MAX_INTEGER_DIGITS:
+            raise ValueError(f"金额超出支持范围: {value}")
+        units = int("".join(map(str, digits)))
+        if exponent > 0:
+            units *= 10**exponent
+        return cls(-units if sign else units, max(0, -exponent))
+
+    @classmethod
+    def try_from_value(cls, value: Any) -> "FixedAmount | None":
+        """
+        尝试将任意金额值转换为定点金额
+
+        Args:
+            value: FixedAmount、数字或数值字符串
+
+        Returns:
+            FixedAmount | None: 转换结果，无法解析、非有限值或超出支持范围时返回 None
+        """
+        if isinstance(value, FixedAmount):
+            return value
+        if isinstance(value, bool):
+            return None
+        parsed = try_parse_decimal(value)
+        if parsed is None or not parsed.is_finite():
+            return None
+        try:
+            return cls.from_decimal(parsed)
+        except ValueError:
+            return None
+
+    def to_decimal(self) -> Decimal:
+        """返回精确等值的 Decimal。"""
+        return Decimal(f"{self.units}E-{self.scale}")
+
+    def __float__(self) -> float:
+        return self.units / 10**self.scale
+
+    def __bool__(self) -> bool:
+        return self.units != 0
+
+    def __str__(self) -> str:
+        return f"{self.to_decimal():f}"
+
+    def __format__(self, format_spec: str) -> str:
+        if not format_spec:
+            return str(self)
+        # 金额显示按四舍五入，与金额转换的默认舍入方式一致，而不是 Decimal 默认的银行家舍入
+        with localcontext() as context:
+            context.rounding = ROUND_HALF_UP
+            return format(self.to_decimal(), format_spec)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FixedAmount):
+            scale = max(self.scale, other.scale)
+            return self.rescale(scale) == other.rescale(scale)
+        if isinstance(other, (int, Decimal)) and not isinstance(other, bool):
+            return self.to_decimal() == other
+        return NotImplemented
+
+    def __lt__(self, other: object) -> bool:
+        if isinstance(other, FixedAmount):
+            scale = max(self.scale, other.scale)
+            return self.rescale(scale) < other.rescale(scale)
+        if isinstance(other, (int, Decimal)) and not isinstance(other, bool):
+            return self.to_decimal() < other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # 与相等的 int、Decimal 哈希一致
+        return hash(self.to_decimal())
+
+    def rescale(self, scale: int) -> int:
+        """
+        返回指定小数位数下的整数最小单位
+
+        Args:
+            scale: 目标小数位数，必须不小于当前小数位数
+
+        Returns:
+            int: 目标小数位数下的最小单位数量
+        """
+        if scale < self.scale:
+            raise ValueError(f"无法在不损失精度的情况下缩小小数位数: {self.scale} -> {scale}")
+        return self.units * 10 ** (scale - self.scale)
+
+
+class AmountAccumulator:
+    """定点金额累加器，按整数最小单位精确求和。"""
+
+    __slots__ = ("_units", "_scale")
+
+    def __init__(self) -> None:
+        self._units = 0
+        self._scale = 0
+
+    def add(self, amount: FixedAmount) -> None:
+        """累加一笔定点金额。"""
+        if amount.scale == self._scale:
+            self._units += amount.units
+            return
+        if amount.scale > self._scale:
+            self._units *= 10 ** (amount.scale - self._scale)
+            self._scale = amount.scale
+        self._units += amount.rescale(self._scale)
+
+    def total(self) -> FixedAmount:
+        """返回当前累加总额。"""
+        return FixedAmount(self._units, self._scale)
@@ -0,0 +1,211 @@
+"""
+列式校验模块
+
+按列执行已编译的校验计划：每条规则在整列上以紧凑循环运行，
+数值 min/max 在安装了 NumPy 时使用向量化比较筛选候选行，跨行规则以增量状态沿列扫描。
+错误语义与逐行校验一致：报告首个失败行，并沿用逐行校验的错误消息。
+"""
+
+from __future__ import annotations
+
+import logging
+from itertools import islice, repeat
+from typing import Any, Iterable, Mapping, Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore
+
+from .amount import FixedAmount
+from .validator import CrossRowRule, TypeChecker, ValidationError, ValidationPlan, _RangeCheck
+
+
+logger = logging.getLogger(__name__)
+
+# 列中缺失字段的占位值，区别于值为 None 的字段
+MISSING = object()
+
+# 可转为 float64 数组做区间预筛的值类型（不含 bool）；定点金额经 float() 显式转换，预筛后仍按精确值确认
+_VECTOR_NUMERIC_TYPES = frozenset({int, float, FixedAmount})
+
+
+def rows_to_columns(rows: Sequence[Mapping[str, Any]], fields: Iterable[str]) -> dict[str, list[Any]]:
+    """
+    将行数据转换为列数组
+
+    Args:
+        rows: 行数据
+        fields: 需要提取的字段
+
+    Returns:
+        dict[str, list[Any]]: 字段名到列数组的映射，行中缺失的字段以 MISSING 占位
+    """
+    return {field: [row.get(field, MISSING) for row in rows] for field in fields}
+
+
+def find_first_invalid_row(plan: ValidationPlan, columns: Mapping[str, Sequence[Any]], row_count: int) -> int | None:
+    """
+    按列执行校验计划，返回首个失败行的下标
+
+    Args:
+        plan: 已编译的校验计划
+        columns: 字段名到列数组的映射，缺失的列视为该字段在所有行中都不存在
+        row_count: 行数
+
+    Returns:
+        int | None: 首个失败行的下标（从 0 开始），全部通过时返回 None
+    """
+    first_invalid: int | None = None
+
+    def column_of(field: str) -> Sequence[Any]:
+        column = columns.get(field)
+        return column if column is not None else [MISSING] * row_count
+
+    for field in plan.required_fields:
+        index = _first_required_failure(column_of(field))
+        first_invalid = _earliest(first_invalid, index)
+
+    for field, checker in plan.type_checks:
+        index = _first_type_failure(field, column_of(field), checker, first_invalid)
+        first_invalid = _earliest(first_invalid, index)
+
+    for range_check in plan.range_checks:
+        index = _first_range_failure(range_check, column_of(range_check.field), first_invalid)
+        first_invalid = _earliest(first_invalid, index)
+
+    for rule in plan.cross_row_rules:
+        values = repeat(None, row_count) if rule.field is None else column_of(rule.field)
+        index = _first_cross_row_failure(rule, values, first_invalid)
+        first_invalid = _earliest(first_invalid, index)
+
+    return first_invalid
+
+
+def validate_columns(plan: ValidationPlan, columns: Mapping[str, Sequence[Any]], row_count: int) -> None:
+    """
+    按列执行校验计划，失败时抛出与逐行校验相同的错误
+
+    Args:
+        plan: 已编译的校验计划
+        columns: 字段名到列数组的映射
+        row_count: 行数
+
+    Raises:
+        ValidationError: 首个失败行的首个错误
+    """
+    index = find_first_invalid_row(plan, columns, row_count)
+    if index is None:
+        return
+
+    def row_at(position: int) -> dict[str, Any]:
+        return {field: column[position] for field, column in columns.items() if column[position] is not MISSING}
+
+    plan.validate(row_at(index))
+    # 逐行规则通过时，失败来自跨行规则，重放到该行以得到相同的错误
+    cross_row = plan.start_cross_row()
+    for position in range(index + 1):
+        cross_row.check(row_at(position))
+
+
+def _earliest(current: int | None, candidate: int | None) -> int | None:
+    if candidate is None:
+        return current
+    if current is None or candidate < current:
+        return candidate
+    return current
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _first_required_failure(column: Sequence[Any]) -> int | None:
+    for index, value in enumerate(column):
+        if value is MISSING or value is None:
+            return index
+        if isinstance(value, str):
+            if not value.strip():
+                return index
+        elif isinstance(value, (list, dict)) and not value:
+            return index
+    return None
+
+
+def _first_type_failure(
+    field: str,
+    column: Sequence[Any],
+    checker: TypeChecker,
+    stop: int | None,
+) -> int | None:
+    warned_missing = False
+    for index, value in enumerate(column if stop is None else column[:stop]):
+        if value is MISSING:
+            if not warned_missing:
+                logger.warning("字段 '%s' 不存在，跳过类型验证", field)
+                warned_missing = True
+            continue
+        if _is_blank(value):
+            continue
+        try:
+            checker(field, value)
+        except ValidationError:
+            return index
+    return None
+
+
+def _first_range_failure(range_check: _RangeCheck, column: Sequence[Any], stop: int | None) -> int | None:
+    scan = column if stop is None else column[:stop]
+    candidates: Iterable[int] = range(len(scan))
+    if range_check.numeric_bounds_only:
+        vector_candidates = _numeric_bound_candidates(range_check, scan)
+        if vector_candidates is not None:
+            candidates = vector_candidates
+
+    warned_missing = False
+    for index in candidates:
+        value = scan[index]
+        if value is MISSING:
+            if not warned_missing:
+                logger.warning("字段 '%s' 不存在，跳过范围验证", range_check.field)
+                warned_missing = True
+            continue
+        if _is_blank(value):
+            continue
+        try:
+            range_check.check(value)
+        except ValidationError:
+            return index
+    return None
+
+
+def _first_cross_row_failure(rule: CrossRowRule, values: Iterable[Any], stop: int | None) -> int | None:
+    step = rule.start()
+    for index, value in enumerate(values if stop is None else islice(values, stop)):
+        if step(None if value is MISSING else value) is not None:
+            return index
+    return None
+
+
+def _numeric_bound_candidates(range_check: _RangeCheck, column: Sequence[Any]) -> list[int] | None:
+    """
+    用 NumPy 筛选可能越界的行
+
+    预筛使用包含边界的 float64 比较：精确值越界的行在浮点比较下一定也落在边界上或边界外，
+    因此候选集合不会漏掉真实失败行，候选行再由逐值精确比较确认。
+    """
+    if numpy is None or not column:
+        return None
+    if not all(map(_VECTOR_NUMERIC_TYPES.__contains__, map(type, column))):
+        return None
+    try:
+        values = numpy.asarray(column, dtype=numpy.float64)
+    except (OverflowError, ValueError):
+        return None
+
+    inside = numpy.ones(len(values), dtype=bool)
+    if range_check.min_cmp is not None:
+        inside &= values > float(range_check.min_cmp)
+    if range_check.max_cmp is not None:
+        inside &= values < float(range_check.max_cmp)
+    return numpy.flatnonzero(~inside).tolist()
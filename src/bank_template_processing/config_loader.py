@@ -8,11 +8,12 @@ from copy import deepcopy
 import json
 import logging
 from datetime import date, datetime
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 from typing import Any, Mapping, cast
 
 from .config_types import AppConfig, RuleGroupConfig
-from .transformer import Transformer
+from .parsing import try_parse_date, try_parse_decimal
+from .template_selector import ALIAS_WILDCARD, BankAliasIndex, normalize_bank_name
 
 logger = logging.getLogger(__name__)
 
@@ -226,7 +227,7 @@ def _validate_unit_config(unit_name: str, unit_config: dict[str, Any]) -> None:
         # 多规则组结构：验证每个规则组
         for rule_name, rule_config in unit_config.items():
             if rule_name == "template_selector":
-                _validate_template_selector(unit_name, rule_config)
+                _validate_template_selector(unit_name, rule_config, unit_config)
                 continue
             if rule_name == "input_filename_routing":
                 _validate_input_filename_routing(unit_name, rule_config, unit_config)
@@ -254,17 +255,10 @@ def _classify_range_bound_kind(value: Any) -> str:
         normalized = value.strip()
         if not normalized:
             raise TypeError("空字符串不能作为范围边界")
-        try:
-            Decimal(normalized)
+        if try_parse_decimal(normalized) is not None:
             return "numeric"
-        except (InvalidOperation, TypeError, ValueError):
-            pass
-        for fmt in Transformer.DATE_INPUT_FORMATS:
-            try:
-                datetime.strptime(normalized, fmt)
-                return "date"
-            except ValueError:
-                continue
+        if try_parse_date(normalized) is not None:
+            return "date"
         raise TypeError(f"无法解析范围边界: {value}")
     raise TypeError(f"不支持的范围边界类型: {type(value).__name__}")
 
@@ -343,6 +337,28 @@ def _validate_validation_rules(
                     f"{prefix} 的 validation_rules.value_ranges 中 '{field_name}' 的 min/max 必须同为数值或同为日期"
                 )
 
+    if "unique_fields" in validation_rules:
+        unique_fields = validation_rules["unique_fields"]
+        if not isinstance(unique_fields, list) or any(not isinstance(item, str) for item in unique_fields):
+            raise ConfigError(f"{prefix} 的 validation_rules.unique_fields 必须是字符串列表")
+
+    if "max_total" in validation_rules:
+        max_total = validation_rules["max_total"]
+        if not isinstance(max_total, dict):
+            raise ConfigError(f"{prefix} 的 validation_rules.max_total 必须是字典")
+        for field_name, limit in max_total.items():
+            try:
+                limit_kind = _classify_range_bound_kind(limit)
+            except TypeError as exc:
+                raise ConfigError(f"{prefix} 的 validation_rules.max_total 中 '{field_name}' 无效: {exc}") from exc
+            if limit_kind != "numeric":
+                raise ConfigError(f"{prefix} 的 validation_rules.max_total 中 '{field_name}' 必须是数值")
+
+    if "max_rows_per_file" in validation_rules:
+        max_rows = validation_rules["max_rows_per_file"]
+        if not isinstance(max_rows, int) or isinstance(max_rows, bool) or max_rows < 1:
+            raise ConfigError(f"{prefix} 的 validation_rules.max_rows_per_file 必须是正整数")
+
 
 def _validate_legacy_unit_config(unit_name: str, unit_config: dict[str, Any]) -> None:
     """
@@ -498,8 +514,12 @@ def _validate_rule_group_config(unit_name: str, rule_name: str, rule_config: dic
     _validate_reader_options(unit_name, rule_config, rule_name=rule_name)
 
 
-def _validate_template_selector(unit_name: str, template_selector: Any) -> None:
-    """验证 template_selector 配置。"""
+def _validate_template_selector(
+    unit_name: str,
+    template_selector: Any,
+    unit_config: Mapping[str, Any] | None = None,
+) -> None:
+    """验证 template_selector 配置；传入多规则组单位配置时同时检查 routes 引用的规则组。"""
     prefix = f"单位 '{unit_name}' 的 template_selector"
 
     if not isinstance(template_selector, dict):
@@ -527,6 +547,84 @@ def _validate_template_selector(unit_name: str, template_selector: Any) -> None:
     if enabled and "default_bank" not in template_selector:
         raise ConfigError(f"{prefix}.enabled=true 时必须配置 default_bank")
 
+    # 先验证别名，路由校验需要按别名解析银行名称
+    if "bank_aliases" in template_selector:
+        _validate_bank_aliases(prefix, template_selector["bank_aliases"])
+
+    if "routes" in template_selector:
+        _validate_template_selector_routes(prefix, template_selector, unit_config)
+
+
+def _validate_bank_aliases(prefix: str, bank_aliases: Any) -> None:
+    """验证 template_selector.bank_aliases：标准银行名称到别名列表的映射。"""
+    if not isinstance(bank_aliases, dict):
+        raise ConfigError(f"{prefix}.bank_aliases 必须是字典")
+
+    # 归一化后的别名（含通配符）-> 标准名称，同一别名不能指向不同银行
+    seen_aliases: dict[str, str] = {}
+    for canonical, aliases in bank_aliases.items():
+        if not isinstance(canonical, str) or not canonical.strip():
+            raise ConfigError(f"{prefix}.bank_aliases 的银行名称必须是非空字符串")
+        alias_prefix = f"{prefix}.bank_aliases['{canonical}']"
+        if not isinstance(aliases, list):
+            raise ConfigError(f"{alias_prefix} 必须是列表")
+
+        target = normalize_bank_name(canonical)
+        for alias in aliases:
+            if not isinstance(alias, str) or not alias.strip():
+                raise ConfigError(f"{alias_prefix} 中的别名必须是非空字符串")
+            pattern = normalize_bank_name(alias)
+            # 去掉一端的通配符后剩余部分不能为空，也不能再含通配符
+            if pattern.startswith(ALIAS_WILDCARD):
+                body = pattern[1:]
+            elif pattern.endswith(ALIAS_WILDCARD):
+                body = pattern[:-1]
+            else:
+                body = pattern
+            if not body or ALIAS_WILDCARD in body:
+                raise ConfigError(f"{alias_prefix} 中的别名 '{alias}' 只能在开头或结尾使用一个 '{ALIAS_WILDCARD}'")
+
+            previous = seen_aliases.setdefault(pattern, target)
+            if previous != target:
+                raise ConfigError(f"{prefix}.bank_aliases 中别名 '{alias}' 同时指向 '{previous}' 和 '{target}'")
+
+
+def _validate_template_selector_routes(
+    prefix: str,
+    template_selector: Mapping[str, Any],
+    unit_config: Mapping[str, Any] | None,
+) -> None:
+    """验证 template_selector.routes：银行名称到规则组的映射。"""
+    routes = template_selector["routes"]
+    if not isinstance(routes, dict):
+        raise ConfigError(f"{prefix}.routes 必须是字典")
+
+    # 与分组时一致的归一化与别名解析，避免两种写法或同一银行的两个别名指向不同规则组
+    aliases = BankAliasIndex(template_selector.get("bank_aliases"))
+    seen_banks: dict[str, str] = {}
+    default_bank = template_selector.get("default_bank")
+    if isinstance(default_bank, str):
+        seen_banks[aliases.resolve(normalize_bank_name(default_bank))] = "default"
+
+    reserved_keys = {"template_selector", "input_filename_routing", "special"}
+    for bank, rule_group in routes.items():
+        if not isinstance(bank, str) or not bank.strip():
+            raise ConfigError(f"{prefix}.routes 的银行名称必须是非空字符串")
+        if not isinstance(rule_group, str) or not rule_group.strip():
+            raise ConfigError(f"{prefix}.routes['{bank}'] 必须是非空字符串")
+        if rule_group in reserved_keys:
+            raise ConfigError(f"{prefix}.routes['{bank}'] 不能引用保留字段: {rule_group}")
+        if unit_config is not None and not isinstance(unit_config.get(rule_group), dict):
+            raise ConfigError(f"{prefix}.routes['{bank}'] 的规则组 '{rule_group}' 未在单位配置中定义")
+
+        canonical_bank = aliases.resolve(normalize_bank_name(bank))
+        previous = seen_banks.setdefault(canonical_bank, rule_group)
+        if previous != rule_group:
+            raise ConfigError(
+                f"{prefix}.routes 中银行 '{bank}'（标准名称 '{canonical_bank}'）"
+                f"同时指向规则组 '{previous}' 和 '{rule_group}'"
+            )
+
 
 def _validate_input_filename_routing(
     unit_name: str,
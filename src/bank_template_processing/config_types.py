@@ -36,6 +36,9 @@ class ValidationRules(TypedDict, total=False):
     required_fields: list[str]
     data_types: dict[str, str]
     value_ranges: dict[str, ValidationRangeRule]
+    unique_fields: list[str]
+    max_total: dict[str, Any]
+    max_rows_per_file: int
 
 
 class FieldMappingConfig(TypedDict, total=False):
@@ -75,6 +78,8 @@ class TemplateSelectorConfig(TypedDict, total=False):
 
     enabled: bool
     default_bank: str
+    routes: dict[str, str]
+    bank_aliases: dict[str, list[str]]
     special_template: str
     bank_column: str
     default_group_name: str
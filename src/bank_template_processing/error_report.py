@@ -0,0 +1,113 @@
+"""
+数据错误收集模块
+
+--collect-errors 模式下，校验与转换阶段遇到数据错误时不立即中止，
+而是记录为结构化违规项，运行结束时统一写出错误报告并失败退出。
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+
+# --collect-errors 未指定数量时最多记录的违规项数
+DEFAULT_ERROR_LIMIT = 100
+# 错误报告文件名，写在输出目录下
+ERROR_REPORT_FILENAME = "数据错误报告.csv"
+
+_REPORT_HEADER = ("阶段", "位置", "行号", "字段", "规则", "值", "错误信息")
+
+
+@dataclass(frozen=True)
+class Violation:
+    """单条数据违规记录。"""
+
+    stage: str
+    row_number: int | None
+    field: str | None
+    rule: str
+    value: Any
+    message: str
+    location: str = ""
+
+
+class ErrorCollector:
+    """
+    有上限的数据错误收集器
+
+    超过上限的违规项只计数不保存，避免全表出错时占用大量内存。
+    """
+
+    def __init__(self, limit: int = DEFAULT_ERROR_LIMIT):
+        if limit < 1:
+            raise ValueError(f"错误收集上限必须为正整数: {limit}")
+        self.limit = limit
+        self.total = 0
+        self._violations: list[Violation] = []
+
+    def add(self, violation: Violation) -> None:
+        """记录一条违规项。"""
+        self.total += 1
+        if len(self._violations) < self.limit:
+            self._violations.append(violation)
+
+    @property
+    def violations(self) -> list[Violation]:
+        """已记录的违规项（不超过上限）。"""
+        return list(self._violations)
+
+    @property
+    def omitted(self) -> int:
+        """超过上限未记录的违规项数量。"""
+        return self.total - len(self._violations)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Violation]:
+        return iter(self._violations)
+
+    def write_report(self, path: str | Path) -> Path:
+        """
+        将违规项写出为 CSV 报告
+
+        Args:
+            path: 报告文件路径
+
+        Returns:
+            Path: 报告文件路径
+        """
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        # utf-8-sig 便于直接用 Excel 打开中文内容
+        with report_path.open("w", encoding="utf-8-sig", newline="") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(_REPORT_HEADER)
+            for violation in self._violations:
+                writer.writerow(
+                    (
+                        violation.stage,
+                        violation.location,
+                        "" if violation.row_number is None else violation.row_number,
+                        violation.field or "",
+                        violation.rule,
+                        "" if violation.value is None else violation.value,
+                        violation.message,
+                    )
+                )
+            if self.omitted:
+                omitted_message = f"另有 {self.omitted} 处错误超过记录上限 {self.limit}，未写入报告"
+                writer.writerow(("",) * (len(_REPORT_HEADER) - 1) + (omitted_message,))
+        return report_path
+
+    def summary(self, report_path: str | Path | None = None) -> str:
+        """生成用于最终失败退出的汇总信息。"""
+        message = f"共发现 {self.total} 处数据错误"
+        if self.omitted:
+            message += f"（报告记录前 {self.limit} 处）"
+        if report_path is not None:
+            message += f"，详见报告：{report_path}"
+        return message
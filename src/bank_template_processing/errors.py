@@ -0,0 +1,75 @@
+"""
+数据错误基类模块
+
+ValidationError 与 TransformError 共用的结构化异常基类。
+异常携带字段、值、规则、行号等结构化信息，消息在首次读取时才格式化；
+构造时不记录日志，日志统一由 main 在处理边界输出。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class DataError(Exception):
+    """
+    结构化数据错误
+
+    既可直接传入完整消息，也可通过 template 传入消息模板，
+    模板可引用 field、value、rule、row 以及额外的关键字参数，仅在需要展示时格式化。
+    """
+
+    def __init__(
+        self,
+        message: str | None = None,
+        *,
+        template: str | None = None,
+        field: str | None = None,
+        value: Any = None,
+        rule: str | None = None,
+        row: int | None = None,
+        **params: Any,
+    ):
+        super().__init__(message if message is not None else template)
+        self._message = message
+        self._template = template
+        self._params = params
+        self.field = field
+        self.value = value
+        self.rule = rule
+        self.row = row
+
+    @property
+    def message(self) -> str:
+        """错误消息，按模板创建的异常在首次读取时格式化并缓存。"""
+        if self._message is None:
+            self._message = (self._template or "").format(
+                field=self.field,
+                value=self.value,
+                rule=self.rule,
+                row=self.row,
+                **self._params,
+            )
+        return self._message
+
+    def __str__(self) -> str:
+        return self.message
+
+    def with_message(self, message: str, *, row: int | None = None) -> "DataError":
+        """
+        返回消息替换后的同类异常，保留结构化字段
+
+        Args:
+            message: 新的完整消息
+            row: 行号，省略时沿用原行号
+
+        Returns:
+            DataError: 新异常
+        """
+        return self.__class__(
+            message,
+            field=self.field,
+            value=self.value,
+            rule=self.rule,
+            row=self.row if row is None else row,
+        )
@@ -1,11 +1,11 @@
 """Excel文件读取器模块
 
-支持读取 .xlsx, .xls 格式的文件，并将数据转换为字典列表。
+支持读取 .xlsx, .xls 格式的文件，并将数据转换为字典列表，或逐行迭代而不构建完整列表。
 """
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any
 
 import openpyxl
 import xlrd
@@ -54,7 +54,43 @@ class ExcelReader:
             ExcelError: 文件格式无效或不支持
         """
         logger.info(f"开始读取文件: {file_path}")
+        file_ext = self._check_input_file(file_path)
 
+        try:
+            if file_ext == ".xlsx":
+                return self._read_xlsx(file_path)
+            else:
+                return self._read_xls(file_path)
+        except ExcelError:
+            # 重新抛出ExcelError
+            raise
+        except Exception as e:
+            logger.error(f"读取文件失败: {file_path}, 错误: {e}", exc_info=True)
+            raise ExcelError(f"读取文件失败: {file_path}: {e}") from e
+
+    def iter_excel(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐行读取Excel文件，不构建完整的字典列表
+
+        .xlsx 以只读模式流式读取；.xls 受 xlrd 限制仍整体加载工作簿，但同样逐行产出。
+        文件检查在调用时立即执行，读取错误在迭代过程中抛出。
+
+        Args:
+            file_path: Excel文件路径
+
+        Returns:
+            逐行产出字典的迭代器
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            ExcelError: 文件格式无效或不支持
+        """
+        logger.info(f"开始逐行读取文件: {file_path}")
+        file_ext = self._check_input_file(file_path)
+        rows = self._iter_xlsx(file_path) if file_ext == ".xlsx" else self._iter_xls(file_path)
+        return self._wrap_read_errors(rows, file_path)
+
+    def _check_input_file(self, file_path: str) -> str:
+        """检查文件存在且格式受支持，返回小写扩展名"""
         # 检查文件是否存在
         path = Path(file_path)
         if not path.exists():
@@ -63,17 +99,16 @@ class ExcelReader:
 
         # 根据文件扩展名选择读取方式
         file_ext = path.suffix.lower()
+        if file_ext not in (".xlsx", ".xls"):
+            logger.error(f"不支持的文件格式: {file_ext}")
+            raise ExcelError(f"不支持的文件格式: {file_ext}")
+        return file_ext
 
+    def _wrap_read_errors(self, rows: Iterator[Dict[str, Any]], file_path: str) -> Iterator[Dict[str, Any]]:
+        """与 read_excel 一致地将未知读取错误包装为 ExcelError"""
         try:
-            if file_ext == ".xlsx":
-                return self._read_xlsx(file_path)
-            elif file_ext == ".xls":
-                return self._read_xls(file_path)
-            else:
-                logger.error(f"不支持的文件格式: {file_ext}")
-                raise ExcelError(f"不支持的文件格式: {file_ext}")
+            yield from rows
         except ExcelError:
-            # 重新抛出ExcelError
             raise
         except Exception as e:
             logger.error(f"读取文件失败: {file_path}, 错误: {e}", exc_info=True)
@@ -128,6 +163,17 @@ class ExcelReader:
         Returns:
             字典列表
         """
+        return list(self._iter_xlsx(file_path))
+
+    def _iter_xlsx(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐行读取.xlsx文件
+
+        Args:
+            file_path: .xlsx文件路径
+
+        Returns:
+            逐行产出字典的迭代器
+        """
         logger.debug(f"使用openpyxl读取.xlsx文件: {file_path}")
 
         workbook = None
@@ -142,7 +188,7 @@ class ExcelReader:
 
             # 读取表头（指定行）
             headers = None
-            data_rows = []
+            row_count = 0
 
             for row_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
                 if row_idx < self.header_row:
@@ -172,14 +218,13 @@ class ExcelReader:
                         for col_idx, value in enumerate(row_values):
                             if col_idx < len(headers):
                                 row_dict[headers[col_idx]] = value
-                        data_rows.append(row_dict)
+                        row_count += 1
+                        yield row_dict
 
             if headers is None:
                 raise ExcelError(f"XLSX文件行数不足，无法读取表头行: {self.header_row}")
 
-            logger.info(f"成功读取.xlsx文件，共 {len(data_rows)} 行数据")
-
-            return data_rows
+            logger.info(f"成功读取.xlsx文件，共 {row_count} 行数据")
 
         except ExcelError:
             raise
@@ -199,6 +244,17 @@ class ExcelReader:
         Returns:
             字典列表
         """
+        return list(self._iter_xls(file_path))
+
+    def _iter_xls(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """逐行读取.xls文件
+
+        Args:
+            file_path: .xls文件路径
+
+        Returns:
+            逐行产出字典的迭代器
+        """
         logger.debug(f"使用xlrd读取.xls文件: {file_path}")
 
         try:
@@ -218,7 +274,7 @@ class ExcelReader:
                 headers.append(str(cell_value) if cell_value is not None else "")
             logger.debug(f"提取表头: {headers}")
 
-            data_rows = []
+            row_count = 0
             # 从表头行的下一行开始读取数据
             for row_idx in range(header_row_idx + 1, sheet.nrows):
                 row_values = []
@@ -242,11 +298,10 @@ class ExcelReader:
                 for col_idx, value in enumerate(row_values):
                     if col_idx < len(headers):
                         row_dict[headers[col_idx]] = value
-                data_rows.append(row_dict)
-
-            logger.info(f"成功读取.xls文件，共 {len(data_rows)} 行数据")
+                row_count += 1
+                yield row_dict
 
-            return data_rows
+            logger.info(f"成功读取.xls文件，共 {row_count} 行数据")
 
         except ExcelError:
             raise
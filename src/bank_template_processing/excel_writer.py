@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import logging
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, Optional
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
 
 try:
     import openpyxl
@@ -29,6 +31,7 @@ try:
 except ImportError:
     xl_copy = None  # type: ignore
 
+from .amount import FixedAmount
 from .config_loader import ConfigError
 from .sheet_utils import (
     column_letter_to_index,
@@ -36,10 +39,15 @@ from .sheet_utils import (
     resolve_column_index,
     resolve_column_index_by_mode,
 )
+from .timings import stage
 
 
 logger = logging.getLogger(__name__)
 
+# 流式写出时 clear_rows 数据区不足，在模板尾部之前预留行的最小批量（之后按已预留行数倍增）
+STREAM_RESERVE_ROWS = 256
+_XLS_CLEAR_ROWS_OVERFLOW = "clear_rows 范围不足以容纳全部数据，请增大 end_row"
+
 
 class ExcelError(Exception):
     """Excel 操作失败异常。"""
@@ -55,6 +63,23 @@ class _CellProjection:
     transform_type: str = "none"
 
 
+# 单行投影函数：数据行 -> {列号: 单元格投影}，目标列无法解析而跳过的行返回 None
+_RowProjector = Callable[[Mapping[str, Any]], Optional[dict[int, _CellProjection]]]
+
+
+@contextmanager
+def _wrap_write_errors(template_path: str, output_path: str) -> Iterator[None]:
+    """将未预期的写入异常包装为 ExcelError。"""
+    try:
+        yield
+    except (ConfigError, ExcelError, FileNotFoundError):
+        raise
+    except Exception as exc:
+        error_msg = f"写入文件失败: {template_path} -> {output_path}: {exc}"
+        logger.error(error_msg, exc_info=True)
+        raise ExcelError(error_msg) from exc
+
+
 class ExcelWriter:
     """Excel 写入器，支持 `.xlsx/.xls`。"""
 
@@ -80,17 +105,10 @@ class ExcelWriter:
         """将数据写入 Excel 文件。"""
         logger.info(f"开始写入Excel文件: {template_path} -> {output_path}")
         logger.info(f"数据行数: {len(data)}")
-
-        if start_row <= header_row:
-            error_msg = f"配置错误: start_row ({start_row}) 必须大于 header_row ({header_row})"
-            logger.error(error_msg)
-            raise ConfigError(error_msg)
-
-        if bank_branch_mapping and bank_branch_mapping.get("enabled"):
-            logger.warning("配置警告: 'bank_branch_mapping' 已废弃，请使用 'field_mappings' 进行配置。")
+        self._check_layout(header_row, start_row, bank_branch_mapping)
 
         ext = Path(template_path).suffix.lower()
-        try:
+        with _wrap_write_errors(template_path, output_path):
             if ext == ".xlsx":
                 self._write_xlsx(
                     template_path,
@@ -125,15 +143,106 @@ class ExcelWriter:
                 )
             else:
                 raise ExcelError(f"不支持的文件格式: {ext}")
-        except Exception as exc:
-            if isinstance(exc, (ConfigError, ExcelError, FileNotFoundError)):
-                raise
-            error_msg = f"写入文件失败: {template_path} -> {output_path}: {exc}"
-            logger.error(error_msg, exc_info=True)
-            raise ExcelError(error_msg) from exc
 
         logger.info(f"文件写入成功: {output_path}")
 
+    def open_stream(
+        self,
+        template_path: str,
+        field_mappings: dict,
+        output_path: str,
+        header_row: int,
+        start_row: int,
+        mapping_mode: str,
+        fixed_values: Mapping[str, Any] | None = None,
+        auto_number: Mapping[str, Any] | None = None,
+        bank_branch_mapping: Mapping[str, Any] | None = None,
+        month_type_mapping: Mapping[str, Any] | None = None,
+        month_param: Optional[str] = None,
+        clear_rows: Mapping[str, Any] | None = None,
+    ) -> "TemplateStream":
+        """
+        打开模板写出流，供总行数事先未知的流式写出使用
+
+        参数与 write_excel 相同（数据改为通过 TemplateStream.write_rows 分批追加）。
+
+        Returns:
+            TemplateStream: 已加载模板并清理数据区的写出流
+        """
+        logger.info(f"开始流式写入Excel文件: {template_path} -> {output_path}")
+        self._check_layout(header_row, start_row, bank_branch_mapping)
+
+        ext = Path(template_path).suffix.lower()
+        with _wrap_write_errors(template_path, output_path):
+            if ext == ".xlsx":
+                with stage("模板加载"):
+                    workbook, worksheet = self._load_xlsx_template(template_path)
+                    headers = self._extract_headers_from_xlsx(worksheet, header_row)
+                    self._clear_xlsx_rows(worksheet, [], start_row, clear_rows)
+                project = self._row_projector(
+                    field_mappings,
+                    headers,
+                    worksheet.max_column,
+                    mapping_mode,
+                    fixed_values,
+                    auto_number,
+                    month_type_mapping,
+                    month_param,
+                    bounded=False,
+                )
+                return _XlsxTemplateStream(
+                    self,
+                    workbook,
+                    worksheet,
+                    project,
+                    template_path,
+                    output_path,
+                    start_row,
+                    clear_rows,
+                )
+            if ext == ".xls":
+                with stage("模板加载"):
+                    _, worksheet_template, workbook_output, worksheet_output = self._load_xls_template(template_path)
+                    headers = self._extract_headers_from_xls(worksheet_template, header_row)
+                    self._clear_xls_rows(worksheet_template, worksheet_output, None, start_row, clear_rows)
+                project = self._row_projector(
+                    field_mappings,
+                    headers,
+                    worksheet_template.ncols,
+                    mapping_mode,
+                    fixed_values,
+                    auto_number,
+                    month_type_mapping,
+                    month_param,
+                    bounded=True,
+                )
+                return _XlsTemplateStream(
+                    self,
+                    workbook_output,
+                    worksheet_output,
+                    worksheet_template.ncols,
+                    project,
+                    template_path,
+                    output_path,
+                    start_row,
+                    clear_rows,
+                )
+            raise ExcelError(f"不支持的文件格式: {ext}")
+
+    def _check_layout(
+        self,
+        header_row: int,
+        start_row: int,
+        bank_branch_mapping: Mapping[str, Any] | None,
+    ) -> None:
+        if start_row <= header_row:
+            error_msg = f"配置错误: start_row ({start_row}) 必须大于 header_row ({header_row})"
+            logger.error(error_msg)
+            raise ConfigError(error_msg)
+
+        if bank_branch_mapping and bank_branch_mapping.get("enabled"):
+            logger.warning("配置警告: 'bank_branch_mapping' 已废弃，请使用 'field_mappings' 进行配置。")
+
     def _write_xlsx(
         self,
         template_path: str,
@@ -154,6 +263,30 @@ class ExcelWriter:
         del bank_branch_mapping
         logger.debug(f"使用openpyxl写入xlsx文件: {template_path}")
 
+        with stage("模板加载"):
+            workbook, worksheet = self._load_xlsx_template(template_path)
+            headers = self._extract_headers_from_xlsx(worksheet, header_row)
+            self._clear_xlsx_rows(worksheet, data, start_row, clear_rows)
+        with stage("填充", len(data)):
+            self._write_data_to_worksheet(
+                worksheet,
+                data,
+                field_mappings,
+                headers,
+                start_row,
+                mapping_mode,
+                fixed_values,
+                auto_number,
+                None,
+                month_type_mapping,
+                month_param,
+            )
+        with stage("保存", len(data)):
+            workbook.save(output_path)
+        logger.debug(f"xlsx文件已保存: {output_path}")
+
+    def _load_xlsx_template(self, template_path: str) -> tuple[Any, Any]:
+        """加载 `.xlsx` 模板，返回工作簿与首个工作表。"""
         if openpyxl is None:
             raise ExcelError("openpyxl未安装，无法处理.xlsx文件")
 
@@ -171,24 +304,7 @@ class ExcelWriter:
         worksheet = workbook.worksheets[0] if workbook.worksheets else workbook.active
         if worksheet is None:
             raise ExcelError("模板文件没有工作表")
-
-        headers = self._extract_headers_from_xlsx(worksheet, header_row)
-        self._clear_xlsx_rows(worksheet, data, start_row, clear_rows)
-        self._write_data_to_worksheet(
-            worksheet,
-            data,
-            field_mappings,
-            headers,
-            start_row,
-            mapping_mode,
-            fixed_values,
-            auto_number,
-            None,
-            month_type_mapping,
-            month_param,
-        )
-        workbook.save(output_path)
-        logger.debug(f"xlsx文件已保存: {output_path}")
+        return workbook, worksheet
 
     def _write_xls(
         self,
@@ -210,6 +326,31 @@ class ExcelWriter:
         del bank_branch_mapping
         logger.debug(f"使用xlwt写入xls文件: {template_path}")
 
+        with stage("模板加载"):
+            _, worksheet_template, workbook_output, worksheet_output = self._load_xls_template(template_path)
+            headers = self._extract_headers_from_xls(worksheet_template, header_row)
+            self._clear_xls_rows(worksheet_template, worksheet_output, len(data), start_row, clear_rows)
+        with stage("填充", len(data)):
+            self._write_data_to_xls_sheet(
+                worksheet_output,
+                data,
+                field_mappings,
+                headers,
+                start_row,
+                worksheet_template.ncols,
+                mapping_mode,
+                fixed_values,
+                auto_number,
+                None,
+                month_type_mapping,
+                month_param,
+            )
+        with stage("保存", len(data)):
+            workbook_output.save(output_path)
+        logger.debug(f"xls文件已保存: {output_path}")
+
+    def _load_xls_template(self, template_path: str) -> tuple[Any, Any, Any, Any]:
+        """加载 `.xls` 模板，返回模板工作簿、模板首个工作表及保留格式的输出副本与其首个工作表。"""
         if xlwt is None:
             raise ExcelError("xlwt未安装，无法处理.xls文件")
         if xlrd is None:
@@ -229,17 +370,26 @@ class ExcelWriter:
         workbook_output = xl_copy(workbook_template)
         worksheet_template = workbook_template.sheet_by_index(0)
         worksheet_output = workbook_output.get_sheet(0)
+        return workbook_template, worksheet_template, workbook_output, worksheet_output
 
-        if header_row > 0:
-            header_values = [
-                worksheet_template.cell_value(header_row - 1, idx) for idx in range(worksheet_template.ncols)
-            ]
-            headers = extract_headers_from_values(header_values)
-            logger.debug(f"读取到 {len(headers)} 个表头字段")
-        else:
-            headers = {}
+    def _extract_headers_from_xls(self, worksheet_template, header_row: int) -> dict[str, int]:
+        if header_row <= 0:
             logger.debug("header_row = 0，跳过读取表头（使用列标识符）")
+            return {}
+        header_values = [worksheet_template.cell_value(header_row - 1, idx) for idx in range(worksheet_template.ncols)]
+        headers = extract_headers_from_values(header_values)
+        logger.debug(f"读取到 {len(headers)} 个表头字段")
+        return headers
 
+    def _clear_xls_rows(
+        self,
+        worksheet_template,
+        worksheet_output,
+        row_count: int | None,
+        start_row: int,
+        clear_rows: Mapping[str, Any] | None,
+    ) -> None:
+        """清理 `.xls` 数据区；row_count 为 None 时行数未知，由写出流在追加时检查容量。"""
         clear_config = clear_rows or {}
         clear_end = clear_config.get("end_row", clear_config.get("data_end_row"))
         if clear_end is not None:
@@ -247,8 +397,8 @@ class ExcelWriter:
             if clear_start > clear_end:
                 raise ConfigError("clear_rows.start_row 不能大于 end_row")
             clear_count = clear_end - clear_start + 1
-            if len(data) > clear_count:
-                raise ConfigError("clear_rows 范围不足以容纳全部数据，请增大 end_row")
+            if row_count is not None and row_count > clear_count:
+                raise ConfigError(_XLS_CLEAR_ROWS_OVERFLOW)
             logger.debug(f"清理数据区：{clear_start}-{clear_end} (覆盖为空)")
             for row_idx in range(clear_start - 1, clear_end):
                 for col_idx in range(worksheet_template.ncols):
@@ -259,23 +409,6 @@ class ExcelWriter:
                 for col_idx in range(worksheet_template.ncols):
                     worksheet_output.write(row_idx, col_idx, "")
 
-        self._write_data_to_xls_sheet(
-            worksheet_output,
-            data,
-            field_mappings,
-            headers,
-            start_row,
-            worksheet_template.ncols,
-            mapping_mode,
-            fixed_values,
-            auto_number,
-            None,
-            month_type_mapping,
-            month_param,
-        )
-        workbook_output.save(output_path)
-        logger.debug(f"xls文件已保存: {output_path}")
-
     def _write_data_to_worksheet(
         self,
         ws,
@@ -305,8 +438,7 @@ class ExcelWriter:
             bounded=False,
         )
         for row_idx, projection in enumerate(projections, start=start_row):
-            for col_idx, cell in projection.items():
-                ws.cell(row_idx, col_idx, self._coerce_xlsx_value(cell))
+            self._write_xlsx_projection(ws, row_idx, projection)
         logger.debug(f"已写入 {len(data)} 行数据到工作表")
 
     def _write_data_to_xls_sheet(
@@ -339,11 +471,23 @@ class ExcelWriter:
             bounded=True,
         )
         for row_idx, projection in enumerate(projections, start=start_row):
-            for col_idx, cell in projection.items():
-                if 1 <= col_idx <= max_columns:
-                    ws.write(row_idx - 1, col_idx - 1, cell.value)
+            self._write_xls_projection(ws, row_idx, projection, max_columns)
         logger.debug(f"已写入 {len(data)} 行数据到xls工作表")
 
+    def _write_xlsx_projection(self, ws, row_idx: int, projection: dict[int, _CellProjection]) -> None:
+        for col_idx, cell in projection.items():
+            ws.cell(row_idx, col_idx, self._coerce_xlsx_value(cell))
+
+    @staticmethod
+    def _write_xls_projection(ws, row_idx: int, projection: dict[int, _CellProjection], max_columns: int) -> None:
+        for col_idx, cell in projection.items():
+            if 1 <= col_idx <= max_columns:
+                value = cell.value
+                if isinstance(value, FixedAmount):
+                    # xlwt 只接受内置数值类型，定点金额以精确等值的 Decimal 写出
+                    value = value.to_decimal()
+                ws.write(row_idx - 1, col_idx - 1, value)
+
     def _calculate_month_value(
         self,
         month_param: Optional[str],
@@ -469,8 +613,33 @@ class ExcelWriter:
         bounded: bool,
     ) -> list[dict[int, _CellProjection]]:
         del bank_branch_mapping
-        projections: list[dict[int, _CellProjection]] = []
+        project = self._row_projector(
+            field_mappings,
+            headers,
+            max_columns,
+            mapping_mode,
+            fixed_values,
+            auto_number,
+            month_type_mapping,
+            month_param,
+            bounded=bounded,
+        )
+        return [projection for projection in map(project, data) if projection is not None]
 
+    def _row_projector(
+        self,
+        field_mappings: dict,
+        headers: dict,
+        max_columns: int,
+        mapping_mode: str,
+        fixed_values: Mapping[str, Any] | None,
+        auto_number: Mapping[str, Any] | None,
+        month_type_mapping: Mapping[str, Any] | None,
+        month_param: Optional[str],
+        *,
+        bounded: bool,
+    ) -> _RowProjector:
+        """创建逐行投影函数，自动编号在多次调用间连续递增。"""
         current_number = None
         if auto_number and auto_number.get("enabled"):
             current_number = auto_number.get("start_from", 1)
@@ -479,7 +648,8 @@ class ExcelWriter:
         if month_type_mapping and month_type_mapping.get("enabled"):
             month_value = self._calculate_month_value(month_param, month_type_mapping)
 
-        for row_data in data:
+        def project(row_data: Mapping[str, Any]) -> dict[int, _CellProjection] | None:
+            nonlocal current_number
             row_projection: dict[int, _CellProjection] = {}
 
             for template_column, mapping_config in field_mappings.items():
@@ -533,7 +703,7 @@ class ExcelWriter:
                     f"无法解析自动编号列 '{column}'",
                 )
                 if col_idx is None:
-                    continue
+                    return None
                 self._set_projection_value(
                     row_projection,
                     col_idx,
@@ -554,7 +724,7 @@ class ExcelWriter:
                     f"无法解析月类型映射列 '{target_column}'",
                 )
                 if col_idx is None:
-                    continue
+                    return None
                 self._set_projection_value(
                     row_projection,
                     col_idx,
@@ -563,9 +733,9 @@ class ExcelWriter:
                     bounded=bounded,
                 )
 
-            projections.append(row_projection)
+            return row_projection
 
-        return projections
+        return project
 
     def _normalize_field_mapping(self, template_column: str, mapping_config: Any) -> tuple[str, Any, str]:
         if isinstance(mapping_config, dict):
@@ -591,6 +761,9 @@ class ExcelWriter:
         row_projection[col_idx] = cell
 
     def _coerce_xlsx_value(self, cell: _CellProjection) -> Any:
+        if isinstance(cell.value, FixedAmount):
+            # 金额转换已产出定点金额，以精确等值的 Decimal 写出为数值单元格，无需再次解析
+            return cell.value.to_decimal()
         if cell.transform_type == "amount_decimal" and cell.value is not None:
             try:
                 if isinstance(cell.value, str):
@@ -599,3 +772,137 @@ class ExcelWriter:
             except (ValueError, TypeError):
                 return cell.value
         return cell.value
+
+
+class TemplateStream(ABC):
+    """
+    模板写出流
+
+    由 ExcelWriter.open_stream 创建：模板已加载、数据区已清理，数据行分批追加，save 时保存到输出路径。
+    写出的单元格与一次性调用 write_excel 相同，自动编号跨批次连续。
+    各文件格式的子类实现 _write_projection 与 _save。
+    """
+
+    def __init__(self, project: _RowProjector, template_path: str, output_path: str, start_row: int):
+        self.template_path = template_path
+        self.output_path = output_path
+        self.row_count = 0
+        self._project = project
+        self._start_row = start_row
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        追加一批数据行
+
+        Args:
+            rows: 已完成转换的数据行
+        """
+        written_before = self.row_count
+        with _wrap_write_errors(self.template_path, self.output_path), stage("填充") as span:
+            for row in rows:
+                projection = self._project(row)
+                if projection is None:
+                    continue
+                self._write_projection(self._start_row + self.row_count, projection)
+                self.row_count += 1
+            span.rows_in = span.rows_out = self.row_count - written_before
+
+    def save(self) -> None:
+        """保存到输出路径。"""
+        with _wrap_write_errors(self.template_path, self.output_path), stage("保存", self.row_count):
+            self._save()
+        logger.info(f"文件写入成功: {self.output_path}（{self.row_count} 行）")
+
+    @abstractmethod
+    def _write_projection(self, row_idx: int, projection: dict[int, _CellProjection]) -> None:
+        """把一行的单元格投影写到工作表的 row_idx 行。"""
+
+    @abstractmethod
+    def _save(self) -> None:
+        """保存工作簿到输出路径。"""
+
+
+def _clear_rows_capacity(clear_rows: Mapping[str, Any] | None, start_row: int) -> tuple[int, int] | None:
+    """返回 clear_rows 数据区的 (结束行, 可容纳行数)，未配置结束行时返回 None。"""
+    clear_config = clear_rows or {}
+    clear_end = clear_config.get("end_row", clear_config.get("data_end_row"))
+    if clear_end is None:
+        return None
+    return clear_end, clear_end - clear_config.get("start_row", start_row) + 1
+
+
+class _XlsxTemplateStream(TemplateStream):
+    """
+    `.xlsx` 写出流
+
+    行数事先未知，clear_rows 数据区不足时在模板尾部之前按倍增批量预留行，
+    插入次数随行数对数增长；保存前删去多余的预留行，尾部位置与一次性写出相同。
+    """
+
+    def __init__(
+        self,
+        writer: ExcelWriter,
+        workbook,
+        worksheet,
+        project: _RowProjector,
+        template_path: str,
+        output_path: str,
+        start_row: int,
+        clear_rows: Mapping[str, Any] | None,
+    ):
+        super().__init__(project, template_path, output_path, start_row)
+        self._writer = writer
+        self._workbook = workbook
+        self._worksheet = worksheet
+        self._capacity = _clear_rows_capacity(clear_rows, start_row)
+        self._reserved = 0
+
+    def _write_projection(self, row_idx: int, projection: dict[int, _CellProjection]) -> None:
+        if self._capacity is not None:
+            clear_end, clear_count = self._capacity
+            if self.row_count + 1 > clear_count + self._reserved:
+                amount = max(self._reserved, STREAM_RESERVE_ROWS)
+                self._worksheet.insert_rows(clear_end + 1 + self._reserved, amount=amount)
+                self._reserved += amount
+        self._writer._write_xlsx_projection(self._worksheet, row_idx, projection)
+
+    def _save(self) -> None:
+        if self._capacity is not None:
+            clear_end, clear_count = self._capacity
+            needed = max(self.row_count - clear_count, 0)
+            if self._reserved > needed:
+                self._worksheet.delete_rows(clear_end + 1 + needed, self._reserved - needed)
+                self._reserved = needed
+        self._workbook.save(self.output_path)
+
+
+class _XlsTemplateStream(TemplateStream):
+    """`.xls` 写出流，clear_rows 数据区不足时与 write_excel 相同报错。"""
+
+    def __init__(
+        self,
+        writer: ExcelWriter,
+        workbook_output,
+        worksheet_output,
+        max_columns: int,
+        project: _RowProjector,
+        template_path: str,
+        output_path: str,
+        start_row: int,
+        clear_rows: Mapping[str, Any] | None,
+    ):
+        super().__init__(project, template_path, output_path, start_row)
+        self._writer = writer
+        self._workbook = workbook_output
+        self._worksheet = worksheet_output
+        self._max_columns = max_columns
+        capacity = _clear_rows_capacity(clear_rows, start_row)
+        self._clear_count = None if capacity is None else capacity[1]
+
+    def _write_projection(self, row_idx: int, projection: dict[int, _CellProjection]) -> None:
+        if self._clear_count is not None and self.row_count + 1 > self._clear_count:
+            raise ConfigError(_XLS_CLEAR_ROWS_OVERFLOW)
+        self._writer._write_xls_projection(self._worksheet, row_idx, projection, self._max_columns)
+
+    def _save(self) -> None:
+        self._workbook.save(self.output_path)
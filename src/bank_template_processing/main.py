@@ -9,15 +9,21 @@ import string
 import sys
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 
+from .amount import FixedAmount
 from .config_loader import ConfigError, build_runtime_config, get_unit_config, load_config, validate_config
 from .config_types import AppConfig, RuleGroupConfig
+from .error_report import DEFAULT_ERROR_LIMIT, ERROR_REPORT_FILENAME, ErrorCollector
 from .excel_reader import ExcelError, ExcelReader
 from .excel_writer import ExcelWriter
 from .merge_folder import MergeFolderError, prepare_merge_tasks
+from .row_cache import RowCache
+from .row_spill import RowSpool
 from .pipeline import (
     ProcessingContext,
+    StreamingGroupCheck,
+    StreamingGroupOutput,
     apply_transformations,
     build_reader,
     calculate_stats as _calculate_stats,
@@ -27,6 +33,7 @@ from .pipeline import (
     write_group_output,
 )
 from .template_selector import TemplateSelector
+from .timings import StageTimings, collect_timings, stage, timed_rows
 from .transformer import TransformError, Transformer as _Transformer
 from .validator import ValidationError, Validator as _Validator
 
@@ -34,6 +41,9 @@ from .validator import ValidationError, Validator as _Validator
 Transformer = _Transformer
 Validator = _Validator
 
+# --stream 未指定批量时每批写入模板的行数
+DEFAULT_STREAM_BATCH_ROWS = 1000
+
 
 def get_executable_dir() -> Path:
     """获取可执行文件所在目录。"""
@@ -88,6 +98,15 @@ def parse_args(argv=None) -> argparse.Namespace:
   # 使用自定义配置文件
   python main.py input.xlsx 单位名称 01 --config custom_config.json
 
+  # 收集全部数据错误（最多 200 处）后统一报告
+  python main.py input.xlsx 单位名称 01 --collect-errors=200
+
+  # 只检查数据并输出各分组人数与金额，不生成模板文件
+  python main.py input.xlsx 单位名称 01 --check
+
+  # 流式处理超大输入：边读边写，内存占用不随输入行数增长
+  python main.py input.xlsx 单位名称 01 --stream
+
   # 批量合并目录中的已生成模板文件
   python main.py --merge-folder ./output --config config.json
         """,
@@ -106,10 +125,73 @@ def parse_args(argv=None) -> argparse.Namespace:
         default="{unit_name}_{template_name}_{count}人_金额{amount:.2f}元{ext}",
         help="输出文件名模板（默认：{unit_name}_{template_name}_{count}人_金额{amount:.2f}元{ext}）",
     )
+    parser.add_argument(
+        "--collect-errors",
+        nargs="?",
+        const=DEFAULT_ERROR_LIMIT,
+        type=_positive_int,
+        metavar="N",
+        help=(
+            f"错误收集模式：校验与转换遇到数据错误时继续处理，最多记录 N 处（默认 {DEFAULT_ERROR_LIMIT}），"
+            f"结束时写出 {ERROR_REPORT_FILENAME} 并以失败退出"
+        ),
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="检查模式：逐行读取、校验并统计各分组人数与金额，不加载模板、不写出结果；数据错误按错误收集模式报告",
+    )
+    parser.add_argument(
+        "--row-cache",
+        metavar="DIR",
+        help="增量处理模式：在 DIR 中按单位与规则组缓存通过校验的行，再次运行时只重新转换与校验新增或变更的行",
+    )
+    parser.add_argument(
+        "--spill-threshold",
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "溢写模式：启用模板选择时逐行读取输入并分组，内存中缓冲超过 N 行后写入临时文件，"
+            "之后逐组读回处理并写出，内存占用以单个分组为上限"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        nargs="?",
+        const=DEFAULT_STREAM_BATCH_ROWS,
+        type=_positive_int,
+        metavar="N",
+        help=(
+            "流式模式：逐行读取、筛选、分组、校验与转换后按每批 N 行"
+            f"（默认 {DEFAULT_STREAM_BATCH_ROWS}）写入模板，不在内存中保留完整输入；"
+            "输出先写入临时文件，结束时按人数与金额改名"
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="输出读取、筛选、分组、校验、转换、模板加载、填充、保存各阶段的墙钟时间、CPU 时间、行数与每秒行数",
+    )
+    parser.add_argument(
+        "--timings-json",
+        metavar="PATH",
+        help="将阶段计时同时写出为 JSON 文件（隐含 --timings）",
+    )
     parser.add_argument("--debug", action="store_true", help="输出调试日志与异常堆栈")
     return parser.parse_args(argv)
 
 
+def _positive_int(value: str) -> int:
+    """argparse 正整数参数类型。"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"必须是正整数: {value}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须是正整数: {value}")
+    return number
+
+
 def validate_cli_mode_args(args: argparse.Namespace) -> None:
     """校验命令行模式参数组合是否正确。"""
     has_merge_folder = bool(args.merge_folder)
@@ -119,8 +201,32 @@ def validate_cli_mode_args(args: argparse.Namespace) -> None:
     if has_merge_folder:
         if has_any_positional:
             raise ValueError("使用 --merge-folder 时不能同时提供 excel_path/unit_name/month")
+        if getattr(args, "collect_errors", None) is not None:
+            raise ValueError("--collect-errors 仅支持普通模式，不能与 --merge-folder 同时使用")
+        if getattr(args, "check", False):
+            raise ValueError("--check 仅支持普通模式，不能与 --merge-folder 同时使用")
+        if getattr(args, "row_cache", None):
+            raise ValueError("--row-cache 仅支持普通模式，不能与 --merge-folder 同时使用")
+        if getattr(args, "spill_threshold", None) is not None:
+            raise ValueError("--spill-threshold 仅支持普通模式，不能与 --merge-folder 同时使用")
+        if getattr(args, "stream", None) is not None:
+            raise ValueError("--stream 仅支持普通模式，不能与 --merge-folder 同时使用")
         return
 
+    if getattr(args, "check", False) and getattr(args, "row_cache", None):
+        raise ValueError("--row-cache 不能与 --check 同时使用")
+
+    if getattr(args, "stream", None) is not None:
+        conflicts = (
+            ("--check", getattr(args, "check", False)),
+            ("--collect-errors", getattr(args, "collect_errors", None) is not None),
+            ("--row-cache", getattr(args, "row_cache", None)),
+            ("--spill-threshold", getattr(args, "spill_threshold", None) is not None),
+        )
+        for option, enabled in conflicts:
+            if enabled:
+                raise ValueError(f"--stream 不能与 {option} 同时使用")
+
     if not has_all_positional:
         raise ValueError("普通模式必须提供 excel_path、unit_name、month 三个参数")
 
@@ -131,7 +237,7 @@ def generate_output_filename(
     template_name: str | None,
     template_path: str,
     count: int,
-    amount: float,
+    amount: FixedAmount | float,
     output_template: str | None = None,
 ) -> str:
     """生成输出文件名。"""
@@ -210,6 +316,10 @@ def _is_zero_salary_value(value) -> bool:
     return False
 
 
+def _log_zero_salary_filter(logger: logging.Logger, total: int, filtered: int) -> None:
+    logger.info("实发工资零值筛选完成：原始 %s 行，过滤 %s 行，保留 %s 行", total, filtered, total - filtered)
+
+
 def _filter_zero_salary_rows(data: list[dict], salary_column: str = "实发工资") -> list[dict]:
     """过滤“实发工资”为 0 的数据行。"""
     logger = logging.getLogger(__name__)
@@ -219,16 +329,10 @@ def _filter_zero_salary_rows(data: list[dict], salary_column: str = "实发工
         return data
 
     if not any(salary_column in row for row in data):
-        raise ValidationError(f"缺少'{salary_column}'列")
+        raise ValidationError(f"缺少'{salary_column}'列", field=salary_column, rule="required")
 
     filtered_rows = [row for row in data if not _is_zero_salary_value(row.get(salary_column))]
-    filtered_count = len(data) - len(filtered_rows)
-    logger.info(
-        "实发工资零值筛选完成：原始 %s 行，过滤 %s 行，保留 %s 行",
-        len(data),
-        filtered_count,
-        len(filtered_rows),
-    )
+    _log_zero_salary_filter(logger, len(data), len(data) - len(filtered_rows))
     return filtered_rows
 
 
@@ -248,22 +352,65 @@ def _read_input_rows(
 ) -> list[dict]:
     """读取并做零工资过滤。"""
     reader = build_reader(group_config, logger_instance=logger, reader_cls=ExcelReader)
-    data = reader.read_excel(excel_path)
+    with stage("读取") as span:
+        data = reader.read_excel(excel_path)
+        span.rows_in = span.rows_out = len(data)
     logger.info(f"读取到 {len(data)} 行数据")
     try:
-        return _filter_zero_salary_rows(data)
+        with stage("零工资筛选", len(data)) as span:
+            filtered = _filter_zero_salary_rows(data)
+            span.rows_out = len(filtered)
     except ValidationError as exc:
         raise enrich_error_context(exc, "零工资筛选", context) from exc
+    return filtered
+
+
+def _iter_input_rows(
+    excel_path: str,
+    group_config: RuleGroupConfig | dict[str, Any],
+    context: ProcessingContext,
+    logger: logging.Logger,
+    salary_column: str = "实发工资",
+) -> Iterator[dict]:
+    """逐行读取并做零工资过滤，不构建完整行列表。
+
+    实发工资列在产出首行之前检查：各行键均来自表头，首行缺列即表头缺列，
+    此时直接失败，避免下游分类与写出已处理部分数据。
+    """
+    reader = build_reader(group_config, logger_instance=logger, reader_cls=ExcelReader)
+    total_rows = 0
+    kept_rows = 0
+    for row in timed_rows(reader.iter_excel(excel_path), "读取"):
+        total_rows += 1
+        if total_rows == 1 and salary_column not in row:
+            missing = ValidationError(f"缺少'{salary_column}'列", field=salary_column, rule="required")
+            raise enrich_error_context(missing, "零工资筛选", context)
+        if _is_zero_salary_value(row.get(salary_column)):
+            continue
+        kept_rows += 1
+        yield row
+
+    logger.info(f"读取到 {total_rows} 行数据")
+    _log_zero_salary_filter(logger, total_rows, total_rows - kept_rows)
 
 
 def _prepare_group_rows(
-    data: list[dict],
+    data: Sequence[dict],
     group_config: RuleGroupConfig | dict[str, Any],
     context: ProcessingContext,
     logger: logging.Logger,
-) -> tuple[list[dict], int, float]:
-    """对单组数据执行校验、转换和统计。"""
+    errors: ErrorCollector | None = None,
+    row_cache_dir: str | None = None,
+) -> tuple[Sequence[dict], int, FixedAmount]:
+    """
+    对单组数据执行校验、转换和统计；指定 row_cache_dir 时复用上次运行中未变化的行。
+
+    分组后的原始行不再使用，转换直接改写数据行，不再为每行创建副本。
+    """
     logger.info("验证并准备分组数据")
+    row_cache = None
+    if row_cache_dir:
+        row_cache = RowCache.load(row_cache_dir, context.unit_name, context.rule_group, group_config)
     prepared_rows, count, amount = _prepare_group_rows_shared(
         data,
         group_config,
@@ -271,13 +418,28 @@ def _prepare_group_rows(
         transform_fn=apply_transformations,
         needs_transform_fn=_needs_transformations,
         stats_fn=_calculate_stats,
+        errors=errors,
+        row_cache=row_cache,
+        in_place=True,
     )
-    logger.info("分组数据准备完成：%s 行，金额 %.2f", count, amount)
+    if errors:
+        logger.info("分组数据已检查：%s 行，累计发现 %s 处数据错误，跳过写出", len(prepared_rows), len(errors))
+        return prepared_rows, count, amount
+    logger.info("分组数据准备完成：%s 行，金额 %s", count, format(amount, ".2f"))
     return prepared_rows, count, amount
 
 
+def _finish_error_collection(errors: ErrorCollector | None, output_dir: str, logger: logging.Logger) -> None:
+    """错误收集模式结束时写出报告，存在数据错误则统一失败。"""
+    if not errors:
+        return
+    report_path = errors.write_report(Path(output_dir) / ERROR_REPORT_FILENAME)
+    logger.info(f"数据错误报告已写出：{report_path}")
+    raise ValidationError(errors.summary(report_path))
+
+
 def process_group(
-    group_data: list[dict],
+    group_data: Sequence[dict],
     group_config: RuleGroupConfig | dict[str, Any],
     template_path: str,
     output_path: Path,
@@ -297,7 +459,9 @@ def process_group(
 
 
 def _write_output_group(
-    data: list[dict],
+    data: Sequence[dict],
+    count: int,
+    amount: FixedAmount,
     group_config: RuleGroupConfig | dict[str, Any],
     unit_name: str,
     month: str,
@@ -307,12 +471,7 @@ def _write_output_group(
     output_filename_template: str | None,
     logger: logging.Logger,
 ) -> None:
-    """写出单个分组结果。"""
-    count, amount = _calculate_stats(
-        data,
-        group_config.get("field_mappings", {}),
-        group_config.get("transformations", {}),
-    )
+    """写出单个分组结果，人数与金额直接使用准备阶段的统计，不再重新计算。"""
     output_filename = generate_output_filename(
         unit_name,
         month,
@@ -371,6 +530,7 @@ def _handle_routed_rule_group_mode(
     validated_month: str,
     data: list[dict],
     matched_rule_group: str,
+    errors: ErrorCollector | None = None,
 ) -> None:
     """处理输入文件名路由命中的单规则组输出模式。"""
     logger.info(f"输入文件名命中项目编码路由，使用规则组：{matched_rule_group}")
@@ -382,12 +542,23 @@ def _handle_routed_rule_group_mode(
         rule_group=matched_rule_group,
         template_name=Path(template_path).stem,
     )
-    prepared_rows, _, _ = _prepare_group_rows(data, matched_group_config, context, logger)
+    prepared_rows, count, amount = _prepare_group_rows(
+        data,
+        matched_group_config,
+        context,
+        logger,
+        errors,
+        getattr(args, "row_cache", None),
+    )
+    if errors:
+        return
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     _write_output_group(
         prepared_rows,
+        count,
+        amount,
         matched_group_config,
         args.unit_name,
         validated_month,
@@ -446,6 +617,7 @@ def _handle_default_mode(
     validated_month: str,
     data: list[dict],
     default_unit_config: RuleGroupConfig | dict[str, Any],
+    errors: ErrorCollector | None = None,
 ) -> None:
     """处理单模板模式。"""
     logger.info("使用默认模板（未启用模板选择）")
@@ -455,12 +627,23 @@ def _handle_default_mode(
         rule_group="default",
         template_name=Path(template_path).stem,
     )
-    prepared_rows, _, _ = _prepare_group_rows(data, default_unit_config, context, logger)
+    prepared_rows, count, amount = _prepare_group_rows(
+        data,
+        default_unit_config,
+        context,
+        logger,
+        errors,
+        getattr(args, "row_cache", None),
+    )
+    if errors:
+        return
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     _write_output_group(
         prepared_rows,
+        count,
+        amount,
         default_unit_config,
         args.unit_name,
         validated_month,
@@ -477,61 +660,387 @@ def _handle_selector_mode(
     config: AppConfig | dict[str, Any],
     logger: logging.Logger,
     validated_month: str,
-    data: list[dict],
+    data: Iterable[dict],
     template_selection_rules: dict,
+    errors: ErrorCollector | None = None,
 ) -> None:
-    """处理动态模板选择模式。"""
+    """处理动态模板选择模式；指定 --spill-threshold 时流式分组并把超出阈值的行溢写到临时文件。"""
     logger.info("启用动态模板选择")
     selector = TemplateSelector({"template_selector": template_selection_rules})
     default_bank = template_selection_rules.get("default_bank", "")
     bank_column = template_selection_rules.get("bank_column", "开户银行")
 
-    groups = selector.group_data(data, default_bank, bank_column)
-    logger.info(f"数据分组完成，共 {len(groups)} 个组")
+    output_dir = Path(args.output_dir)
+    spill_threshold = getattr(args, "spill_threshold", None)
+    if spill_threshold is None:
+        with stage("分组", len(data)) as span:
+            groups = selector.group_data(data, default_bank, bank_column)
+            span.rows_out = sum(len(group["data"]) for group in groups.values())
+        logger.info(f"数据分组完成，共 {len(groups)} 个组")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for group_key, group_info in groups.items():
+            _process_selector_group(args, config, logger, validated_month, selector, group_key, group_info, errors)
+        return
+
+    with selector.spill_group_data(data, default_bank, bank_column, spill_threshold=spill_threshold) as groups:
+        logger.info(f"数据分组完成，共 {len(groups)} 个组")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for group_key, group_info in groups.items():
+            _process_selector_group(args, config, logger, validated_month, selector, group_key, group_info, errors)
+
+
+def _process_selector_group(
+    args: argparse.Namespace,
+    config: AppConfig | dict[str, Any],
+    logger: logging.Logger,
+    validated_month: str,
+    selector: TemplateSelector,
+    group_key: str,
+    group_info: dict[str, Any],
+    errors: ErrorCollector | None,
+) -> None:
+    """处理并写出动态模板选择的单个分组；溢写的分组在此读回，处理完即释放。"""
+    group_data = group_info["data"]
+    if not group_data:
+        logger.info(f"跳过空组：{group_key}")
+        return
+
+    rule_group = selector.rule_group(group_key)
+    group_config = get_unit_config(config, args.unit_name, rule_group)
+    template_path, template_name = _resolve_selector_template(group_info, group_config, rule_group, logger)
+
+    logger.info(f"处理组：{group_key}，模板：{template_name}，数据行数：{len(group_data)}")
+    logger.info(f"使用规则组配置：{rule_group}")
+
+    if isinstance(group_data, RowSpool):
+        group_data = group_data.load()
+
+    context = ProcessingContext(
+        unit_name=args.unit_name,
+        rule_group=rule_group,
+        template_name=template_name,
+    )
+    prepared_rows, count, amount = _prepare_group_rows(
+        group_data,
+        group_config,
+        context,
+        logger,
+        errors,
+        getattr(args, "row_cache", None),
+    )
+    if errors:
+        # 已发现数据错误时只继续检查后续分组，不再写出
+        return
+    _write_output_group(
+        prepared_rows,
+        count,
+        amount,
+        group_config,
+        args.unit_name,
+        validated_month,
+        template_name,
+        template_path,
+        Path(args.output_dir),
+        args.output_filename_template,
+        logger,
+    )
+
+
+def _resolve_selector_template(
+    group_info: Mapping[str, Any],
+    group_config: RuleGroupConfig | dict[str, Any],
+    rule_group: str,
+    logger: logging.Logger,
+) -> tuple[str, str]:
+    """返回动态模板选择分组的模板路径与模板名；分组未配置模板时使用规则组的 template_path。"""
+    template_path = group_info["template"]
+    if not template_path:
+        template_path = group_config.get("template_path", "")
+        if not template_path:
+            raise ConfigError(f"规则组 '{rule_group}' 未配置 template_path")
+        template_path = _resolve_runtime_path(template_path, logger)
+        logger.info(f"使用规则组配置中的模板路径：{template_path}")
+    else:
+        template_path = _resolve_runtime_path(template_path, logger)
+    # routes 中的规则组没有配置组名，使用模板文件名，合并模式据此回推规则组
+    return template_path, group_info["group_name"] or Path(template_path).stem
+
 
+def _handle_stream_mode(
+    args: argparse.Namespace,
+    config: AppConfig | dict[str, Any],
+    logger: logging.Logger,
+    validated_month: str,
+    read_unit_config: RuleGroupConfig | dict[str, Any],
+    read_context: ProcessingContext,
+    matched_rule_group: str | None,
+    template_selection_rules: dict,
+) -> None:
+    """
+    处理流式模式
+
+    逐行读取输入并依次完成零工资筛选、分组、校验与转换，准备好的行按批写入各分组的模板，
+    不构建完整行列表。各分组先写入临时文件；读完后按分组顺序确认无错误，
+    再按人数与金额生成文件名并改名，报告的错误与普通模式相同。
+    """
+    logger.info("启用流式模式：每批写入 %s 行", args.stream)
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for group_key, group_info in groups.items():
-        group_data = group_info["data"]
-        if not group_data:
-            logger.info(f"跳过空组：{group_key}")
-            continue
+    if matched_rule_group or not template_selection_rules.get("enabled", False):
+        fixed_rule_group = matched_rule_group or "default"
+        selector = None
+        group_order = [fixed_rule_group]
 
-        rule_group = "crossbank" if group_key == "special" else group_key
-        group_config = get_unit_config(config, args.unit_name, rule_group)
-        template_name = group_info["group_name"]
-        template_path = group_info["template"]
+        def classify(row: dict, row_number: int) -> str:
+            return fixed_rule_group
 
-        logger.info(f"处理组：{group_key}，模板：{template_name}，数据行数：{len(group_data)}")
-        logger.info(f"使用规则组配置：{rule_group}")
+    else:
+        selector = TemplateSelector({"template_selector": template_selection_rules})
+        group_order = selector.group_keys()
+        classify = selector.row_classifier(
+            template_selection_rules.get("default_bank", ""),
+            template_selection_rules.get("bank_column", "开户银行"),
+        )
 
-        if not template_path:
-            template_path = group_config.get("template_path", "")
-            if not template_path:
-                raise ConfigError(f"规则组 '{rule_group}' 未配置 template_path")
-            template_path = _resolve_runtime_path(template_path, logger)
-            logger.info(f"使用规则组配置中的模板路径：{template_path}")
-        else:
-            template_path = _resolve_runtime_path(template_path, logger)
+    # 分组键 -> (流式写出, 输出文件名中的模板名)，分组在首次出现数据时才加载模板
+    outputs: dict[str, tuple[StreamingGroupOutput, str | None]] = {}
 
+    def open_output(group_key: str) -> tuple[StreamingGroupOutput, str | None]:
+        if selector is None:
+            group_config = get_unit_config(config, args.unit_name, group_key)
+            template_path = _resolve_runtime_path(group_config["template_path"], logger)
+            template_name = Path(template_path).stem
+            filename_template_name = None
+        else:
+            rule_group = selector.rule_group(group_key)
+            group_config = get_unit_config(config, args.unit_name, rule_group)
+            template_path, template_name = _resolve_selector_template(
+                selector.group_info(group_key), group_config, rule_group, logger
+            )
+            filename_template_name = template_name
         context = ProcessingContext(
             unit_name=args.unit_name,
-            rule_group=rule_group,
+            rule_group=group_key if selector is None else selector.rule_group(group_key),
             template_name=template_name,
         )
-        prepared_rows, _, _ = _prepare_group_rows(group_data, group_config, context, logger)
-        _write_output_group(
-            prepared_rows,
+        logger.info(f"开始写出分组：{group_key}，模板：{template_name}")
+        output = StreamingGroupOutput(
             group_config,
-            args.unit_name,
-            validated_month,
-            template_name,
             template_path,
             output_dir,
-            args.output_filename_template,
+            validated_month,
+            context=context,
+            batch_size=args.stream,
+            writer_cls=ExcelWriter,
+        )
+        return output, filename_template_name
+
+    try:
+        rows = _iter_input_rows(args.excel_path, read_unit_config, read_context, logger)
+        for row_number, row in enumerate(rows, 1):
+            group_key = classify(row, row_number)
+            entry = outputs.get(group_key)
+            if entry is None:
+                entry = outputs[group_key] = open_output(group_key)
+            entry[0].add(row)
+
+        for group_key in group_order:
+            entry = outputs.get(group_key)
+            if entry is None:
+                logger.info(f"跳过空组：{group_key}")
+                continue
+            output, template_name = entry
+
+            def output_filename(count: int, amount: FixedAmount) -> str:
+                return generate_output_filename(
+                    args.unit_name,
+                    validated_month,
+                    template_name,
+                    output.template_path,
+                    count,
+                    amount,
+                    args.output_filename_template,
+                )
+
+            output.finish(output_filename)
+    finally:
+        for output, _ in outputs.values():
+            output.discard()
+
+
+def _handle_check_mode(
+    args: argparse.Namespace,
+    config: AppConfig | dict[str, Any],
+    logger: logging.Logger,
+    read_unit_config: RuleGroupConfig | dict[str, Any],
+    read_context: ProcessingContext,
+    matched_rule_group: str | None,
+    template_selection_rules: dict,
+    errors: ErrorCollector,
+) -> None:
+    """
+    处理检查模式
+
+    逐行读取输入并依次完成零工资筛选、分组、转换与校验，每行处理完即丢弃，
+    不构建完整行列表、不加载模板；结束时输出各分组人数与金额，存在数据错误时写出错误报告并失败。
+    """
+    logger.info("启用检查模式：只校验与统计，不写出结果")
+    checks: dict[str, StreamingGroupCheck] = {}
+
+    def group_check(rule_group: str, template_name: str | None = None) -> StreamingGroupCheck:
+        check = checks.get(rule_group)
+        if check is None:
+            group_config = get_unit_config(config, args.unit_name, rule_group)
+            if template_name is None:
+                template_name = Path(group_config.get("template_path", "")).stem or None
+            context = ProcessingContext(unit_name=args.unit_name, rule_group=rule_group, template_name=template_name)
+            check = checks[rule_group] = StreamingGroupCheck(group_config, errors, context=context)
+        return check
+
+    if matched_rule_group or not template_selection_rules.get("enabled", False):
+        fixed_rule_group = matched_rule_group or "default"
+
+        def route(row: dict, row_number: int) -> StreamingGroupCheck:
+            return group_check(fixed_rule_group)
+
+    else:
+        selector = TemplateSelector({"template_selector": template_selection_rules})
+        classify = selector.row_classifier(
+            template_selection_rules.get("default_bank", ""),
+            template_selection_rules.get("bank_column", "开户银行"),
+        )
+
+        def route(row: dict, row_number: int) -> StreamingGroupCheck:
+            group_key = classify(row, row_number)
+            return group_check(selector.rule_group(group_key), selector.group_name(group_key) or None)
+
+    kept_rows = 0
+    for kept_rows, row in enumerate(_iter_input_rows(args.excel_path, read_unit_config, read_context, logger), 1):
+        route(row, kept_rows).check_row(row)
+
+    for check in checks.values():
+        result = check.result()
+        logger.info(
+            "检查结果（%s）：%s 人，金额 %s，数据错误 %s 处",
+            result.context.describe() if result.context else "",
+            result.count,
+            format(result.amount, ".2f"),
+            result.error_count,
+        )
+
+    _finish_error_collection(errors, args.output_dir, logger)
+    logger.info("检查通过：共 %s 个分组，%s 行数据", len(checks), kept_rows)
+
+
+def _run(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """按命令行参数加载配置并执行对应的处理模式。"""
+    config_path = Path(args.config)
+    if not config_path.is_absolute():
+        config_path = get_executable_dir() / config_path
+        logger.info(f"配置文件相对路径已解析为：{config_path}")
+
+    logger.info(f"加载配置文件：{config_path}")
+    config = load_config(str(config_path))
+    validate_config(config)
+    config = build_runtime_config(config)
+    logger.info(f"配置版本：{config['version']}")
+
+    if args.merge_folder:
+        _handle_merge_mode(args, config, logger)
+        return
+
+    logger.info(f"开始处理：{args.excel_path}，单位：{args.unit_name}，月份：{args.month}")
+    validated_month = validate_month(args.month)
+    logger.info(f"月份参数验证通过：{validated_month}")
+
+    if args.unit_name not in config["organization_units"]:
+        raise ConfigError(f"配置文件中未找到单位配置：{args.unit_name}")
+
+    logger.info(f"加载单位配置：{args.unit_name}")
+    raw_unit_config = config["organization_units"][args.unit_name]
+    template_selection_rules = raw_unit_config.get("template_selector", config.get("template_selection_rules", {}))
+    selector_enabled = template_selection_rules.get("enabled", False)
+    matched_rule_group = _resolve_input_filename_rule_group(raw_unit_config, args.excel_path)
+
+    if matched_rule_group:
+        read_rule_group = matched_rule_group
+        read_unit_config = get_unit_config(config, args.unit_name, matched_rule_group)
+        default_unit_config = get_unit_config(config, args.unit_name, "default")
+    else:
+        read_rule_group = "default"
+        default_unit_config = get_unit_config(config, args.unit_name, "default")
+        read_unit_config = default_unit_config
+
+    read_context = ProcessingContext(unit_name=args.unit_name, rule_group=read_rule_group)
+    error_limit = getattr(args, "collect_errors", None)
+
+    if getattr(args, "check", False):
+        _handle_check_mode(
+            args,
+            config,
             logger,
+            read_unit_config,
+            read_context,
+            matched_rule_group,
+            template_selection_rules,
+            ErrorCollector(error_limit or DEFAULT_ERROR_LIMIT),
         )
+        return
+
+    if getattr(args, "stream", None) is not None:
+        _handle_stream_mode(
+            args,
+            config,
+            logger,
+            validated_month,
+            read_unit_config,
+            read_context,
+            matched_rule_group,
+            template_selection_rules,
+        )
+        logger.info("处理完成")
+        return
+
+    # 溢写模式下边读边分组，不在内存中保留完整输入
+    spill_input = getattr(args, "spill_threshold", None) is not None and selector_enabled and not matched_rule_group
+    data = [] if spill_input else _read_input_rows(args.excel_path, read_unit_config, read_context, logger)
+
+    errors = ErrorCollector(error_limit) if error_limit is not None else None
+    if errors is not None:
+        logger.info(f"已启用错误收集模式，最多记录 {error_limit} 处数据错误")
+
+    if matched_rule_group:
+        _handle_routed_rule_group_mode(args, config, logger, validated_month, data, matched_rule_group, errors)
+    elif not selector_enabled:
+        _handle_default_mode(args, logger, validated_month, data, default_unit_config, errors)
+    else:
+        selector_rows = (
+            _iter_input_rows(args.excel_path, read_unit_config, read_context, logger) if spill_input else data
+        )
+        _handle_selector_mode(
+            args,
+            config,
+            logger,
+            validated_month,
+            selector_rows,
+            template_selection_rules,
+            errors,
+        )
+
+    _finish_error_collection(errors, args.output_dir, logger)
+    logger.info("处理完成")
+
+
+def _report_timings(timings: StageTimings, json_path: str | None, logger: logging.Logger) -> None:
+    """输出阶段计时表格，指定路径时同时写出 JSON；写出失败只记录警告，不掩盖处理结果。"""
+    logger.info("阶段计时：\n%s", timings.format_table())
+    if not json_path:
+        return
+    try:
+        logger.info("阶段计时已写入：%s", timings.write_json(json_path))
+    except OSError as exc:
+        logger.warning("阶段计时写入失败：%s: %s", json_path, exc)
 
 
 def main(argv=None) -> None:
@@ -549,55 +1058,18 @@ def main(argv=None) -> None:
             logger = logging.getLogger(__name__)
         validate_cli_mode_args(args)
 
-        config_path = Path(args.config)
-        if not config_path.is_absolute():
-            config_path = get_executable_dir() / config_path
-            logger.info(f"配置文件相对路径已解析为：{config_path}")
-
-        logger.info(f"加载配置文件：{config_path}")
-        config = load_config(str(config_path))
-        validate_config(config)
-        config = build_runtime_config(config)
-        logger.info(f"配置版本：{config['version']}")
-
-        if args.merge_folder:
-            _handle_merge_mode(args, config, logger)
-            return
-
-        logger.info(f"开始处理：{args.excel_path}，单位：{args.unit_name}，月份：{args.month}")
-        validated_month = validate_month(args.month)
-        logger.info(f"月份参数验证通过：{validated_month}")
-
-        if args.unit_name not in config["organization_units"]:
-            raise ConfigError(f"配置文件中未找到单位配置：{args.unit_name}")
-
-        logger.info(f"加载单位配置：{args.unit_name}")
-        raw_unit_config = config["organization_units"][args.unit_name]
-        template_selection_rules = raw_unit_config.get("template_selector", config.get("template_selection_rules", {}))
-        selector_enabled = template_selection_rules.get("enabled", False)
-        matched_rule_group = _resolve_input_filename_rule_group(raw_unit_config, args.excel_path)
-
-        if matched_rule_group:
-            read_rule_group = matched_rule_group
-            read_unit_config = get_unit_config(config, args.unit_name, matched_rule_group)
-            default_unit_config = get_unit_config(config, args.unit_name, "default")
+        timings_json = getattr(args, "timings_json", None)
+        if not (getattr(args, "timings", False) or timings_json):
+            _run(args, logger)
         else:
-            read_rule_group = "default"
-            default_unit_config = get_unit_config(config, args.unit_name, "default")
-            read_unit_config = default_unit_config
-
-        read_context = ProcessingContext(unit_name=args.unit_name, rule_group=read_rule_group)
-        data = _read_input_rows(args.excel_path, read_unit_config, read_context, logger)
-
-        if matched_rule_group:
-            _handle_routed_rule_group_mode(args, config, logger, validated_month, data, matched_rule_group)
-        elif not selector_enabled:
-            _handle_default_mode(args, logger, validated_month, data, default_unit_config)
-        else:
-            _handle_selector_mode(args, config, logger, validated_month, data, template_selection_rules)
-
-        logger.info("处理完成")
-
+            # 处理失败时同样输出已记录的阶段计时，便于定位失败前的耗时；计时未能启用时不输出，保留原始错误
+            timings: StageTimings | None = None
+            try:
+                with collect_timings() as timings:
+                    _run(args, logger)
+            finally:
+                if timings is not None:
+                    _report_timings(timings, timings_json, logger)
     except (
         ConfigError,
         ExcelError,
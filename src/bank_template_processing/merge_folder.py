@@ -5,12 +5,14 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
+from decimal import Decimal
 from pathlib import Path
 from typing import Any, Callable, Mapping
 
 import openpyxl
 import xlrd
 
+from .amount import AmountAccumulator, FixedAmount
 from .config_loader import ConfigError, get_unit_config
 from .config_types import RuleGroupConfig
 from .pipeline import (
@@ -39,6 +41,8 @@ MERGE_AMOUNT_PATTERN = re.compile(r"金额(?P<amount>-?\d+(?:\.\d+)?)元")
 SUPPORTED_EXTENSIONS = {".xlsx", ".xls"}
 MERGE_MONTH_SOURCE_COLUMN = "__merge_month_value__"
 MERGE_SOURCE_FILE_COLUMN = "__merge_source_file__"
+# 文件名金额与数据重算金额允许的舍入差：1 个 0.01
+MERGE_AMOUNT_TOLERANCE_SCALE = 2
 
 
 logger = logging.getLogger(__name__)
@@ -58,7 +62,7 @@ class MergeInputFile:
     unit_name: str
     template_name: str
     count: int | None
-    amount: float | None
+    amount: FixedAmount | None
 
 
 @dataclass
@@ -73,7 +77,7 @@ class MergeTask:
     group_data: list[dict]
     month_param: str
     count: int
-    amount: float
+    amount: FixedAmount
 
 
 def parse_merge_filename(
@@ -93,7 +97,7 @@ def parse_merge_filename(
 
     prefix = match.group("prefix")
     count = int(match.group("count"))
-    amount = float(match.group("amount"))
+    amount = _parse_name_amount(match.group("amount"), file_path.name)
 
     try:
         unit_name, template_name = _split_prefix_to_unit_and_template(prefix, unit_names)
@@ -210,7 +214,7 @@ def prepare_merge_tasks(
     resolve_path_fn: Callable[[str], str],
     apply_transformations_fn: Callable[..., list] | None,
     needs_transformations_fn: Callable[..., bool] | None,
-    calculate_stats_fn: Callable[..., tuple[int, float]] | None,
+    calculate_stats_fn: Callable[..., tuple[int, FixedAmount]] | None,
     needs_month_for_filename: bool,
     logger: Any,
 ) -> list[MergeTask]:
@@ -261,7 +265,7 @@ def prepare_merge_tasks(
         merged_group_data: list[dict] = []
         merged_month_values: set[str] = set()
         count_from_name = 0
-        amount_from_name = 0.0
+        name_amount_total = AmountAccumulator()
         has_complete_name_count = True
         has_complete_name_amount = True
 
@@ -274,11 +278,11 @@ def prepare_merge_tasks(
             merged_group_data.extend(file_rows)
             merged_month_values.update(month_values)
             logger.info(
-                "已读取文件 %s：提取 %s 行，文件名统计 人数=%s 金额=%.2f",
+                "已读取文件 %s：提取 %s 行，文件名统计 人数=%s 金额=%s",
                 file_meta.path.name,
                 len(file_rows),
                 file_meta.count if file_meta.count is not None else "未提供",
-                file_meta.amount if file_meta.amount is not None else 0.0,
+                format(file_meta.amount, ".2f") if file_meta.amount is not None else "未提供",
             )
 
             if file_meta.count is None:
@@ -286,10 +290,11 @@ def prepare_merge_tasks(
             else:
                 count_from_name += file_meta.count
 
-            if file_meta.amount is None:
+            name_amount = None if file_meta.amount is None else FixedAmount.try_from_value(file_meta.amount)
+            if name_amount is None:
                 has_complete_name_amount = False
             else:
-                amount_from_name += file_meta.amount
+                name_amount_total.add(name_amount)
 
         validation_rules = group_config.get("validation_rules", {})
         pre_transform_rules, post_transform_rules = pipeline_split_validation_rules(validation_rules)
@@ -334,7 +339,8 @@ def prepare_merge_tasks(
         if not has_complete_name_count:
             logger.info("分组 %s_%s 跳过文件名人数校验：输入文件名未提供完整人数信息", unit_name, template_name)
 
-        if has_complete_name_amount and abs(amount_from_data - amount_from_name) > 0.01:
+        amount_from_name = name_amount_total.total()
+        if has_complete_name_amount and _amounts_differ(amount_from_data, amount_from_name):
             error = MergeFolderError(
                 "分组 '{0}_{1}' 金额校验失败：文件名累加={2:.2f}，数据重算={3:.2f}".format(
                     unit_name,
@@ -467,7 +473,7 @@ def _infer_merge_input_file_from_name(
     template_names_by_unit: Mapping[str, set[str]],
     *,
     parsed_count: int | None = None,
-    parsed_amount: float | None = None,
+    parsed_amount: FixedAmount | None = None,
 ) -> MergeInputFile:
     """在默认命名规则之外，按配置中的单位/模板名称回推文件元信息。"""
     stem = file_path.stem
@@ -480,7 +486,7 @@ def _infer_merge_input_file_from_name(
     template_name = _select_unique_filename_candidate(remainder, template_candidates, "模板名称", file_path.name)
 
     count = parsed_count if parsed_count is not None else _extract_count_from_name(stem)
-    amount = parsed_amount if parsed_amount is not None else _extract_amount_from_name(stem)
+    amount = parsed_amount if parsed_amount is not None else _extract_amount_from_name(stem, file_path.name)
     return MergeInputFile(
         path=file_path,
         unit_name=unit_name,
@@ -524,11 +530,29 @@ def _extract_count_from_name(stem: str) -> int | None:
     return int(match.group("count"))
 
 
-def _extract_amount_from_name(stem: str) -> float | None:
+def _extract_amount_from_name(stem: str, file_name: str) -> FixedAmount | None:
     match = MERGE_AMOUNT_PATTERN.search(stem)
     if match is None:
         return None
-    return float(match.group("amount"))
+    return _parse_name_amount(match.group("amount"), file_name)
+
+
+def _parse_name_amount(text: str, file_name: str) -> FixedAmount:
+    # 文件名金额已由正则约束为十进制数字，可直接精确构建；位数超出定点金额支持范围时报告文件名
+    try:
+        return FixedAmount.from_decimal(Decimal(text))
+    except ValueError as exc:
+        raise MergeFolderError(f"文件名中的金额无法解析: {file_name}（{exc}）") from exc
+
+
+def _amounts_differ(amount_from_data: FixedAmount, amount_from_name: FixedAmount) -> bool:
+    """按最小单位精确比较金额，允许 0.01 的舍入差。"""
+    data_amount = FixedAmount.try_from_value(amount_from_data)
+    if data_amount is None:
+        return True
+    scale = max(data_amount.scale, amount_from_name.scale, MERGE_AMOUNT_TOLERANCE_SCALE)
+    difference = abs(data_amount.rescale(scale) - amount_from_name.rescale(scale))
+    return difference > 10 ** (scale - MERGE_AMOUNT_TOLERANCE_SCALE)
 
 
 def _read_generated_file_rows(
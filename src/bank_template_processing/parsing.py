@@ -0,0 +1,150 @@
+"""
+解析原语模块
+
+提供不抛异常的数值、日期解析函数，供转换器与验证器共享。
+解析失败时返回 None，调用方据此决定是否报错，避免在正常控制流中使用异常。
+同时提供全角/半角归一化等文本预处理原语，以及携带所表示日期的日期转换输出文本。
+"""
+
+import calendar
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+
+# 全角字符（U+FF01-U+FF5E）与全角空格（U+3000）到半角的映射，一次构建供 str.translate 复用
+_HALF_WIDTH_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_HALF_WIDTH_TABLE[0x3000] = 0x20
+# 绝大多数输入不含全角字符，先用正则判断，避免对整串逐字符查表
+_FULL_WIDTH_PATTERN = re.compile("[\u3000\uff01-\uff5e]")
+
+# 支持的日期输入格式（按优先级顺序）
+DATE_INPUT_FORMATS = [
+    "%Y-%m-%d",  # YYYY-MM-DD
+    "%d/%m/%Y",  # DD/MM/YYYY
+    "%m/%d/%Y",  # MM/DD/YYYY
+    "%Y年%m月%d日",  # 中文格式 YYYY年MM月DD日
+    "%Y-%m-%d",  # YYYY-MM-DD (支持单数字月日)
+]
+
+# 与 Decimal 构造函数接受的字符串语法一致（已去除首尾空白与下划线）
+_DECIMAL_PATTERN = re.compile(
+    r"[+-]?(?:(?:\d+(?:\.\d*)?|\.\d+)(?:e[+-]?\d+)?|inf(?:inity)?|s?nan\d*)",
+    re.IGNORECASE,
+)
+
+# 与 datetime.strptime 对 %Y/%m/%d 使用的匹配规则一致
+_DATE_DIRECTIVE_PATTERNS = {
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+}
+
+
+def _compile_date_format(fmt: str) -> re.Pattern[str]:
+    parts: list[str] = []
+    index = 0
+    while index < len(fmt):
+        char = fmt[index]
+        if char == "%" and index + 1 < len(fmt) and fmt[index + 1] in _DATE_DIRECTIVE_PATTERNS:
+            parts.append(_DATE_DIRECTIVE_PATTERNS[fmt[index + 1]])
+            index += 2
+            continue
+        parts.append(re.escape(char))
+        index += 1
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+# 去重并保持优先级顺序，每种格式只编译一次
+_DATE_PATTERNS = tuple(_compile_date_format(fmt) for fmt in dict.fromkeys(DATE_INPUT_FORMATS))
+
+
+class DateText(str):
+    """
+    日期转换输出的文本
+
+    继承 str 以保持与写出及其他文本处理的兼容；同时保存该文本所表示的日期（时间部分舍去），
+    转换后的校验直接取用，不再按输入格式重新解析，YYYYMMDD、MM/DD/YYYY 等输出格式也能识别为转换前的同一日期。
+    日期只随转换产出的这个值传递，其他字段中相同的文本仍按输入格式解析。
+    """
+
+    __slots__ = ("parsed",)
+
+    parsed: datetime
+
+    def __new__(cls, text: str, parsed: datetime | date) -> "DateText":
+        instance = super().__new__(cls, text)
+        instance.parsed = datetime(parsed.year, parsed.month, parsed.day)
+        return instance
+
+    def __getnewargs__(self) -> tuple[str, datetime]:  # type: ignore[override]
+        return str(self), self.parsed
+
+
+def try_parse_decimal(value: Any) -> Decimal | None:
+    """
+    尝试将值解析为 Decimal
+
+    与 Decimal(str(value)) 的接受范围一致，但解析失败时返回 None 而不是抛出异常。
+
+    Args:
+        value: 待解析的值（Decimal、数字或字符串）
+
+    Returns:
+        Decimal | None: 解析结果，失败时返回 None
+    """
+    if isinstance(value, Decimal):
+        return value
+    text = value if isinstance(value, str) else str(value)
+    if not _DECIMAL_PATTERN.fullmatch(text.strip().replace("_", "")):
+        return None
+    return Decimal(text)
+
+
+def try_parse_date(value: Any) -> datetime | date | None:
+    """
+    尝试将值解析为日期
+
+    datetime/date 原样返回；日期转换输出的 DateText 直接取其保存的日期；
+    其他字符串按 DATE_INPUT_FORMATS 的优先级依次匹配，行为与 datetime.strptime 一致，但解析失败时返回 None 而不是抛出异常。
+
+    Args:
+        value: 待解析的值
+
+    Returns:
+        datetime | date | None: 解析结果，字符串解析成功时返回 datetime，失败时返回 None
+    """
+    if isinstance(value, (datetime, date)):
+        return value
+    if isinstance(value, DateText):
+        return value.parsed
+    if not isinstance(value, str):
+        return None
+
+    for pattern in _DATE_PATTERNS:
+        match = pattern.fullmatch(value)
+        if match is None:
+            continue
+        year = int(match.group("Y"))
+        month = int(match.group("m"))
+        day = int(match.group("d"))
+        if year < 1 or day > calendar.monthrange(year, month)[1]:
+            continue
+        return datetime(year, month, day)
+    return None
+
+
+def to_half_width(text: str) -> str:
+    """
+    将全角字符与全角空格转换为半角
+
+    Args:
+        text: 输入字符串
+
+    Returns:
+        str: 转换后的字符串
+    """
+    if _FULL_WIDTH_PATTERN.search(text) is None:
+        return text
+    return text.translate(_HALF_WIDTH_TABLE)
@@ -3,19 +3,48 @@
 from __future__ import annotations
 
 import logging
+import os
+import tempfile
 from dataclasses import dataclass, replace
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, Callable, Mapping, cast
+from typing import Any, Callable, Mapping, Sequence, TypeVar
 
+from .amount import AmountAccumulator, FixedAmount
+from .columnar import find_first_invalid_row, rows_to_columns
 from .config_types import FieldMappings, ReaderOptions, RuleGroupConfig, ValidationRules
+from .error_report import ErrorCollector, Violation
+from .errors import DataError
 from .excel_reader import ExcelReader
-from .excel_writer import ExcelWriter
+from .excel_writer import ExcelWriter, TemplateStream
+from .row_cache import RowCache
+from .timings import current_timings, stage
+from .transform_registry import BoundTransform, resolve_transform
 from .transformer import TransformError, Transformer
-from .validator import ValidationError, Validator
+from .validator import ValidationError, ValidationPlan, Validator
 
 
 logger = logging.getLogger(__name__)
 
+# 已编译的字段转换：(源字段, 单值转换函数, 转换类型)，转换类型用于记录错误时的规则名
+FieldTransform = tuple[str, BoundTransform, str]
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# 能力属性：带此属性的转换、统计函数已由 GroupRowPreparer 逐行等价实现
+_SINGLE_PASS_ATTR = "has_single_pass_equivalent"
+
+
+def _single_pass_equivalent(fn: _F) -> _F:
+    """标记函数可由单次遍历执行器代替，prepare_group_rows 只对带此标记的函数改用单次遍历。"""
+    setattr(fn, _SINGLE_PASS_ATTR, True)
+    return fn
+
+
+def _supports_single_pass(*fns: Callable[..., Any]) -> bool:
+    """判断给定的转换、统计函数是否都可由单次遍历执行器代替。"""
+    return all(getattr(fn, _SINGLE_PASS_ATTR, False) for fn in fns)
+
 
 @dataclass(frozen=True)
 class ProcessingContext:
@@ -52,12 +81,14 @@ def enrich_error_context(
     context: ProcessingContext | None = None,
     row_number: int | None = None,
 ) -> Exception:
-    """为已知异常补充处理上下文。"""
+    """为已知异常补充处理上下文，结构化数据错误保留 field/value/rule 并记录行号。"""
     context_label = context.describe(row_number) if context else ""
     if context_label:
         message = f"{stage}失败（{context_label}）：{exc}"
     else:
         message = f"{stage}失败：{exc}"
+    if isinstance(exc, DataError):
+        return exc.with_message(message, row=row_number)
     return exc.__class__(message)
 
 
@@ -91,31 +122,115 @@ def build_reader(
 
 
 def validate_rows(
-    data: list[dict],
+    data: Sequence[dict],
     validation_rules: ValidationRules | dict,
     *,
     context: ProcessingContext | None = None,
     source_file_field: str | None = None,
+    errors: ErrorCollector | None = None,
+    indices: Sequence[int] | None = None,
 ) -> None:
-    """逐行执行校验。"""
+    """
+    逐行执行校验；传入 errors 时收集全部违规项而不在首个错误处中止。
+
+    传入 indices 时逐行规则只校验这些下标的行（其余行在上次运行中已以相同内容通过），
+    跨行规则仍覆盖全部行。
+    """
     if not validation_rules:
         return
 
-    required_fields = validation_rules.get("required_fields")
-    data_types = validation_rules.get("data_types")
-    value_ranges = validation_rules.get("value_ranges")
+    plan = Validator.compile(validation_rules)
 
-    for row_number, row in enumerate(data, start=1):
-        row_context = _row_context(context, row, source_file_field)
+    if errors is not None:
+        _collect_validation_errors(data, plan, errors, context, source_file_field, indices)
+        return
+
+    invalid_index = _find_first_invalid_index(plan, data, indices)
+    if invalid_index is not None:
+        row = data[invalid_index]
         try:
-            if required_fields:
-                Validator.validate_required(row, required_fields)
-            if data_types:
-                Validator.validate_data_types(row, data_types)
-            if value_ranges:
-                Validator.validate_value_ranges(row, cast(dict[str, dict[str, Any]], value_ranges))
+            plan.validate(row)
+            # 逐行规则通过时，失败来自跨行规则，重放到该行以得到对应的错误
+            cross_row = plan.start_cross_row()
+            for previous_row in data[: invalid_index + 1]:
+                cross_row.check(previous_row)
         except ValidationError as exc:
-            raise enrich_error_context(exc, "数据校验", row_context, row_number) from exc
+            row_context = _row_context(context, row, source_file_field)
+            raise enrich_error_context(exc, "数据校验", row_context, invalid_index + 1) from exc
+
+    _log_validation_passed(validation_rules, len(data))
+
+
+def _log_validation_passed(validation_rules: ValidationRules | dict, row_count: int) -> None:
+    rule_labels = [label for key, label in _RULE_LABELS if validation_rules.get(key)]
+    logger.info("数据校验通过：%s 行（%s）", row_count, "、".join(rule_labels))
+
+
+# 校验通过日志中各类规则的名称
+_RULE_LABELS = (
+    ("required_fields", "必填字段"),
+    ("data_types", "数据类型"),
+    ("value_ranges", "值范围"),
+    ("unique_fields", "唯一性"),
+    ("max_total", "累计上限"),
+    ("max_rows_per_file", "单文件行数"),
+)
+
+
+def _find_first_invalid_index(
+    plan: ValidationPlan,
+    data: Sequence[dict],
+    indices: Sequence[int] | None,
+) -> int | None:
+    if indices is None:
+        return find_first_invalid_row(plan, rows_to_columns(data, plan.fields), len(data))
+
+    row_plan = plan.per_row()
+    selected = [data[index] for index in indices]
+    found = find_first_invalid_row(row_plan, rows_to_columns(selected, row_plan.fields), len(selected))
+    first_invalid = None if found is None else indices[found]
+
+    cross_row_plan = plan.cross_row_only()
+    if cross_row_plan:
+        found = find_first_invalid_row(cross_row_plan, rows_to_columns(data, cross_row_plan.fields), len(data))
+        if found is not None and (first_invalid is None or found < first_invalid):
+            first_invalid = found
+    return first_invalid
+
+
+def _collect_validation_errors(
+    data: Sequence[dict],
+    plan: ValidationPlan,
+    errors: ErrorCollector,
+    context: ProcessingContext | None,
+    source_file_field: str | None,
+    indices: Sequence[int] | None = None,
+) -> None:
+    found_before = len(errors)
+    cross_row = plan.start_cross_row()
+    selected = None if indices is None else set(indices)
+    for row_number, row in enumerate(data, start=1):
+        violations = plan.collect(row) if selected is None or row_number - 1 in selected else []
+        violations.extend(cross_row.collect(row))
+        if violations:
+            location = _describe_location(context, row, source_file_field)
+            _add_validation_violations(errors, violations, row_number, location)
+
+    found = len(errors) - found_before
+    if found:
+        logger.warning("数据校验发现 %s 处错误：%s 行", found, len(data))
+    else:
+        logger.info("数据校验通过：%s 行", len(data))
+
+
+def _add_validation_violations(
+    errors: ErrorCollector,
+    violations: list[ValidationError],
+    row_number: int,
+    location: str,
+) -> None:
+    for exc in violations:
+        errors.add(Violation("数据校验", row_number, exc.field, exc.rule or "", exc.value, str(exc), location))
 
 
 def split_validation_rules(
@@ -140,9 +255,23 @@ def split_validation_rules(
     if value_ranges:
         post_transform_rules["value_ranges"] = value_ranges
 
+    # 跨行规则比较的是转换后的值（如去除格式后的卡号、定点金额）
+    unique_fields = validation_rules.get("unique_fields")
+    if unique_fields:
+        post_transform_rules["unique_fields"] = unique_fields
+
+    max_total = validation_rules.get("max_total")
+    if max_total:
+        post_transform_rules["max_total"] = max_total
+
+    max_rows_per_file = validation_rules.get("max_rows_per_file")
+    if max_rows_per_file is not None:
+        post_transform_rules["max_rows_per_file"] = max_rows_per_file
+
     return pre_transform_rules, post_transform_rules
 
 
+@_single_pass_equivalent
 def needs_transformations(field_mappings: FieldMappings | dict) -> bool:
     """判断字段映射中是否包含转换规则。"""
     for mapping in field_mappings.values():
@@ -154,74 +283,134 @@ def needs_transformations(field_mappings: FieldMappings | dict) -> bool:
     return False
 
 
+@_single_pass_equivalent
 def apply_transformations(
-    data: list[dict],
+    data: Sequence[dict],
     transformations: dict,
     field_mappings: FieldMappings | dict,
     *,
     context: ProcessingContext | None = None,
     source_file_field: str | None = None,
+    errors: ErrorCollector | None = None,
+    indices: Sequence[int] | None = None,
+    in_place: bool = False,
 ) -> list[dict]:
-    """按字段映射执行数据转换。"""
-    transformer = Transformer()
-    warned_old_format = False
-    result: list[dict] = []
+    """
+    按字段映射执行数据转换；传入 errors 时记录转换失败并保留原值继续处理。
 
-    for row_number, row in enumerate(data, start=1):
-        row_context = _row_context(context, row, source_file_field)
-        new_row = row.copy()
-
-        for template_field, mapping_config in field_mappings.items():
-            if not isinstance(mapping_config, dict):
-                if transformations and not warned_old_format:
-                    logger.warning("检测到旧格式 field_mappings，转换规则将被忽略，请迁移到字典格式")
-                    warned_old_format = True
-                continue
+    传入 indices 时只转换这些下标的行，其余行原样保留在结果中。
+    in_place 为 True 时直接改写原数据行（调用方不再需要转换前的行时使用），不为每行创建副本。
+    """
+    try:
+        field_transforms = compile_field_transforms(field_mappings, transformations)
+    except TransformError as exc:
+        raise enrich_error_context(exc, "数据转换", context) from exc
 
-            source_field = mapping_config.get("source_column", template_field)
-            transform_type = mapping_config.get("transform", "none")
-            value = new_row.get(source_field, "")
+    if data and transformations and any(not isinstance(config, dict) for config in field_mappings.values()):
+        logger.warning("检测到旧格式 field_mappings，转换规则将被忽略，请迁移到字典格式")
 
-            if value is None:
-                continue
-            if isinstance(value, str) and not value.strip():
+    def convert(index: int, row: dict) -> dict:
+        return transform_row(
+            row,
+            index + 1,
+            field_transforms,
+            context=context,
+            source_file_field=source_file_field,
+            errors=errors,
+            in_place=in_place,
+        )
+
+    if indices is None:
+        result = [convert(index, row) for index, row in enumerate(data)]
+    else:
+        result = list(data)
+        for index in indices:
+            result[index] = convert(index, data[index])
+
+    logger.info("数据转换完成：%s 行", len(result) if indices is None else len(indices))
+    return result
+
+
+def transform_row(
+    row: dict,
+    row_number: int,
+    field_transforms: Sequence[FieldTransform],
+    *,
+    context: ProcessingContext | None = None,
+    source_file_field: str | None = None,
+    errors: ErrorCollector | None = None,
+    in_place: bool = False,
+) -> dict:
+    """
+    转换单行数据，返回新行；field_transforms 由 compile_field_transforms 预先编译。
+
+    in_place 为 True 时直接改写并返回 row 本身。
+    """
+    new_row = row if in_place else row.copy()
+
+    for source_field, transform_fn, transform_type in field_transforms:
+        value = new_row.get(source_field)
+        if value is None:
+            continue
+        if isinstance(value, str) and not value.strip():
+            continue
+
+        try:
+            new_row[source_field] = transform_fn(value)
+        except TransformError as exc:
+            if errors is not None:
+                location = _describe_location(context, row, source_file_field)
+                rule = exc.rule or transform_type
+                errors.add(Violation("数据转换", row_number, source_field, rule, value, str(exc), location))
                 continue
+            row_context = _row_context(context, row, source_file_field)
+            raise enrich_error_context(exc, "数据转换", row_context, row_number) from exc
 
-            try:
-                if transform_type == "amount_decimal":
-                    transform_config = transformations.get("amount_decimal", {})
-                    decimal_places = transform_config.get("decimal_places", 2)
-                    rounding = transform_config.get("rounding", "round")
-                    new_row[source_field] = transformer.transform_amount(value, decimal_places, rounding=rounding)
-                elif transform_type == "card_number":
-                    transform_config = transformations.get("card_number", {})
-                    remove_formatting = transform_config.get("remove_formatting", True)
-                    luhn_validation = transform_config.get("luhn_validation", True)
-                    new_row[source_field] = transformer.transform_card_number(
-                        value,
-                        remove_formatting=remove_formatting,
-                        luhn_validation=luhn_validation,
-                    )
-                elif transform_type == "date_format":
-                    transform_config = transformations.get("date_format", {})
-                    output_format = transform_config.get("output_format", "YYYY-MM-DD")
-                    new_row[source_field] = transformer.transform_date(value, output_format)
-            except TransformError as exc:
-                raise enrich_error_context(exc, "数据转换", row_context, row_number) from exc
+    return new_row
 
-        result.append(new_row)
 
-    return result
+def compile_field_transforms(
+    field_mappings: FieldMappings | dict,
+    transformations: Mapping[str, Any] | None,
+) -> tuple[FieldTransform, ...]:
+    """
+    按规则组一次性编译字段转换，同一转换类型只解析一次
 
+    旧格式映射、未配置转换或转换类型为 none 的字段在编译时剔除，
+    结果按 field_mappings 的顺序排列，逐行转换时只需依次调用。
+    """
+    transformer = Transformer()
+    resolved_by_type: dict[str, BoundTransform | None] = {}
+    field_transforms: list[FieldTransform] = []
 
+    for template_field, mapping_config in field_mappings.items():
+        if not isinstance(mapping_config, dict):
+            continue
+        transform_type = mapping_config.get("transform", "none")
+        if not isinstance(transform_type, str):
+            continue
+        if transform_type not in resolved_by_type:
+            resolved_by_type[transform_type] = resolve_transform(transform_type, transformations, transformer)
+        transform_fn = resolved_by_type[transform_type]
+        if transform_fn is not None:
+            source_field = mapping_config.get("source_column", template_field)
+            field_transforms.append((source_field, transform_fn, transform_type))
+
+    return tuple(field_transforms)
+
+
+@_single_pass_equivalent
 def transform_rows(
-    data: list[dict],
+    data: Sequence[dict],
     transformations: dict,
     field_mappings: FieldMappings | dict,
     *,
     context: ProcessingContext | None = None,
     source_file_field: str | None = None,
-) -> list[dict]:
+    errors: ErrorCollector | None = None,
+    indices: Sequence[int] | None = None,
+    in_place: bool = False,
+) -> Sequence[dict]:
     """在需要时执行转换。"""
     if not needs_transformations(field_mappings):
         return data
@@ -231,98 +420,495 @@ def transform_rows(
         field_mappings,
         context=context,
         source_file_field=source_file_field,
+        errors=errors,
+        indices=indices,
+        in_place=in_place,
     )
 
 
-def calculate_stats(data: list[dict], field_mappings: FieldMappings | dict, transformations: dict) -> tuple[int, float]:
-    """计算输出文件名所需统计信息。"""
+@_single_pass_equivalent
+def calculate_stats(
+    data: Sequence[dict],
+    field_mappings: FieldMappings | dict,
+    transformations: dict,
+) -> tuple[int, FixedAmount]:
+    """计算输出文件名所需统计信息，金额以定点金额精确累加。"""
     del transformations  # 保留兼容签名
     count = len(data)
-    total_amount = 0.0
-
-    amount_column = None
-    for mapping in field_mappings.values():
-        if not isinstance(mapping, dict):
-            continue
-        if mapping.get("transform") == "amount_decimal":
-            amount_column = mapping.get("source_column")
-            break
+    total_amount = AmountAccumulator()
 
+    amount_column = find_amount_column(field_mappings)
     if amount_column:
         for row_number, row in enumerate(data, start=1):
             value = row.get(amount_column)
-            if value is None:
-                continue
-            if isinstance(value, bool):
-                raise ValidationError(
-                    f"第{row_number}条数据中金额统计字段 '{amount_column}' 的值无法解析为数值: {value!r}"
-                )
-            if isinstance(value, (int, float)):
-                total_amount += float(value)
-            elif isinstance(value, str) and value.strip():
-                try:
-                    normalized = value.replace(",", "").replace("，", "").strip()
-                    total_amount += float(normalized)
-                except (ValueError, TypeError) as exc:
-                    raise ValidationError(
-                        f"第{row_number}条数据中金额统计字段 '{amount_column}' 的值无法解析为数值: {value!r}"
-                    ) from exc
-            elif value != "":
+            try:
+                amount = coerce_stat_amount(value)
+            except ValueError:
                 raise ValidationError(
                     f"第{row_number}条数据中金额统计字段 '{amount_column}' 的值无法解析为数值: {value!r}"
-                )
+                ) from None
+            if amount is not None:
+                total_amount.add(amount)
 
-    return count, total_amount
+    return count, total_amount.total()
+
+
+def find_amount_column(field_mappings: FieldMappings | dict) -> str | None:
+    """返回金额统计使用的列：首个 amount_decimal 转换字段的 source_column。"""
+    for mapping in field_mappings.values():
+        if not isinstance(mapping, dict):
+            continue
+        if mapping.get("transform") == "amount_decimal":
+            return mapping.get("source_column")
+    return None
+
+
+def coerce_stat_amount(value: Any) -> FixedAmount | None:
+    """将金额统计字段的值转为定点金额，空值返回 None，无法解析时抛出 ValueError。"""
+    if isinstance(value, FixedAmount):
+        return value
+    if value is None:
+        return None
+    amount = None
+    if isinstance(value, str):
+        normalized = value.replace(",", "").replace("，", "").strip()
+        if not normalized:
+            return None
+        amount = FixedAmount.try_from_value(normalized)
+    elif isinstance(value, (int, float, Decimal)):
+        amount = FixedAmount.try_from_value(value)
+    if amount is None:
+        raise ValueError(f"金额无法解析为数值: {value!r}")
+    return amount
 
 
 def prepare_group_rows(
-    data: list[dict],
+    data: Sequence[dict],
     group_config: RuleGroupConfig | dict[str, Any],
     *,
     context: ProcessingContext | None = None,
     source_file_field: str | None = None,
     transform_fn: Callable[..., list[dict]] = transform_rows,
     needs_transform_fn: Callable[..., bool] = needs_transformations,
-    stats_fn: Callable[..., tuple[int, float]] = calculate_stats,
-) -> tuple[list[dict], int, float]:
-    """对单组数据执行校验、转换和统计。"""
+    stats_fn: Callable[..., tuple[int, FixedAmount]] = calculate_stats,
+    errors: ErrorCollector | None = None,
+    row_cache: RowCache | None = None,
+    in_place: bool = False,
+) -> tuple[Sequence[dict], int, FixedAmount]:
+    """
+    对单组数据执行校验、转换和统计。
+
+    传入 errors 时进入错误收集模式：校验与转换错误记录到 errors 中继续处理，
+    本组出现错误时跳过金额统计，返回的人数与金额均为 0。
+
+    传入 row_cache 时进入增量模式：与上次输入内容相同的行直接复用上次的转换结果，
+    只有新增或变更的行执行转换与逐行校验；跨行规则与金额统计仍覆盖全部行，
+    本组无错误时更新缓存。
+
+    in_place 为 True 时转换直接改写传入的数据行，不为每行创建副本；调用方此后不得再使用转换前的行。
+
+    未启用错误收集与增量缓存、且转换与统计函数都带有单次遍历能力标记时，
+    由单次遍历的执行器完成全部阶段，首个错误与分阶段执行时相同；其他自定义函数按分阶段执行。
+    """
+    if errors is None and row_cache is None and _supports_single_pass(transform_fn, needs_transform_fn, stats_fn):
+        return _prepare_group_rows_fused(
+            data,
+            group_config,
+            context=context,
+            source_file_field=source_file_field,
+            in_place=in_place,
+        )
+
+    found_before = len(errors) if errors is not None else 0
+    # 错误收集器、增量下标与原地转换只在启用时传给转换函数，兼容不接受这些参数的自定义转换函数
+    collect_kwargs: dict[str, Any] = {"errors": errors} if errors is not None else {}
+    cache_match = row_cache.match(data) if row_cache is not None else None
+    indices = cache_match.misses if cache_match is not None else None
+    if indices is not None:
+        collect_kwargs["indices"] = indices
+    if in_place:
+        collect_kwargs["in_place"] = True
     validation_rules = group_config.get("validation_rules", {})
     pre_transform_rules, post_transform_rules = split_validation_rules(validation_rules)
-    validate_rows(
-        data,
-        pre_transform_rules,
-        context=context,
-        source_file_field=source_file_field,
-    )
+    with stage("数据校验", len(data)):
+        validate_rows(
+            data,
+            pre_transform_rules,
+            context=context,
+            source_file_field=source_file_field,
+            errors=errors,
+            indices=indices,
+        )
 
     transformations = group_config.get("transformations", {})
     field_mappings = group_config.get("field_mappings", {})
     if needs_transform_fn(field_mappings):
-        data = transform_fn(
+        with stage("数据转换", len(data)):
+            data = transform_fn(
+                data,
+                transformations,
+                field_mappings,
+                context=context,
+                source_file_field=source_file_field,
+                **collect_kwargs,
+            )
+    if cache_match is not None:
+        data = cache_match.merge(data)
+
+    with stage("数据校验", len(data)):
+        validate_rows(
             data,
-            transformations,
-            field_mappings,
+            post_transform_rules,
             context=context,
             source_file_field=source_file_field,
+            errors=errors,
+            indices=indices,
         )
 
-    validate_rows(
-        data,
-        post_transform_rules,
-        context=context,
-        source_file_field=source_file_field,
-    )
+    if errors is not None and len(errors) > found_before:
+        return data, 0, 0.0
 
     try:
-        count, amount = stats_fn(data, field_mappings, transformations)
+        with stage("金额统计", len(data)):
+            count, amount = stats_fn(data, field_mappings, transformations)
     except ValidationError as exc:
         raise enrich_error_context(exc, "金额统计", context) from exc
 
+    if row_cache is not None and cache_match is not None:
+        row_cache.save(cache_match.fingerprints, data)
     return data, count, amount
 
 
+# 逐行准备中各阶段的顺序：转换前校验、转换、转换后校验、金额统计
+_STAGE_PRE_VALIDATION = 0
+_STAGE_TRANSFORM = 1
+_STAGE_POST_VALIDATION = 2
+_STAGE_STATS = 3
+_STAGE_COUNT = 4
+
+
+def _prepare_group_rows_fused(
+    data: Sequence[dict],
+    group_config: RuleGroupConfig | dict[str, Any],
+    *,
+    context: ProcessingContext | None,
+    source_file_field: str | None,
+    in_place: bool = False,
+) -> tuple[Sequence[dict], int, FixedAmount]:
+    """单次遍历完成校验、转换和统计，遇错即止。"""
+    preparer = GroupRowPreparer(group_config, context=context, source_file_field=source_file_field, in_place=in_place)
+    # 原地转换时准备好的行就是输入行本身，data 可直接交给写出，只有复制转换时才需另建列表
+    collect = preparer.transforms_rows and not in_place
+    prepared: list[dict] = []
+    for row in data:
+        prepared_row = preparer.add(row)
+        if preparer.settled:
+            break
+        if collect and prepared_row is not None:
+            prepared.append(prepared_row)
+    count, amount = preparer.finish()
+    return (prepared if collect else data), count, amount
+
+
+class GroupRowPreparer:
+    """
+    单组数据的逐行准备，遇错即止
+
+    逐行完成转换前校验、转换、转换后校验和金额累计，供单次遍历的 prepare_group_rows 与流式写出共用。
+    分阶段执行时，较早阶段的错误优先于较晚阶段，即使出现在更靠后的行。
+    因此某行失败后先记下该错误，后续行只再执行更早的阶段：更早阶段失败时替换已记下的错误，
+    finish 时抛出记下的错误，报告的错误与分阶段执行时相同。
+    """
+
+    def __init__(
+        self,
+        group_config: RuleGroupConfig | dict[str, Any],
+        *,
+        context: ProcessingContext | None = None,
+        source_file_field: str | None = None,
+        in_place: bool = False,
+    ):
+        self.context = context
+        self.count = 0
+        self._source_file_field = source_file_field
+        self._in_place = in_place
+
+        validation_rules = group_config.get("validation_rules", {})
+        self._pre_rules, self._post_rules = split_validation_rules(validation_rules)
+        pre_plan = Validator.compile(self._pre_rules)
+        post_plan = Validator.compile(self._post_rules)
+        self._pre_check = pre_plan.row_checker() if pre_plan else None
+        self._post_check = post_plan.row_checker() if post_plan else None
+        self._pre_cross_row = pre_plan.start_cross_row() if pre_plan.cross_row_rules else None
+        self._post_cross_row = post_plan.start_cross_row() if post_plan.cross_row_rules else None
+
+        transformations = group_config.get("transformations", {})
+        self._field_mappings = group_config.get("field_mappings", {})
+        self._transforms: tuple[FieldTransform, ...] | None = None
+        self._warn_legacy_mappings = False
+        if needs_transformations(self._field_mappings):
+            try:
+                self._transforms = compile_field_transforms(self._field_mappings, transformations)
+            except TransformError as exc:
+                raise enrich_error_context(exc, "数据转换", context) from exc
+            self._warn_legacy_mappings = bool(transformations) and any(
+                not isinstance(config, dict) for config in self._field_mappings.values()
+            )
+
+        self._amount_column = find_amount_column(self._field_mappings)
+        self._amount = AmountAccumulator()
+        self._failure: Exception | None = None
+        # 仍需执行的阶段数，记下错误后缩减为失败阶段之前的阶段
+        self._stages = _STAGE_COUNT
+        self._timings = current_timings()
+        self._prepare_row = self._prepare if self._timings is None else self._prepare_timed
+
+    @property
+    def transforms_rows(self) -> bool:
+        """本组是否配置了转换（未配置时准备好的行就是输入行）。"""
+        return self._transforms is not None
+
+    @property
+    def failed(self) -> bool:
+        """是否已记下错误。"""
+        return self._failure is not None
+
+    @property
+    def settled(self) -> bool:
+        """转换前校验已失败，后续行不会再改变要报告的错误。"""
+        return self._stages == _STAGE_PRE_VALIDATION
+
+    def add(self, row: dict) -> dict | None:
+        """
+        准备本组的下一行
+
+        Args:
+            row: 输入数据行
+
+        Returns:
+            dict | None: 准备好的行；本组已记下错误时返回 None
+        """
+        self.count += 1
+        if self._stages == _STAGE_PRE_VALIDATION:
+            return None
+        return self._prepare_row(row, self.count)
+
+    def finish(self) -> tuple[int, FixedAmount]:
+        """
+        结束本组
+
+        Returns:
+            tuple[int, FixedAmount]: 行数与金额合计
+
+        Raises:
+            ValidationError | TransformError: 本组记下的错误
+        """
+        if self._failure is not None:
+            raise self._failure
+        if self._pre_rules:
+            _log_validation_passed(self._pre_rules, self.count)
+        if self._transforms is not None:
+            logger.info("数据转换完成：%s 行", self.count)
+        if self._post_rules:
+            _log_validation_passed(self._post_rules, self.count)
+        return self.count, self._amount.total()
+
+    def _prepare(self, row: dict, row_number: int) -> dict | None:
+        if not self._pre_validate(row, row_number) or self._stages <= _STAGE_TRANSFORM:
+            return None
+        prepared = self._transform(row, row_number)
+        if prepared is None or self._stages <= _STAGE_POST_VALIDATION:
+            return None
+        if not self._post_validate(prepared, row, row_number) or self._stages <= _STAGE_STATS:
+            return None
+        return prepared if self._accumulate(prepared, row_number) else None
+
+    def _prepare_timed(self, row: dict, row_number: int) -> dict | None:
+        # 与 _prepare 相同，但逐阶段计时；仅在启用计时时使用，未启用时不增加开销
+        timings = self._timings
+        started = timings.begin()
+        passed = self._pre_validate(row, row_number)
+        timings.end("数据校验", started, 1, int(passed))
+        if not passed or self._stages <= _STAGE_TRANSFORM:
+            return None
+        prepared: dict | None = row
+        if self._transforms is not None:
+            started = timings.begin()
+            prepared = self._transform(row, row_number)
+            timings.end("数据转换", started, 1, int(prepared is not None))
+        if prepared is None or self._stages <= _STAGE_POST_VALIDATION:
+            return None
+        started = timings.begin()
+        passed = self._post_validate(prepared, row, row_number)
+        timings.end("数据校验", started, 1, int(passed))
+        if not passed or self._stages <= _STAGE_STATS:
+            return None
+        if self._amount_column is None:
+            return prepared
+        started = timings.begin()
+        passed = self._accumulate(prepared, row_number)
+        timings.end("金额统计", started, 1, int(passed))
+        return prepared if passed else None
+
+    def _pre_validate(self, row: dict, row_number: int) -> bool:
+        try:
+            if self._pre_check is not None:
+                self._pre_check(row)
+            if self._pre_cross_row is not None:
+                self._pre_cross_row.check(row)
+        except ValidationError as exc:
+            self._fail(self._validation_failure(exc, row, row_number), _STAGE_PRE_VALIDATION, exc)
+            return False
+        return True
+
+    def _transform(self, row: dict, row_number: int) -> dict | None:
+        if self._transforms is None:
+            return row
+        if self._warn_legacy_mappings:
+            logger.warning("检测到旧格式 field_mappings，转换规则将被忽略，请迁移到字典格式")
+            self._warn_legacy_mappings = False
+        try:
+            return transform_row(
+                row,
+                row_number,
+                self._transforms,
+                context=self.context,
+                source_file_field=self._source_file_field,
+                in_place=self._in_place,
+            )
+        except TransformError as exc:
+            # transform_row 抛出的错误已带上下文
+            self._fail(exc, _STAGE_TRANSFORM)
+            return None
+
+    def _post_validate(self, row: dict, source_row: dict, row_number: int) -> bool:
+        try:
+            if self._post_check is not None:
+                self._post_check(row)
+            if self._post_cross_row is not None:
+                self._post_cross_row.check(row)
+        except ValidationError as exc:
+            self._fail(self._validation_failure(exc, source_row, row_number), _STAGE_POST_VALIDATION, exc)
+            return False
+        return True
+
+    def _accumulate(self, row: dict, row_number: int) -> bool:
+        if self._amount_column is None:
+            return True
+        value = row.get(self._amount_column)
+        try:
+            amount = coerce_stat_amount(value)
+        except ValueError:
+            message = f"第{row_number}条数据中金额统计字段 '{self._amount_column}' 的值无法解析为数值: {value!r}"
+            self._fail(enrich_error_context(ValidationError(message), "金额统计", self.context), _STAGE_STATS)
+            return False
+        if amount is not None:
+            self._amount.add(amount)
+        return True
+
+    def _validation_failure(self, exc: ValidationError, row: dict, row_number: int) -> Exception:
+        row_context = _row_context(self.context, row, self._source_file_field)
+        return enrich_error_context(exc, "数据校验", row_context, row_number)
+
+    def _fail(self, failure: Exception, stage: int, cause: Exception | None = None) -> None:
+        # 只有早于已记下错误的阶段还会执行，新的错误总是优先
+        if cause is not None:
+            failure.__cause__ = cause
+        self._failure = failure
+        self._stages = stage
+
+
+@dataclass(frozen=True)
+class GroupCheckResult:
+    """流式检查中单个分组的统计结果。"""
+
+    context: ProcessingContext | None
+    count: int
+    amount: FixedAmount
+    error_count: int
+
+
+class StreamingGroupCheck:
+    """
+    单个分组的流式检查
+
+    逐行执行与 prepare_group_rows 相同的转换前校验、转换、转换后校验和金额统计，
+    每行处理完即丢弃；跨行规则与金额合计以增量状态维护，不保留分组的行列表。
+    数据错误全部记录到 errors 中，不在首个错误处中止。
+    """
+
+    def __init__(
+        self,
+        group_config: RuleGroupConfig | dict[str, Any],
+        errors: ErrorCollector,
+        *,
+        context: ProcessingContext | None = None,
+    ):
+        self.context = context
+        self.count = 0
+        self.error_count = 0
+        self._errors = errors
+
+        pre_transform_rules, post_transform_rules = split_validation_rules(group_config.get("validation_rules", {}))
+        self._pre_plan = Validator.compile(pre_transform_rules)
+        self._post_plan = Validator.compile(post_transform_rules)
+        self._pre_cross_row = self._pre_plan.start_cross_row()
+        self._post_cross_row = self._post_plan.start_cross_row()
+
+        self._field_mappings = group_config.get("field_mappings", {})
+        try:
+            self._transforms = compile_field_transforms(self._field_mappings, group_config.get("transformations", {}))
+        except TransformError as exc:
+            raise enrich_error_context(exc, "数据转换", context) from exc
+
+        self._amount_column = find_amount_column(self._field_mappings)
+        self._amount = AmountAccumulator()
+
+    def check_row(self, row: dict) -> None:
+        """检查本组的下一行数据。"""
+        self.count += 1
+        row_number = self.count
+        found_before = len(self._errors)
+        location = self.context.describe() if self.context else ""
+
+        violations = self._pre_plan.collect(row)
+        violations.extend(self._pre_cross_row.collect(row))
+        if self._transforms:
+            row = transform_row(
+                row,
+                row_number,
+                self._transforms,
+                context=self.context,
+                errors=self._errors,
+            )
+        violations.extend(self._post_plan.collect(row))
+        violations.extend(self._post_cross_row.collect(row))
+        _add_validation_violations(self._errors, violations, row_number, location)
+
+        if self._amount_column:
+            value = row.get(self._amount_column)
+            try:
+                amount = coerce_stat_amount(value)
+            except ValueError:
+                # 转换失败的行已记录错误，原值无需重复报告
+                if len(self._errors) == found_before:
+                    message = f"第{row_number}条数据中金额统计字段 '{self._amount_column}' 的值无法解析为数值: {value!r}"
+                    self._errors.add(
+                        Violation("金额统计", row_number, self._amount_column, "amount", value, message, location)
+                    )
+            else:
+                if amount is not None:
+                    self._amount.add(amount)
+
+        self.error_count += len(self._errors) - found_before
+
+    def result(self) -> GroupCheckResult:
+        """返回当前的分组统计。"""
+        return GroupCheckResult(self.context, self.count, self._amount.total(), self.error_count)
+
+
 def write_group_output(
-    group_data: list[dict],
+    group_data: Sequence[dict],
     group_config: RuleGroupConfig | dict,
     template_path: str,
     output_path: Path,
@@ -331,35 +917,117 @@ def write_group_output(
     writer_cls: type[ExcelWriter] = ExcelWriter,
 ) -> None:
     """将处理后的分组数据写入模板。"""
-    field_mappings = group_config.get("field_mappings", {})
-    header_row = group_config.get("header_row", 1)
-    start_row = group_config.get("start_row", header_row + 1)
-    fixed_values = group_config.get("fixed_values", {})
-    auto_number = group_config.get("auto_number", {"enabled": False})
-    bank_branch_mapping = group_config.get("bank_branch_mapping", {"enabled": False})
-    month_type_mapping = group_config.get("month_type_mapping", {"enabled": False})
-    clear_rows = group_config.get("clear_rows")
-
     logger_instance.info(f"写入输出文件：{output_path}")
     writer = writer_cls()
     writer.write_excel(
         template_path=template_path,
         data=group_data,
-        field_mappings=field_mappings,
         output_path=str(output_path),
-        header_row=header_row,
-        start_row=start_row,
-        mapping_mode="column_name",
-        fixed_values=fixed_values,
-        auto_number=auto_number,
-        bank_branch_mapping=bank_branch_mapping,
-        month_type_mapping=month_type_mapping,
-        month_param=month_param,
-        clear_rows=clear_rows,
+        **_writer_options(group_config, month_param),
     )
     logger_instance.info(f"输出文件已保存：{output_path}")
 
 
+def _writer_options(group_config: RuleGroupConfig | dict, month_param: str) -> dict[str, Any]:
+    """规则组配置中与模板写出相关的参数。"""
+    header_row = group_config.get("header_row", 1)
+    return {
+        "field_mappings": group_config.get("field_mappings", {}),
+        "header_row": header_row,
+        "start_row": group_config.get("start_row", header_row + 1),
+        "mapping_mode": "column_name",
+        "fixed_values": group_config.get("fixed_values", {}),
+        "auto_number": group_config.get("auto_number", {"enabled": False}),
+        "bank_branch_mapping": group_config.get("bank_branch_mapping", {"enabled": False}),
+        "month_type_mapping": group_config.get("month_type_mapping", {"enabled": False}),
+        "month_param": month_param,
+        "clear_rows": group_config.get("clear_rows"),
+    }
+
+
+class StreamingGroupOutput:
+    """
+    单个分组的端到端流式写出
+
+    逐行执行与 prepare_group_rows 相同的校验、转换和统计（遇错即止），准备好的行按批写入模板。
+    输出文件名依赖人数与金额，因此先写入输出目录中的临时文件，finish 时确认本组无错误后再改名；
+    本组记下错误后不再写入，discard 删除未完成的临时文件。
+    """
+
+    def __init__(
+        self,
+        group_config: RuleGroupConfig | dict[str, Any],
+        template_path: str,
+        output_dir: Path,
+        month_param: str,
+        *,
+        context: ProcessingContext | None = None,
+        batch_size: int = 1000,
+        writer_cls: type[ExcelWriter] = ExcelWriter,
+    ):
+        self.context = context
+        self.template_path = template_path
+        self._preparer = GroupRowPreparer(group_config, context=context, in_place=True)
+        self._batch: list[dict] = []
+        self._batch_size = batch_size
+
+        fd, temp_name = tempfile.mkstemp(prefix=".writing_", suffix=Path(template_path).suffix, dir=output_dir)
+        os.close(fd)
+        self.temp_path = Path(temp_name)
+        try:
+            self._stream: TemplateStream = writer_cls().open_stream(
+                template_path=template_path,
+                output_path=str(self.temp_path),
+                **_writer_options(group_config, month_param),
+            )
+        except BaseException:
+            self.discard()
+            raise
+
+    @property
+    def count(self) -> int:
+        """已收到的行数。"""
+        return self._preparer.count
+
+    def add(self, row: dict) -> None:
+        """处理本组的下一行。"""
+        prepared = self._preparer.add(row)
+        if prepared is None:
+            # 本组已有错误，不会再写出，已缓冲的行也无需保留
+            self._batch.clear()
+            return
+        self._batch.append(prepared)
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+
+    def finish(self, output_filename: Callable[[int, FixedAmount], str]) -> Path:
+        """
+        结束本组：抛出记下的错误，或保存并按人数与金额改名
+
+        Args:
+            output_filename: 根据人数与金额生成输出文件名的函数
+
+        Returns:
+            Path: 输出文件路径
+        """
+        count, amount = self._preparer.finish()
+        self._flush()
+        self._stream.save()
+        output_path = self.temp_path.with_name(output_filename(count, amount))
+        self.temp_path.replace(output_path)
+        logger.info("输出文件已保存：%s（%s 行，金额 %s）", output_path, count, format(amount, ".2f"))
+        return output_path
+
+    def discard(self) -> None:
+        """删除未完成的临时文件；已改名的输出不受影响。"""
+        self.temp_path.unlink(missing_ok=True)
+
+    def _flush(self) -> None:
+        if self._batch:
+            self._stream.write_rows(self._batch)
+            self._batch = []
+
+
 def describe_template_name(template_path: str, template_name: str | None = None) -> str:
     """从显式名称或模板路径中推断模板名。"""
     if template_name:
@@ -367,6 +1035,15 @@ def describe_template_name(template_path: str, template_name: str | None = None)
     return Path(template_path).stem
 
 
+def _describe_location(
+    context: ProcessingContext | None,
+    row: dict,
+    source_file_field: str | None,
+) -> str:
+    row_context = _row_context(context, row, source_file_field)
+    return row_context.describe() if row_context else ""
+
+
 def _row_context(
     context: ProcessingContext | None,
     row: dict,
@@ -0,0 +1,259 @@
+"""
+增量处理缓存模块
+
+按单位与规则组保存上次运行中每行输入的内容指纹及其通过校验的转换结果。
+再次处理同一份（仅少量更正的）导出数据时，指纹未变的行直接复用上次的结果，
+只有新增或变更的行需要重新转换与逐行校验；跨行规则与金额统计仍覆盖全部行。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import marshal
+import pickle
+import re
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+# 缓存文件结构版本，结构变化时递增以使旧缓存失效
+CACHE_FORMAT_VERSION = 1
+# 差异日志中每类最多列出的行号数量
+_LOGGED_ROW_LIMIT = 20
+_UNSAFE_FILENAME_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+# 决定转换结果与校验结论的模块，其代码参与配置指纹
+_OUTPUT_MODULES = ("amount", "parsing", "transformer", "transform_registry", "validator", "columnar", "pipeline")
+
+
+def row_fingerprint(row: Mapping[str, Any]) -> bytes:
+    """
+    计算一行输入的内容指纹
+
+    Args:
+        row: 数据行（字典），列顺序与取值都参与计算
+
+    Returns:
+        bytes: 16 字节摘要
+    """
+    return hashlib.blake2b(repr(tuple(row.items())).encode("utf-8"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint() -> str:
+    """
+    计算决定转换结果与校验结论的模块代码的指纹
+
+    同一版本号下修改了转换或校验代码时，缓存的转换结果同样失效。
+    优先使用模块源码，打包运行取不到源码时使用编译后的代码对象。
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _OUTPUT_MODULES:
+        module = importlib.import_module(f"{__package__}.{name}")
+        loader = module.__spec__.loader
+        source = loader.get_source(module.__name__) if hasattr(loader, "get_source") else None
+        if source is not None:
+            digest.update(source.encode("utf-8"))
+        else:
+            code = loader.get_code(module.__name__) if hasattr(loader, "get_code") else None
+            digest.update(marshal.dumps(code) if code is not None else name.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def config_fingerprint(group_config: Mapping[str, Any]) -> str:
+    """
+    计算规则组配置、程序版本与转换/校验代码的指纹，任一变化都会使缓存的转换结果失效
+
+    Args:
+        group_config: 规则组配置
+
+    Returns:
+        str: 十六进制摘要
+    """
+    try:
+        program_version = version("bank-template-processing")
+    except PackageNotFoundError:
+        program_version = ""
+    payload = json.dumps(
+        [CACHE_FORMAT_VERSION, program_version, code_fingerprint(), group_config],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RowDiff:
+    """本次输入与上次输入的逐行差异，行号均从 1 开始。"""
+
+    __slots__ = ("added", "removed", "changed", "unchanged")
+
+    def __init__(self, previous: Sequence[bytes], current: Sequence[bytes]):
+        # 按指纹匹配：本次的行在上次输入中仍有未匹配的相同指纹即视为未变（不要求位置相同），
+        # 其余行按出现顺序与上次未匹配的行配对视为变更，多出的部分视为新增或删除；整体为线性时间
+        positions: dict[bytes, list[int]] = {}
+        for index in range(len(previous) - 1, -1, -1):
+            positions.setdefault(previous[index], []).append(index)
+        matched = bytearray(len(previous))
+        unmatched_current: list[int] = []
+        for index, fingerprint in enumerate(current):
+            candidates = positions.get(fingerprint)
+            if candidates:
+                matched[candidates.pop()] = 1
+            else:
+                unmatched_current.append(index + 1)
+        unmatched_previous = [index + 1 for index, hit in enumerate(matched) if not hit]
+
+        paired = min(len(unmatched_current), len(unmatched_previous))
+        self.changed: list[int] = unmatched_current[:paired]
+        self.added: list[int] = unmatched_current[paired:]
+        self.removed: list[int] = unmatched_previous[paired:]
+        self.unchanged = len(current) - len(unmatched_current)
+
+    def describe(self) -> str:
+        """格式化差异摘要。"""
+        parts = [f"新增 {len(self.added)} 行", f"删除 {len(self.removed)} 行", f"变更 {len(self.changed)} 行"]
+        details = [
+            f"{label}行号 {_format_row_numbers(rows)}"
+            for label, rows in (("新增", self.added), ("删除（上次）", self.removed), ("变更", self.changed))
+            if rows
+        ]
+        summary = "，".join(parts) + f"，未变 {self.unchanged} 行"
+        return f"{summary}；{'；'.join(details)}" if details else summary
+
+
+def _format_row_numbers(rows: list[int]) -> str:
+    shown = "、".join(map(str, rows[:_LOGGED_ROW_LIMIT]))
+    if len(rows) > _LOGGED_ROW_LIMIT:
+        shown += f" 等 {len(rows)} 行"
+    return shown
+
+
+class RowCacheMatch:
+    """一次运行的缓存匹配结果。"""
+
+    __slots__ = ("fingerprints", "outputs", "misses", "diff")
+
+    def __init__(self, fingerprints: list[bytes], outputs: list[dict | None], diff: RowDiff):
+        self.fingerprints = fingerprints
+        self.outputs = outputs
+        self.misses = [index for index, output in enumerate(outputs) if output is None]
+        self.diff = diff
+
+    @property
+    def hits(self) -> int:
+        """复用缓存结果的行数。"""
+        return len(self.outputs) - len(self.misses)
+
+    def merge(self, rows: list[dict]) -> list[dict]:
+        """用缓存的转换结果替换命中行，返回新列表。"""
+        return [row if output is None else output for row, output in zip(rows, self.outputs)]
+
+
+class RowCache:
+    """
+    单个单位、规则组的增量处理缓存
+
+    缓存文件为本机 pickle 文件，只应放在受信任的目录中。
+    """
+
+    def __init__(self, path: Path, config_key: str):
+        self.path = path
+        self.config_key = config_key
+        self._fingerprints: list[bytes] = []
+        self._outputs: dict[bytes, dict] = {}
+
+    @classmethod
+    def load(
+        cls,
+        cache_dir: str | Path,
+        unit_name: str | None,
+        rule_group: str | None,
+        group_config: Mapping[str, Any],
+    ) -> "RowCache":
+        """
+        加载缓存，文件不存在、损坏或配置已变化时返回仅保留差异基准的空缓存
+
+        Args:
+            cache_dir: 缓存目录
+            unit_name: 单位名称
+            rule_group: 规则组名称
+            group_config: 规则组配置
+
+        Returns:
+            RowCache: 缓存实例
+        """
+        filename = _UNSAFE_FILENAME_CHARS.sub("_", f"{unit_name or ''}_{rule_group or 'default'}") + ".pkl"
+        cache = cls(Path(cache_dir) / filename, config_fingerprint(group_config))
+        if not cache.path.exists():
+            logger.info("增量缓存不存在，将处理全部数据：%s", cache.path)
+            return cache
+
+        try:
+            with cache.path.open("rb") as cache_file:
+                payload = pickle.load(cache_file)
+            if payload.get("format") != CACHE_FORMAT_VERSION:
+                raise ValueError(f"缓存格式版本不匹配: {payload.get('format')}")
+            cache._fingerprints = list(payload["fingerprints"])
+            if payload.get("config") == cache.config_key:
+                cache._outputs = dict(payload["outputs"])
+            else:
+                logger.info("规则组配置、程序版本或转换与校验代码已变化，增量缓存的转换结果已失效")
+        except Exception as exc:  # 缓存仅用于加速，任何读取失败都退回全量处理
+            logger.warning("增量缓存读取失败，将处理全部数据：%s: %s", cache.path, exc)
+            cache._fingerprints = []
+            cache._outputs = {}
+        return cache
+
+    def match(self, rows: Sequence[Mapping[str, Any]]) -> RowCacheMatch:
+        """
+        计算本次输入的指纹，匹配可复用的转换结果并与上次输入对比
+
+        Args:
+            rows: 本次输入的数据行
+
+        Returns:
+            RowCacheMatch: 匹配结果
+        """
+        fingerprints = [row_fingerprint(row) for row in rows]
+        outputs = [self._outputs.get(fingerprint) for fingerprint in fingerprints]
+        result = RowCacheMatch(fingerprints, outputs, RowDiff(self._fingerprints, fingerprints))
+        logger.info(
+            "增量处理：复用 %s 行，重新处理 %s 行；与上次相比%s",
+            result.hits,
+            len(result.misses),
+            result.diff.describe(),
+        )
+        return result
+
+    def save(self, fingerprints: Sequence[bytes], outputs: Sequence[dict]) -> None:
+        """
+        保存本次全部通过校验的输入指纹与转换结果
+
+        Args:
+            fingerprints: 本次输入各行的指纹
+            outputs: 与指纹一一对应的转换结果
+        """
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "config": self.config_key,
+            "fingerprints": list(fingerprints),
+            "outputs": dict(zip(fingerprints, outputs)),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with temp_path.open("wb") as cache_file:
+            pickle.dump(payload, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_path.replace(self.path)
+        self._fingerprints = list(fingerprints)
+        self._outputs = payload["outputs"]
+        logger.info("增量缓存已更新：%s 行，%s", len(fingerprints), self.path)
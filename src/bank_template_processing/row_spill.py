@@ -0,0 +1,151 @@
+"""
+分组溢写模块
+
+超大输入按分组拆分时，内存中缓冲的行数超过阈值后，把各分组的缓冲追加写入临时文件；
+处理时逐组读回，内存占用以单个分组为上限，而不是全部输入。
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+logger = logging.getLogger(__name__)
+
+
+class RowSpool:
+    """
+    单个分组的行缓冲
+
+    溢写时按批写入：列名元组每批只写一次，每行只保存取值元组，
+    读回时按写入顺序先产出文件中的行，再产出仍在内存中的行。
+    """
+
+    __slots__ = ("path", "_buffer", "_count", "_spilled")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._buffer: list[dict[str, Any]] = []
+        self._count = 0
+        self._spilled = 0
+
+    def append(self, row: dict[str, Any]) -> None:
+        """追加一行。"""
+        self._buffer.append(row)
+        self._count += 1
+
+    @property
+    def spilled(self) -> int:
+        """已写入临时文件的行数。"""
+        return self._spilled
+
+    def spill(self) -> int:
+        """
+        将内存中的行追加写入临时文件
+
+        Returns:
+            int: 本次写入的行数
+        """
+        if not self._buffer:
+            return 0
+        with self.path.open("ab") as spool_file:
+            for columns, values in _column_batches(self._buffer):
+                pickle.dump((columns, values), spool_file, protocol=pickle.HIGHEST_PROTOCOL)
+        written = len(self._buffer)
+        self._buffer = []
+        self._spilled += written
+        return written
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        if self._spilled:
+            with self.path.open("rb") as spool_file:
+                while True:
+                    try:
+                        columns, values = pickle.load(spool_file)
+                    except EOFError:
+                        break
+                    for row_values in values:
+                        yield dict(zip(columns, row_values))
+        yield from self._buffer
+
+    def load(self) -> list[dict[str, Any]]:
+        """读回本组全部数据行。"""
+        return list(self)
+
+
+def _column_batches(rows: list[dict[str, Any]]) -> Iterator[tuple[tuple[str, ...], list[tuple[Any, ...]]]]:
+    # 读取器产生的行列名相同，连续同列名的行合为一批
+    columns: tuple[str, ...] = ()
+    values: list[tuple[Any, ...]] = []
+    for row in rows:
+        row_columns = tuple(row)
+        if row_columns != columns:
+            if values:
+                yield columns, values
+            columns, values = row_columns, []
+        values.append(tuple(row.values()))
+    if values:
+        yield columns, values
+
+
+class SpillingPartitioner:
+    """
+    按分组键缓冲数据行，缓冲总行数超过阈值时把全部分组的缓冲溢写到临时目录
+
+    作为上下文管理器使用，退出时删除临时目录。
+    """
+
+    def __init__(self, keys: Iterable[str], threshold: int, directory: str | Path | None = None):
+        """
+        初始化分组溢写器
+
+        Args:
+            keys: 全部分组键
+            threshold: 内存中最多缓冲的行数
+            directory: 临时目录的父目录，省略时使用系统临时目录
+
+        Raises:
+            ValueError: 阈值不是正整数时抛出
+        """
+        if threshold < 1:
+            raise ValueError(f"溢写阈值必须为正整数: {threshold}")
+        self.threshold = threshold
+        self._tempdir = tempfile.TemporaryDirectory(prefix="bank_template_spill_", dir=directory)
+        root = Path(self._tempdir.name)
+        self.spools = {key: RowSpool(root / f"group_{index}.bin") for index, key in enumerate(keys)}
+        self._buffered = 0
+
+    def add(self, key: str, row: dict[str, Any]) -> None:
+        """把一行加入指定分组，必要时溢写。"""
+        self.spools[key].append(row)
+        self._buffered += 1
+        if self._buffered >= self.threshold:
+            self.spill()
+
+    def spill(self) -> None:
+        """把全部分组的内存缓冲写入临时文件。"""
+        written = sum(spool.spill() for spool in self.spools.values())
+        self._buffered = 0
+        logger.debug("分组缓冲已溢写 %s 行", written)
+
+    @property
+    def spilled(self) -> int:
+        """已写入临时文件的行数。"""
+        return sum(spool.spilled for spool in self.spools.values())
+
+    def close(self) -> None:
+        """删除临时目录。"""
+        self._tempdir.cleanup()
+
+    def __enter__(self) -> "SpillingPartitioner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
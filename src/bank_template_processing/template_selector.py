@@ -1,38 +1,177 @@
 """
 模板选择器模块
 
-提供模板选择功能，根据数据中的银行列将数据分组为默认组和特殊组。
+提供模板选择功能，根据数据中的银行列将数据分组为默认组、特殊组，
+以及 template_selector.routes 中按银行名称配置的其他规则组。
+银行名称先按 template_selector.bank_aliases 解析为标准名称再参与分组。
 """
 
 import logging
-from typing import Any, Mapping
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+from .parsing import to_half_width
+from .row_spill import RowSpool, SpillingPartitioner
+from .timings import stage
 from .validator import ValidationError
 
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 特殊组（未命中任何银行的行）对应的规则组
+SPECIAL_RULE_GROUP = "crossbank"
+# 默认组与特殊组的分组键，其模板与组名来自 template_selector 本身的配置
+_BASE_KEYS = frozenset({"default", "special"})
+# 别名中的通配符：结尾为 * 表示前缀匹配，开头为 * 表示后缀匹配
+ALIAS_WILDCARD = "*"
+
+
+def normalize_bank_name(value: Any) -> str:
+    """
+    归一化银行名称：全角转半角并去除首尾空白
+
+    Args:
+        value: 银行名称
+
+    Returns:
+        str: 归一化后的名称
+    """
+    return to_half_width(str(value)).strip()
+
+
+class RowView(Sequence):
+    """
+    共享行列表上的分组视图
+
+    只保存行下标（array('I')，每行 4 字节），不复制行列表；
+    支持 len、下标、切片与迭代，下游按普通行序列使用。
+    """
+
+    __slots__ = ("_rows", "_positions")
+
+    def __init__(self, rows: Sequence[dict[str, Any]], positions: array | None = None):
+        self._rows = rows
+        self._positions = array("I") if positions is None else positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return RowView(self._rows, self._positions[index])
+        return self._rows[self._positions[index]]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return map(self._rows.__getitem__, self._positions)
+
+    def __repr__(self) -> str:
+        return f"RowView({len(self)} 行)"
+
+
+class _Trie:
+    """按字符逐级存储的前缀树，查询最长匹配前缀。"""
+
+    __slots__ = ("_root",)
+
+    # 节点中保存匹配结果的键，不会与单个字符冲突
+    _VALUE = ""
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._root)
+
+    def insert(self, key: str, value: str) -> None:
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[self._VALUE] = value
+
+    def longest_prefix(self, text: str) -> str | None:
+        node = self._root
+        found = None
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(self._VALUE, found)
+        return found
+
+
+class BankAliasIndex:
+    """
+    银行别名索引
+
+    由 {标准名称: [别名, ...]} 构建：精确别名放入哈希表，
+    “前缀*”与“*后缀”形式的别名分别放入前缀树与反向前缀树，
+    每次解析的开销与名称长度成正比，不随别名数量增长。
+    """
+
+    __slots__ = ("_exact", "_prefixes", "_suffixes")
+
+    def __init__(self, aliases: Mapping[str, Any] | None = None):
+        self._exact: dict[str, str] = {}
+        self._prefixes = _Trie()
+        self._suffixes = _Trie()
+        for canonical, names in (aliases or {}).items():
+            target = normalize_bank_name(canonical)
+            self._exact[target] = target
+            for name in names:
+                pattern = normalize_bank_name(name)
+                if pattern.endswith(ALIAS_WILDCARD):
+                    self._prefixes.insert(pattern[:-1], target)
+                elif pattern.startswith(ALIAS_WILDCARD):
+                    self._suffixes.insert(pattern[:0:-1], target)
+                else:
+                    self._exact[pattern] = target
+
+    def __bool__(self) -> bool:
+        return bool(self._exact)
+
+    def resolve(self, name: str) -> str:
+        """
+        解析归一化后的银行名称
+
+        优先精确别名，其次最长前缀，再次最长后缀；均未命中时返回原名称。
+
+        Args:
+            name: 归一化后的银行名称
+
+        Returns:
+            str: 标准名称（归一化形式）
+        """
+        canonical = self._exact.get(name)
+        if canonical is not None:
+            return canonical
+        if self._prefixes:
+            canonical = self._prefixes.longest_prefix(name)
+            if canonical is not None:
+                return canonical
+        if self._suffixes:
+            canonical = self._suffixes.longest_prefix(name[::-1])
+            if canonical is not None:
+                return canonical
+        return name
+
 
 class TemplateSelector:
     """模板选择器类"""
 
     @staticmethod
     def _to_half_width(text: str) -> str:
-        result = []
-        for char in text:
-            code = ord(char)
-            if code == 0x3000:  # 全角空格
-                result.append(" ")
-            elif 0xFF01 <= code <= 0xFF5E:  # 全角字符范围
-                result.append(chr(code - 0xFEE0))
-            else:
-                result.append(char)
-        return "".join(result)
+        return to_half_width(text)
 
     @classmethod
     def _normalize_bank_name(cls, value: Any) -> str:
         return cls._to_half_width(str(value)).strip()
 
+    def _canonical_bank_name(self, value: Any) -> str:
+        return self.aliases.resolve(self._normalize_bank_name(value))
+
     def __init__(self, config: Mapping[str, Any]):
         """
         初始化模板选择器
@@ -43,8 +182,40 @@ class TemplateSelector:
         logger.debug("初始化模板选择器")
         self.config = config
         self.selector_config = config.get("template_selector", {})
+        # 银行名称 -> 规则组；default_bank 归入默认组，其余未配置的银行归入特殊组
+        self.routes: Mapping[str, str] = self.selector_config.get("routes", {})
+        # 加载时一次性构建别名索引，分组时每种银行写法只解析一次
+        self.aliases = BankAliasIndex(self.selector_config.get("bank_aliases"))
         logger.debug(f"模板选择器配置: {self.selector_config}")
 
+    @staticmethod
+    def rule_group(group_key: str) -> str:
+        """
+        返回分组键对应的规则组
+
+        Args:
+            group_key: group_data 返回的分组键
+
+        Returns:
+            特殊组对应 crossbank，其余分组键即规则组名称
+        """
+        return SPECIAL_RULE_GROUP if group_key == "special" else group_key
+
+    @staticmethod
+    def _group_key(rule_group: str) -> str:
+        return "special" if rule_group == SPECIAL_RULE_GROUP else rule_group
+
+    def group_keys(self) -> list[str]:
+        """
+        返回全部分组键
+
+        Returns:
+            "default"、"special"，以及 routes 中配置的其他规则组（按首次出现顺序）
+        """
+        keys = ["default", "special"]
+        keys.extend(dict.fromkeys(key for key in map(self._group_key, self.routes.values()) if key not in keys))
+        return keys
+
     def is_enabled(self) -> bool:
         """
         检查是否启用模板选择
@@ -68,9 +239,10 @@ class TemplateSelector:
         分组逻辑：
         1. 验证所有所有行包含 bank_column 字段
         2. 验证所有行的 bank_column 值非空
-        3. 根据 bank_column 值分组：
+        3. 根据 bank_column 值一次遍历完成分组：
            - bank_column == default_bank → 归入默认组
-           - bank_column != default_bank → 归入特殊组
+           - bank_column 命中 routes 中的银行 → 归入对应规则组
+           - 其他值 → 归入特殊组
 
         Args:
             data: 数据列表
@@ -78,7 +250,7 @@ class TemplateSelector:
             bank_column: 银行列名，默认为"开户银行"
 
         Returns:
-            分组结果字典，格式为：
+            分组结果字典，各组 data 为共享 data 的 RowView，格式为：
             {
                 "default": {
                     "data": [...],
@@ -89,62 +261,157 @@ class TemplateSelector:
                     "data": [...],
                     "template": special_template,
                     "group_name": "special_group_name"
+                },
+                "<routes 中的规则组>": {
+                    "data": [...],
+                    "template": "",
+                    "group_name": ""
                 }
             }
 
             其中 default_group_name 和 special_group_name 从配置中的
             "template_selector.default_group_name" 和 "template_selector.special_group_name" 读取，
-            如果未配置则分别使用默认值 "default" 和 "special"。
+            如果未配置则分别使用默认值 "default" 和 "special"；
+            routes 中的规则组不设模板与组名，由调用方回退到规则组的 template_path。
 
         Raises:
             ValidationError: 当缺少银行列或银行值为空时抛出
         """
         logger.info(f"开始分组数据，默认银行: {default_bank}, 银行列: {bank_column}")
-        normalized_default = self._normalize_bank_name("" if default_bank is None else default_bank)
 
         # 验证数据
         if not data:
             logger.warning("数据为空列表")
             return self._create_empty_result()
 
-        # 验证第一行是否存在银行列
-        if bank_column not in data[0]:
-            error_msg = f"缺少'{bank_column}'列"
-            logger.error(error_msg)
-            raise ValidationError(error_msg)
+        classify = self.row_classifier(default_bank, bank_column)
 
-        # 初始化分组
-        default_data = []
-        special_data = []
+        # 各组只记录行下标，数据行本身保留在 data 中
+        positions = {key: array("I") for key in self.group_keys()}
 
-        # 遍历数据进行分组
-        for index, row in enumerate(data, start=1):
+        # 一次遍历完成分组
+        for index, row in enumerate(data):
+            positions[classify(row, index + 1)].append(index)
+        grouped = {key: RowView(data, group_positions) for key, group_positions in positions.items()}
+
+        route_summary = "".join(f", {key} {len(rows)} 条" for key, rows in grouped.items() if key not in _BASE_KEYS)
+        logger.info(
+            f"分组完成: 默认组 {len(grouped['default'])} 条, 特殊组 {len(grouped['special'])} 条{route_summary}"
+        )
+
+        # 构建结果
+        return self._build_result(grouped)
+
+    @contextmanager
+    def spill_group_data(
+        self,
+        rows: Iterable[dict[str, Any]],
+        default_bank: str | None,
+        bank_column: str = "开户银行",
+        *,
+        spill_threshold: int,
+        spill_dir: str | Path | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        流式分组，内存中缓冲超过阈值的行溢写到临时文件
+
+        分组规则与 group_data 相同；rows 可以是读取器的行迭代器，不需要先读成列表。
+        各组 data 为 RowSpool，调用 load() 读回本组全部行，处理完一组再读下一组，
+        内存占用以最大的单个分组为上限。退出上下文时删除临时文件。
+
+        Args:
+            rows: 数据行
+            default_bank: 默认银行名称
+            bank_column: 银行列名，默认为"开户银行"
+            spill_threshold: 内存中最多缓冲的行数
+            spill_dir: 临时目录的父目录，省略时使用系统临时目录
+
+        Yields:
+            与 group_data 结构相同的分组结果字典
+
+        Raises:
+            ValidationError: 当缺少银行列或银行值为空时抛出
+        """
+        classify = self.row_classifier(default_bank, bank_column)
+        with SpillingPartitioner(self.group_keys(), spill_threshold, spill_dir) as partitioner:
+            with stage("分组") as span:
+                for index, row in enumerate(rows, start=1):
+                    partitioner.add(classify(row, index), row)
+                span.rows_in = span.rows_out = sum(len(spool) for spool in partitioner.spools.values())
+            logger.info(
+                "分组完成: %s，溢写到临时文件 %s 行",
+                ", ".join(f"{key} {len(spool)} 条" for key, spool in partitioner.spools.items()),
+                partitioner.spilled,
+            )
+            yield self._build_result(partitioner.spools)
+
+    def row_classifier(
+        self,
+        default_bank: str | None,
+        bank_column: str = "开户银行",
+    ) -> Callable[[Mapping[str, Any], int], str]:
+        """
+        创建逐行分组函数，供 group_data 与流式处理共用
+
+        Args:
+            default_bank: 默认银行名称
+            bank_column: 银行列名，默认为"开户银行"
+
+        Returns:
+            接收数据行与行号（从 1 开始）、返回分组键（见 group_keys）的函数；
+            缺少银行列或银行值为空时抛出 ValidationError
+        """
+        normalize = self._canonical_bank_name
+        # 标准银行名称 -> 分组键，未命中的银行归入特殊组
+        route_table = {normalize(bank): self._group_key(rule_group) for bank, rule_group in self.routes.items()}
+        route_table[normalize("" if default_bank is None else default_bank)] = "default"
+        # 原始银行文本到分组键的缓存：一个文件通常只有十几种银行写法，命中后每行只需一次字典查找
+        groups_by_text: dict[str, str] = {}
+
+        def classify(row: Mapping[str, Any], row_number: int) -> str:
             # 验证银行列存在
             if bank_column not in row:
-                error_msg = f"缺少'{bank_column}'列"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
+                raise ValidationError(f"缺少'{bank_column}'列", field=bank_column, rule="required", row=row_number)
 
             bank_value = row[bank_column]
+            is_text = isinstance(bank_value, str)
+            if is_text:
+                group_key = groups_by_text.get(bank_value)
+                if group_key is not None:
+                    return group_key
 
             # 验证银行值非空
-            if bank_value is None or (isinstance(bank_value, str) and not bank_value.strip()):
-                error_msg = f"第{index}行的'{bank_column}'字段为空"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            normalized_value = self._normalize_bank_name(bank_value)
-
-            # 根据银行值分组
-            if normalized_value == normalized_default:
-                default_data.append(row)
-            else:
-                special_data.append(row)
+            if bank_value is None or (is_text and not bank_value.strip()):
+                raise ValidationError(
+                    template="第{row}行的'{field}'字段为空",
+                    field=bank_column,
+                    value=bank_value,
+                    rule="required",
+                    row=row_number,
+                )
+
+            # 根据银行值分组；非文本值（如数字）的 str() 结果随类型变化，不参与缓存
+            group_key = route_table.get(normalize(bank_value), "special")
+            if is_text:
+                groups_by_text[bank_value] = group_key
+            return group_key
+
+        return classify
+
+    def group_name(self, group_key: str) -> str:
+        """
+        返回分组的组名
 
-        logger.info(f"分组完成: 默认组 {len(default_data)} 条, 特殊组 {len(special_data)} 条")
+        Args:
+            group_key: 分组键
 
-        # 构建结果
-        return self._build_result(default_data, special_data)
+        Returns:
+            配置中的 default_group_name / special_group_name，未配置时为分组键本身；
+            routes 中的规则组返回空字符串，由调用方使用规则组模板文件名
+        """
+        if group_key not in _BASE_KEYS:
+            return ""
+        return self.selector_config.get(f"{group_key}_group_name", group_key)
 
     def _create_empty_result(self) -> dict[str, Any]:
         """
@@ -154,47 +421,42 @@ class TemplateSelector:
             空分组结果字典
         """
         return {
-            "default": {
+            key: {
                 "data": [],
-                "template": self.selector_config.get("default_template", ""),
-                "group_name": self._extract_group_name(self.selector_config.get("default_template", "")),
-            },
-            "special": {
-                "data": [],
-                "template": self.selector_config.get("special_template", ""),
-                "group_name": self._extract_group_name(self.selector_config.get("special_template", "")),
-            },
+                "template": self._group_template(key),
+                "group_name": self._extract_group_name(self._group_template(key)),
+            }
+            for key in self.group_keys()
         }
 
-    def _build_result(self, default_data: list[dict], special_data: list[dict]) -> dict[str, Any]:
+    def _build_result(self, grouped: Mapping[str, Sequence[dict[str, Any]] | RowSpool]) -> dict[str, Any]:
         """
         构建分组结果
 
         Args:
-            default_data: 默认组数据
-            special_data: 特殊组数据
+            grouped: 分组键到数据的映射
 
         Returns:
             分组结果字典
         """
-        default_template = self.selector_config.get("default_template", "")
-        special_template = self.selector_config.get("special_template", "")
+        return {key: {"data": rows, **self.group_info(key)} for key, rows in grouped.items()}
 
-        default_group_name = self.selector_config.get("default_group_name", "default")
-        special_group_name = self.selector_config.get("special_group_name", "special")
+    def group_info(self, group_key: str) -> dict[str, str]:
+        """
+        返回分组的模板与组名
 
-        return {
-            "default": {
-                "data": default_data,
-                "template": default_template,
-                "group_name": default_group_name,
-            },
-            "special": {
-                "data": special_data,
-                "template": special_template,
-                "group_name": special_group_name,
-            },
-        }
+        Args:
+            group_key: 分组键
+
+        Returns:
+            {"template": 模板路径, "group_name": 组名}，routes 中的规则组均为空字符串
+        """
+        return {"template": self._group_template(group_key), "group_name": self.group_name(group_key)}
+
+    def _group_template(self, group_key: str) -> str:
+        if group_key not in _BASE_KEYS:
+            return ""
+        return self.selector_config.get(f"{group_key}_template", "")
 
     def _extract_group_name(self, template_path: str) -> str:
         """
@@ -210,8 +472,6 @@ class TemplateSelector:
             return ""
 
         # 获取文件名（去除扩展名）
-        from pathlib import Path
-
         group_name = Path(template_path).stem
 
         logger.debug(f"从模板路径 '{template_path}' 提取组名: '{group_name}'")
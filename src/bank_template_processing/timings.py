@@ -0,0 +1,230 @@
+"""
+阶段计时模块
+
+记录读取、筛选、分组、校验、转换、模板加载、填充、保存等阶段的墙钟时间、CPU 时间与行数。
+计时器通过 collect_timings 在当前上下文中启用；未启用时 stage() 返回共享的空上下文、
+timed_rows() 原样返回迭代器，各阶段只多一次上下文变量查询。
+阶段可以嵌套，每个阶段只计自身时间（扣除内层阶段），各阶段之和不超过总耗时。
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ContextManager, Iterable, Iterator
+
+
+@dataclass
+class StageRecord:
+    """单个阶段的累计统计。"""
+
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    calls: int = 0
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """按输入行数计算的吞吐量，没有行数或耗时时为 None。"""
+        if not self.rows_in or self.wall <= 0:
+            return None
+        return self.rows_in / self.wall
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为 JSON 可序列化的字典。"""
+        return {
+            "name": self.name,
+            "wall_seconds": self.wall,
+            "cpu_seconds": self.cpu,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_second": self.rows_per_second,
+            "calls": self.calls,
+        }
+
+
+class StageSpan:
+    """一次阶段执行的行数，由调用方在阶段内填写。"""
+
+    __slots__ = ("rows_in", "rows_out")
+
+    def __init__(self, rows_in: int = 0, rows_out: int | None = None):
+        self.rows_in = rows_in
+        self.rows_out = rows_in if rows_out is None else rows_out
+
+
+class StageTimings:
+    """各阶段的计时结果，按阶段首次结束的顺序保存（内层阶段先于外层）。"""
+
+    def __init__(self) -> None:
+        self.records: dict[str, StageRecord] = {}
+        # 各层正在执行的阶段中已计入内层阶段的 [墙钟, CPU]
+        self._stack: list[list[float]] = []
+        self._started = (time.perf_counter(), time.process_time())
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+
+    def begin(self) -> tuple[float, float]:
+        """开始一个阶段，返回传给 end 的起始时间。"""
+        self._stack.append([0.0, 0.0])
+        return time.perf_counter(), time.process_time()
+
+    def end(self, name: str, started: tuple[float, float], rows_in: int = 0, rows_out: int = 0) -> None:
+        """
+        结束 begin 开始的阶段并累计到对应记录
+
+        Args:
+            name: 阶段名称
+            started: begin 的返回值
+            rows_in: 本次处理的输入行数
+            rows_out: 本次产出的行数
+        """
+        wall = time.perf_counter() - started[0]
+        cpu = time.process_time() - started[1]
+        inner_wall, inner_cpu = self._stack.pop()
+        if self._stack:
+            parent = self._stack[-1]
+            parent[0] += wall
+            parent[1] += cpu
+
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = StageRecord(name)
+        record.wall += wall - inner_wall
+        record.cpu += cpu - inner_cpu
+        record.rows_in += rows_in
+        record.rows_out += rows_out
+        record.calls += 1
+
+    @contextmanager
+    def measure(self, name: str, rows_in: int = 0, rows_out: int | None = None) -> Iterator[StageSpan]:
+        """计量一个阶段，阶段内可修改产出的 StageSpan 的行数。"""
+        span = StageSpan(rows_in, rows_out)
+        started = self.begin()
+        try:
+            yield span
+        finally:
+            self.end(name, started, span.rows_in, span.rows_out)
+
+    def finish(self) -> None:
+        """记录从创建到现在的总耗时。"""
+        self.total_wall = time.perf_counter() - self._started[0]
+        self.total_cpu = time.process_time() - self._started[1]
+
+    def format_table(self) -> str:
+        """格式化为文本表格，末尾附未计入任何阶段的耗时与总计。"""
+        header = f"{'阶段':<12}{'墙钟(s)':>10}{'CPU(s)':>10}{'输入行':>10}{'输出行':>10}{'行/秒':>12}"
+        lines = [header]
+        for record in self.records.values():
+            throughput = record.rows_per_second
+            lines.append(
+                f"{record.name:<12}{record.wall:>10.3f}{record.cpu:>10.3f}"
+                f"{record.rows_in:>10}{record.rows_out:>10}"
+                f"{'-' if throughput is None else f'{throughput:.0f}':>12}"
+            )
+        other_wall = self.total_wall - sum(record.wall for record in self.records.values())
+        other_cpu = self.total_cpu - sum(record.cpu for record in self.records.values())
+        lines.append(f"{'其他':<12}{max(other_wall, 0.0):>10.3f}{max(other_cpu, 0.0):>10.3f}")
+        lines.append(f"{'总计':<12}{self.total_wall:>10.3f}{self.total_cpu:>10.3f}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为 JSON 可序列化的字典。"""
+        return {
+            "total": {"wall_seconds": self.total_wall, "cpu_seconds": self.total_cpu},
+            "stages": [record.to_dict() for record in self.records.values()],
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        """
+        写出 JSON 文件
+
+        Args:
+            path: 输出路径，父目录不存在时自动创建
+
+        Returns:
+            Path: 输出路径
+        """
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return output_path
+
+
+# 当前上下文中启用的计时器
+_current: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+# 未启用计时时 stage() 返回的空上下文，可重复进入
+_NULL_STAGE = nullcontext(StageSpan())
+
+
+@contextmanager
+def collect_timings() -> Iterator[StageTimings]:
+    """
+    在作用域内启用阶段计时
+
+    Yields:
+        StageTimings: 本次的计时结果，退出作用域时记录总耗时
+    """
+    timings = StageTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        timings.finish()
+
+
+def current_timings() -> StageTimings | None:
+    """返回当前启用的计时器，未启用时为 None。"""
+    return _current.get()
+
+
+def stage(name: str, rows_in: int = 0, rows_out: int | None = None) -> ContextManager[StageSpan]:
+    """
+    计量一个阶段，未启用计时时不做任何事
+
+    Args:
+        name: 阶段名称
+        rows_in: 输入行数
+        rows_out: 产出行数，省略时与输入行数相同，可在阶段内通过 StageSpan 修改
+
+    Returns:
+        产出 StageSpan 的上下文管理器
+    """
+    timings = _current.get()
+    if timings is None:
+        return _NULL_STAGE
+    return timings.measure(name, rows_in, rows_out)
+
+
+def timed_rows(rows: Iterable[Any], name: str) -> Iterable[Any]:
+    """
+    计量逐行产出的迭代器（如读取器），每取一行计一次
+
+    未启用计时时原样返回 rows。
+    """
+    timings = _current.get()
+    if timings is None:
+        return rows
+    return _timed_iter(iter(rows), name, timings)
+
+
+def _timed_iter(rows: Iterator[Any], name: str, timings: StageTimings) -> Iterator[Any]:
+    while True:
+        started = timings.begin()
+        try:
+            row = next(rows)
+        except StopIteration:
+            timings.end(name, started)
+            return
+        except BaseException:
+            timings.end(name, started)
+            raise
+        timings.end(name, started, 1, 1)
+        yield row
@@ -0,0 +1,189 @@
+"""
+转换注册表模块
+
+维护 field_mappings 中 transform 类型到转换工厂的映射。
+工厂在每个规则组处理开始时按 transformations 配置解析一次，返回绑定好参数的单值转换函数，
+逐行处理时只需一次间接调用，不再按字符串分派。
+
+扩展方式（无需修改管线代码）：
+1. 代码注册：调用 register_transform(name, factory)
+2. 入口点：在 "bank_template_processing.transforms" 入口点组中声明工厂
+3. 配置：在 transformations.<name>.factory 中填写 "模块路径:属性名"
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Any, Callable, Mapping
+
+from .parsing import to_half_width
+from .transformer import TransformError, Transformer, compile_date_formatter
+
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "bank_template_processing.transforms"
+
+# 单值转换函数：输入原始单元格值，返回转换后的值
+BoundTransform = Callable[[Any], Any]
+# 转换工厂：根据 transformations 中对应配置与共享的 Transformer 生成单值转换函数
+TransformFactory = Callable[[Mapping[str, Any], Transformer], BoundTransform]
+
+_registry: dict[str, TransformFactory] = {}
+_entry_points_loaded = False
+
+
+def register_transform(name: str, factory: TransformFactory | None = None) -> Any:
+    """
+    注册转换工厂，可直接调用或作为装饰器使用
+
+    Args:
+        name: transform 类型名，即 field_mappings 中 transform 的取值
+        factory: 转换工厂；省略时返回装饰器
+
+    Returns:
+        factory 本身，或用于注册的装饰器
+    """
+
+    def decorator(func: TransformFactory) -> TransformFactory:
+        _registry[name] = func
+        return func
+
+    if factory is None:
+        return decorator
+    return decorator(factory)
+
+
+def get_transform_factory(name: str, options: Mapping[str, Any] | None = None) -> TransformFactory | None:
+    """
+    查找转换工厂
+
+    查找顺序：transformations 配置中的 factory → 已注册工厂 → 入口点。
+
+    Args:
+        name: transform 类型名
+        options: transformations 中该类型的配置
+
+    Returns:
+        TransformFactory | None: 找到的工厂，未找到时返回 None
+
+    Raises:
+        TransformError: 当配置中的 factory 无法导入时抛出
+    """
+    factory_path = options.get("factory") if options else None
+    if factory_path:
+        return _import_factory(name, factory_path)
+
+    factory = _registry.get(name)
+    if factory is None and not _entry_points_loaded:
+        _load_entry_point_transforms()
+        factory = _registry.get(name)
+    return factory
+
+
+def resolve_transform(
+    name: str,
+    transformations: Mapping[str, Any] | None,
+    transformer: Transformer | None = None,
+) -> BoundTransform | None:
+    """
+    将 transform 类型解析为绑定好配置的单值转换函数
+
+    Args:
+        name: transform 类型名
+        transformations: 规则组的 transformations 配置
+        transformer: 共享的 Transformer 实例，省略时新建
+
+    Returns:
+        BoundTransform | None: 单值转换函数；"none" 或未注册的类型返回 None
+    """
+    if not name or name == "none":
+        return None
+
+    options = (transformations or {}).get(name) or {}
+    if not isinstance(options, Mapping):
+        options = {}
+    factory = get_transform_factory(name, options)
+    if factory is None:
+        logger.warning("未注册的转换类型 '%s'，已忽略", name)
+        return None
+    return factory(options, transformer or Transformer())
+
+
+def _import_factory(name: str, factory_path: Any) -> TransformFactory:
+    if not isinstance(factory_path, str) or ":" not in factory_path:
+        raise TransformError(f"转换类型 '{name}' 的 factory 配置无效，应为 '模块路径:属性名': {factory_path}")
+
+    module_name, _, attr_path = factory_path.partition(":")
+    try:
+        target: Any = importlib.import_module(module_name)
+        for attr in attr_path.split("."):
+            target = getattr(target, attr)
+    except (ImportError, AttributeError) as exc:
+        raise TransformError(f"转换类型 '{name}' 的 factory 无法加载: {factory_path}: {exc}") from exc
+
+    if not callable(target):
+        raise TransformError(f"转换类型 '{name}' 的 factory 不可调用: {factory_path}")
+    return target
+
+
+def _load_entry_point_transforms() -> None:
+    global _entry_points_loaded
+    _entry_points_loaded = True
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in _registry:
+            continue
+        try:
+            _registry[entry_point.name] = entry_point.load()
+        except Exception as exc:  # 第三方插件加载失败不应影响内置转换
+            logger.warning("转换插件 '%s' 加载失败，已忽略: %s", entry_point.name, exc)
+            continue
+        logger.debug("已从入口点注册转换类型: %s", entry_point.name)
+
+
+@register_transform("amount_decimal")
+def _amount_decimal_factory(options: Mapping[str, Any], transformer: Transformer) -> BoundTransform:
+    return partial(
+        transformer.transform_amount,
+        decimal_places=options.get("decimal_places", 2),
+        rounding=options.get("rounding", "round"),
+    )
+
+
+@register_transform("card_number")
+def _card_number_factory(options: Mapping[str, Any], transformer: Transformer) -> BoundTransform:
+    return partial(
+        transformer.transform_card_number,
+        remove_formatting=options.get("remove_formatting", True),
+        luhn_validation=options.get("luhn_validation", True),
+    )
+
+
+@register_transform("date_format")
+def _date_format_factory(options: Mapping[str, Any], transformer: Transformer) -> BoundTransform:
+    # 输出格式在解析规则组时编译一次，逐值只做日期解析与格式化
+    formatter = compile_date_formatter(options.get("output_format", "YYYY-MM-DD"))
+    format_date = transformer.format_date
+
+    def date_format(value: Any) -> str:
+        return format_date(value, formatter)
+
+    return date_format
+
+
+@register_transform("normalize_width")
+def _normalize_width_factory(options: Mapping[str, Any], transformer: Transformer) -> BoundTransform:
+    del transformer
+    strip = options.get("strip", True)
+
+    def normalize_width(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        normalized = to_half_width(value)
+        return normalized.strip() if strip else normalized
+
+    return normalize_width
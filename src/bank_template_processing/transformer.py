@@ -7,6 +7,7 @@
 import logging
 import re
 from datetime import datetime, date
+from functools import lru_cache
 from decimal import (
     Decimal,
     ROUND_HALF_UP,
@@ -17,28 +18,112 @@ from decimal import (
     InvalidOperation,
 )
 
+from .amount import FixedAmount
+from .errors import DataError
+from .parsing import DATE_INPUT_FORMATS, DateText, try_parse_date, try_parse_decimal
+
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
 
-class TransformError(Exception):
-    """数据转换失败异常"""
+class TransformError(DataError):
+    """数据转换失败异常，携带 field/value/rule/row 结构化信息"""
+
+
+# 日期输出格式支持的占位符（按最长优先匹配）；方括号内的文本原样输出（去掉方括号），其余字符原样输出
+_DATE_TOKEN_PATTERN = re.compile(r"\[([^\[\]]*)\]|YYYY|YY|MM|M|DD|D")
+
+# 预计算的补零字符串表，格式化时只做下标查找
+_YEAR4_TEXT = tuple(f"{year:04d}" for year in range(10000))
+_YEAR2_TEXT = tuple(f"{year % 100:02d}" for year in range(10000))
+_PAD2_TEXT = tuple(f"{number:02d}" for number in range(32))
+_PLAIN_TEXT = tuple(str(number) for number in range(32))
+
+_DATE_TOKEN_SOURCES = {
+    "YYYY": (_YEAR4_TEXT, "year"),
+    "YY": (_YEAR2_TEXT, "year"),
+    "MM": (_PAD2_TEXT, "month"),
+    "M": (_PLAIN_TEXT, "month"),
+    "DD": (_PAD2_TEXT, "day"),
+    "D": (_PLAIN_TEXT, "day"),
+}
+
+
+class DateFormatter:
+    """
+    预编译的日期输出格式化器
+
+    输出格式中的 YYYY/YY/MM/M/DD/D 占位符在编译时解析为字符串表查找，
+    格式化时不调用 strftime，同一列的所有值复用同一个实例。
+    需要原样输出的字母写在方括号内，如 "[Date:] YYYY-MM-DD"。
+
+    Raises:
+        TransformError: 当方括号不成对或格式中没有任何日期占位符时抛出
+    """
+
+    __slots__ = ("output_format", "_template", "_sources")
+
+    def __init__(self, output_format: str):
+        template_parts: list[str] = []
+        sources: list[tuple[tuple[str, ...], str]] = []
+        position = 0
+        for match in _DATE_TOKEN_PATTERN.finditer(output_format):
+            template_parts.append(self._plain_text(output_format, output_format[position : match.start()]))
+            literal = match.group(1)
+            if literal is None:
+                template_parts.append("%s")
+                sources.append(_DATE_TOKEN_SOURCES[match.group()])
+            else:
+                template_parts.append(literal.replace("%", "%%"))
+            position = match.end()
+        template_parts.append(self._plain_text(output_format, output_format[position:]))
+        if not sources:
+            raise TransformError(f"不支持的输出格式: {output_format}", rule="date_format")
+
+        self.output_format = output_format
+        self._template = "".join(template_parts)
+        self._sources = tuple(sources)
+
+    def __call__(self, value: date) -> str:
+        return self._template % tuple([table[getattr(value, attr)] for table, attr in self._sources])
+
+    @staticmethod
+    def _plain_text(output_format: str, text: str) -> str:
+        if "[" in text or "]" in text:
+            raise TransformError(f"输出格式中的方括号不成对: {output_format}", rule="date_format")
+        return text.replace("%", "%%")
+
+
+def compile_date_formatter(output_format: str) -> DateFormatter:
+    """
+    编译日期输出格式
+
+    Args:
+        output_format: 由 YYYY/YY/MM/M/DD/D 占位符与分隔符组成的格式，如 "YYYYMMDD"、"YYYY/MM/DD"；
+            方括号内的文本原样输出，如 "[Date:] YYYY-MM-DD"
 
-    pass
+    Returns:
+        DateFormatter: 可复用的格式化器
+
+    Raises:
+        TransformError: 当输出格式不是字符串、方括号不成对或不包含任何日期占位符时抛出
+    """
+    if not isinstance(output_format, str):
+        raise TransformError(f"不支持的输出格式: {output_format}", rule="date_format")
+    return _compile_date_formatter(output_format)
+
+
+@lru_cache(maxsize=32)
+def _compile_date_formatter(output_format: str) -> DateFormatter:
+    return DateFormatter(output_format)
 
 
 class Transformer:
     """数据转换器，提供日期、金额、卡号等转换功能"""
 
     # 支持的日期输入格式（按优先级顺序）
-    DATE_INPUT_FORMATS = [
-        "%Y-%m-%d",  # YYYY-MM-DD
-        "%d/%m/%Y",  # DD/MM/YYYY
-        "%m/%d/%Y",  # MM/DD/YYYY
-        "%Y年%m月%d日",  # 中文格式 YYYY年MM月DD日
-        "%Y-%m-%d",  # YYYY-MM-DD (支持单数字月日)
-    ]
+    DATE_INPUT_FORMATS = DATE_INPUT_FORMATS
 
     def __init__(self):
         """初始化转换器"""
@@ -57,57 +142,54 @@ class Transformer:
 
         Args:
             value: 输入日期（字符串）
-            output_format: 输出格式，默认为 "YYYY-MM-DD"
+            output_format: 输出格式，默认为 "YYYY-MM-DD"，支持 YYYY/YY/MM/M/DD/D 占位符
 
         Returns:
-            str: 格式化后的日期字符串
+            str: 格式化后的日期字符串（DateText，同时携带所表示的日期，转换后校验无需重新解析）
 
         Raises:
             TransformError: 如果日期解析失败
         """
-        logger.debug(f"开始日期转换: value={value}, output_format={output_format}")
+        logger.debug("开始日期转换: value=%s, output_format=%s", value, output_format)
+        # 输出格式按格式串缓存编译结果
+        return self.format_date(value, compile_date_formatter(output_format))
 
-        if not value:
-            error_msg = "日期值为空"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+    def format_date(self, value, formatter: DateFormatter) -> str:
+        """
+        使用预编译的格式化器转换日期，输入格式与 transform_date 相同
 
-        # 将输出格式转换为 Python datetime 格式
-        if output_format == "YYYY-MM-DD":
-            python_output_format = "%Y-%m-%d"
-        else:
-            # 目前仅支持 YYYY-MM-DD 输出格式
-            error_msg = f"不支持的输出格式: {output_format}"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+        转换注册表为每列编译一次格式化器，逐值只做解析与格式化。
+
+        Args:
+            value: 输入日期
+            formatter: compile_date_formatter 返回的格式化器
+
+        Returns:
+            str: 格式化后的日期字符串（DateText）
+
+        Raises:
+            TransformError: 如果日期为空或解析失败
+        """
+        if not value:
+            raise TransformError("日期值为空", value=value, rule="date_format")
 
         # 支持 datetime/date 直接格式化
         if isinstance(value, (datetime, date)):
-            result = value.strftime(python_output_format)
-            logger.debug(f"日期转换成功: {value} -> {result} (datetime/date)")
-            return result
+            return DateText(formatter(value), value)
 
-        # 尝试各种输入格式
-        for fmt in self.DATE_INPUT_FORMATS:
-            try:
-                parsed_date = datetime.strptime(str(value), fmt)
-                result = parsed_date.strftime(python_output_format)
-                logger.debug(f"日期转换成功: {value} -> {result} (使用格式: {fmt})")
-                return result
-            except ValueError:
-                logger.debug(f"日期格式 '{fmt}' 解析失败: {value}")
-                continue
+        # 按优先级尝试各种输入格式
+        parsed_date = try_parse_date(str(value))
+        if parsed_date is not None:
+            return DateText(formatter(parsed_date), parsed_date)
 
         # 所有格式都失败
-        error_msg = f"无法解析日期: {value}，已尝试所有格式"
-        logger.error(error_msg)
-        raise TransformError(error_msg)
+        raise TransformError(template="无法解析日期: {value}，已尝试所有格式", value=value, rule="date_format")
 
-    def transform_amount(self, value, decimal_places=2, rounding="round") -> float:
+    def transform_amount(self, value, decimal_places=2, rounding="round") -> FixedAmount:
         """
         金额转换：使用标准舍入到指定小数位
 
-        使用 Decimal 模块进行精确的浮点数运算，避免精度问题
+        使用 Decimal 模块进行精确运算，结果以定点金额表示，供统计、合并对账和写出直接复用
 
         Args:
             value: 输入金额（数字或字符串）
@@ -115,22 +197,26 @@ class Transformer:
             rounding: 舍入方式，支持 round/half_up/floor/ceil/down/up
 
         Returns:
-            float: 舍入后的金额
+            FixedAmount: 舍入后的定点金额
 
         Raises:
             TransformError: 如果金额转换失败
         """
-        logger.debug(f"开始金额转换: value={value}, decimal_places={decimal_places}, rounding={rounding}")
+        logger.debug("开始金额转换: value=%s, decimal_places=%s, rounding=%s", value, decimal_places, rounding)
 
         if value is None or value == "":
-            error_msg = "金额值为空"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+            raise TransformError("金额值为空", value=value, rule="amount_decimal")
+
+        # 使用 Decimal 进行精确运算
+        decimal_value = try_parse_decimal(value)
+        if decimal_value is None:
+            raise TransformError(
+                template="金额转换失败: {value}, 错误: 不是有效数值",
+                value=value,
+                rule="amount_decimal",
+            )
 
         try:
-            # 使用 Decimal 进行精确运算
-            decimal_value = Decimal(str(value))
-
             rounding_map = {
                 "round": ROUND_HALF_UP,
                 "half_up": ROUND_HALF_UP,
@@ -141,23 +227,29 @@ class Transformer:
             }
             rounding_key = str(rounding).strip().lower()
             if rounding_key not in rounding_map:
-                error_msg = f"不支持的舍入方式: {rounding}"
-                logger.error(error_msg)
-                raise TransformError(error_msg)
+                raise TransformError(
+                    template="不支持的舍入方式: {rounding}",
+                    value=value,
+                    rule="amount_decimal",
+                    rounding=rounding,
+                )
 
             rounded_value = decimal_value.quantize(
                 Decimal(f"1.{'0' * decimal_places}"),
                 rounding=rounding_map[rounding_key],
             )
 
-            result = float(rounded_value)
-            logger.debug(f"金额转换成功: {value} -> {result}")
+            result = FixedAmount.from_decimal(rounded_value)
+            logger.debug("金额转换成功: %s -> %s", value, result)
             return result
 
         except (InvalidOperation, ValueError, TypeError) as e:
-            error_msg = f"金额转换失败: {value}, 错误: {e}"
-            logger.error(error_msg)
-            raise TransformError(error_msg) from e
+            raise TransformError(
+                template="金额转换失败: {value}, 错误: {cause}",
+                value=value,
+                rule="amount_decimal",
+                cause=e,
+            ) from e
 
     def _luhn_check(self, card_number: str) -> bool:
         """
@@ -176,7 +268,7 @@ class Transformer:
         Returns:
             bool: 卡号是否通过 Luhn 验证
         """
-        logger.debug(f"开始 Luhn 验证: {card_number}")
+        logger.debug("开始 Luhn 验证: %s", card_number)
 
         total = 0
         # 从右向左遍历，index=0 是最右边的一位（校验位）
@@ -194,7 +286,7 @@ class Transformer:
                 total += digit
 
         result = total % 10 == 0
-        logger.debug(f"Luhn 验证结果: {result} (总和: {total})")
+        logger.debug("Luhn 验证结果: %s (总和: %s)", result, total)
         return result
 
     def transform_card_number(self, value, remove_formatting: bool = True, luhn_validation: bool = True) -> str:
@@ -215,12 +307,10 @@ class Transformer:
         Raises:
             TransformError: 如果卡号无效或验证失败
         """
-        logger.debug(f"开始卡号转换: value={value}")
+        logger.debug("开始卡号转换: value=%s", value)
 
         if not value:
-            error_msg = "卡号值为空"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+            raise TransformError("卡号值为空", value=value, rule="card_number")
 
         # 预处理数值类型，避免科学计数法
         original_value = value if isinstance(value, str) else None
@@ -243,23 +333,27 @@ class Transformer:
         cleaned = re.sub(r"[^\d]", "", value_str)
 
         if not cleaned:
-            error_msg = f"卡号不包含任何数字: {value}"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+            raise TransformError(template="卡号不包含任何数字: {value}", value=value, rule="card_number")
 
         # 验证卡号长度（中国银行卡号通常为 13-19 位）
         if len(cleaned) < 13 or len(cleaned) > 19:
-            error_msg = f"卡号长度不符合要求: {len(cleaned)} 位（应为 13-19 位）"
-            logger.error(error_msg)
-            raise TransformError(error_msg)
+            raise TransformError(
+                template="卡号长度不符合要求: {length} 位（应为 13-19 位）",
+                value=value,
+                rule="card_number",
+                length=len(cleaned),
+            )
 
         # 执行 Luhn 验证（可选）
         if luhn_validation:
             if not self._luhn_check(cleaned):
-                error_msg = f"卡号 Luhn 验证失败: {cleaned}"
-                logger.error(error_msg)
-                raise TransformError(error_msg)
+                raise TransformError(
+                    template="卡号 Luhn 验证失败: {cleaned}",
+                    value=value,
+                    rule="card_number",
+                    cleaned=cleaned,
+                )
 
         result = cleaned if remove_formatting else (original_value if original_value is not None else value_str)
-        logger.debug(f"卡号转换成功: {value} -> {result}")
+        logger.debug("卡号转换成功: %s -> %s", value, result)
         return result
@@ -1,36 +1,37 @@
 """
 数据验证器模块
 
-提供数据验证功能，包括必填字段验证、数据类型验证和值范围验证。
+提供数据验证功能，包括必填字段验证、数据类型验证和值范围验证，
+以及唯一性、累计上限、单文件行数上限等跨行规则。
 """
 
+from abc import ABC, abstractmethod
 from datetime import datetime, date, time
-from decimal import Decimal, InvalidOperation
-from typing import List, Any, Dict, Mapping
+from decimal import Decimal
+from typing import List, Any, Callable, Dict, Hashable, Mapping
 import logging
 
-from .transformer import Transformer
+from .amount import FixedAmount
+from .errors import DataError
+from .parsing import try_parse_date, try_parse_decimal
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 类型检查函数：接收字段名与非空字段值，类型不匹配时抛出 ValidationError
+TypeChecker = Callable[[str, Any], None]
+# 跨行规则的单次遍历状态：按行顺序接收字段值，违反规则时返回错误
+CrossRowStep = Callable[[Any], "ValidationError | None"]
 
-class ValidationError(Exception):
-    """验证错误异常类"""
+_MISSING = object()
 
-    def __init__(self, message: str):
-        """
-        初始化验证错误
+# 旧版逐行接口按规则内容缓存的校验计划数量上限
+_PLAN_CACHE_SIZE = 32
+_plan_cache: dict[Hashable, "ValidationPlan"] = {}
 
-        Args:
-            message: 错误消息
-        """
-        super().__init__(message)
-        self.message = message
-        logger.error(f"验证错误: {message}")
 
-    def __str__(self) -> str:
-        return self.message
+class ValidationError(DataError):
+    """验证错误异常类，携带 field/value/rule/row 结构化信息"""
 
 
 class Validator:
@@ -38,40 +39,43 @@ class Validator:
 
     @staticmethod
     def _parse_date_string(field: str, value: str) -> datetime:
-        for fmt in Transformer.DATE_INPUT_FORMATS:
-            try:
-                return datetime.strptime(value, fmt)
-            except ValueError:
-                continue
-        raise ValidationError(f"字段 '{field}' 的值 {value} 不是有效日期")
+        parsed = try_parse_date(value)
+        if parsed is None:
+            raise ValidationError(template="字段 '{field}' 的值 {value} 不是有效日期", field=field, value=value, rule="date")
+        return parsed
 
     @staticmethod
     def _parse_numeric_string(field: str, value: str) -> Decimal:
-        try:
-            return Decimal(str(value))
-        except (InvalidOperation, ValueError, TypeError) as e:
-            raise ValidationError(f"字段 '{field}' 的值 {value} 不是有效数值") from e
+        parsed = try_parse_decimal(value)
+        if parsed is None:
+            raise ValidationError(template="字段 '{field}' 的值 {value} 不是有效数值", field=field, value=value, rule="numeric")
+        return parsed
 
     @staticmethod
     def _try_parse_date(value: Any) -> datetime | date | None:
-        if isinstance(value, (datetime, date)):
-            return value
-        if isinstance(value, str):
-            for fmt in Transformer.DATE_INPUT_FORMATS:
-                try:
-                    return datetime.strptime(value, fmt)
-                except ValueError:
-                    continue
+        return try_parse_date(value)
+
+    @staticmethod
+    def _try_coerce_numeric(value: Any) -> Decimal | None:
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, FixedAmount):
+            return value.to_decimal()
+        if isinstance(value, (int, float, Decimal, str)):
+            return try_parse_decimal(value)
         return None
 
     @staticmethod
     def _is_numeric_value(value: Any) -> bool:
-        return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+        return isinstance(value, (int, float, Decimal, FixedAmount)) and not isinstance(value, bool)
 
     @staticmethod
     def _coerce_numeric_value(field: str, value: Any) -> Decimal:
         if isinstance(value, Decimal):
             return value
+        if isinstance(value, FixedAmount):
+            # 金额转换已保存精确值，直接取用，不再经 float 文本重新解析
+            return value.to_decimal()
         if isinstance(value, bool):
             raise TypeError("bool 不作为数值处理")
         if isinstance(value, (int, float)):
@@ -89,10 +93,10 @@ class Validator:
         if isinstance(value, (int, float)):
             return Decimal(str(value))
         if isinstance(value, str):
-            try:
-                return Decimal(str(value))
-            except (InvalidOperation, ValueError, TypeError) as e:
-                raise TypeError(f"无法转换为数值: {value}") from e
+            parsed = try_parse_decimal(value)
+            if parsed is None:
+                raise TypeError(f"无法转换为数值: {value}")
+            return parsed
         raise TypeError("无法转换为数值")
 
     @staticmethod
@@ -117,10 +121,9 @@ class Validator:
                 return datetime.combine(value, time.min)
             return value
         if isinstance(value, str):
-            try:
-                parsed = Validator._parse_date_string("边界", value)
-            except ValidationError as e:
-                raise TypeError(str(e)) from e
+            parsed = try_parse_date(value)
+            if parsed is None:
+                raise TypeError(f"字段 '边界' 的值 {value} 不是有效日期")
             return parsed if date_mode == "datetime" else parsed.date()
         raise TypeError("无法转换为日期")
 
@@ -151,16 +154,11 @@ class Validator:
         if isinstance(value, (int, float, Decimal)):
             return "numeric"
         if isinstance(value, str):
-            try:
-                Validator._parse_numeric_string("边界", value)
+            if try_parse_decimal(value) is not None:
                 return "numeric"
-            except ValidationError:
-                pass
-            try:
-                Validator._parse_date_string("边界", value)
+            if try_parse_date(value) is not None:
                 return "date"
-            except ValidationError as exc:
-                raise TypeError(str(exc)) from exc
+            raise TypeError(f"字段 '边界' 的值 {value} 不是有效日期")
         raise TypeError(f"不支持的范围边界类型: {type(value).__name__}")
 
     @staticmethod
@@ -188,60 +186,38 @@ class Validator:
         return Validator._coerce_numeric_value(field, value)
 
     @staticmethod
-    def _normalize_allowed_values(field: str, value: Any, allowed_values: Any) -> tuple[Any, Any, bool]:
+    def compile(rules: Mapping[str, Any]) -> "ValidationPlan":
         """
-        归一化 allowed_values 以便比较
+        将校验规则编译为校验计划
 
-        Returns:
-            (normalized_value, normalized_allowed_values, use_normalized)
-        """
-        if not isinstance(allowed_values, list):
-            return value, allowed_values, False
-
-        value_date = Validator._try_parse_date(value)
-        allowed_dates = [Validator._try_parse_date(item) for item in allowed_values]
-        if value_date is not None and any(item is not None for item in allowed_dates):
-            date_mode = (
-                "datetime"
-                if isinstance(value, datetime) or any(isinstance(item, datetime) for item in allowed_values)
-                else "date"
-            )
-            try:
-                normalized_value = Validator._coerce_date_value(field, value, date_mode)
-            except TypeError as e:
-                logger.warning(f"字段 '{field}' 的 allowed_values 日期归一化失败，已回退原值比较: {e}")
-                return value, allowed_values, False
-
-            normalized_allowed = []
-            for item in allowed_values:
-                try:
-                    normalized_allowed.append(Validator._coerce_date_bound(item, date_mode))
-                except TypeError as e:
-                    logger.warning(f"字段 '{field}' 的 allowed_values 日期值无法解析，已保留原值: {e}")
-                    normalized_allowed.append(item)
-
-            return normalized_value, normalized_allowed, True
-
-        try:
-            normalized_value = Validator._coerce_numeric_value(field, value)
-        except (TypeError, ValidationError) as e:
-            logger.warning(f"字段 '{field}' 的 allowed_values 数值归一化失败，已回退原值比较: {e}")
-            return value, allowed_values, False
-
-        normalized_allowed = []
-        any_numeric = False
-        for item in allowed_values:
-            try:
-                normalized_allowed.append(Validator._coerce_numeric_bound(item))
-                any_numeric = True
-            except TypeError as e:
-                logger.warning(f"字段 '{field}' 的 allowed_values 数值无法解析，已保留原值: {e}")
-                normalized_allowed.append(item)
+        范围边界只解析一次，类型名预先解析为类型检查函数；规则配置错误推迟到校验到对应字段时再报告，
+        与逐行解释规则时的行为保持一致。
 
-        if not any_numeric:
-            return value, allowed_values, False
+        Args:
+            rules: 校验规则，包含 required_fields、data_types、value_ranges，
+                以及跨行规则 unique_fields、max_total、max_rows_per_file
 
-        return normalized_value, normalized_allowed, True
+        Returns:
+            ValidationPlan: 可对多行重复执行的校验计划
+        """
+        required_fields = rules.get("required_fields") or []
+        type_rules = rules.get("data_types") or {}
+        range_rules = rules.get("value_ranges") or {}
+
+        cross_row_rules: list[CrossRowRule] = [_UniqueRule(field) for field in rules.get("unique_fields") or []]
+        cross_row_rules.extend(_MaxTotalRule(field, limit) for field, limit in (rules.get("max_total") or {}).items())
+        max_rows = rules.get("max_rows_per_file")
+        if max_rows is not None:
+            cross_row_rules.append(_MaxRowsRule(max_rows))
+
+        return ValidationPlan(
+            required_fields=tuple(required_fields),
+            type_checks=tuple(
+                (field, _resolve_type_checker(field, expected_type)) for field, expected_type in type_rules.items()
+            ),
+            range_checks=tuple(_RangeCheck(field, field_rules) for field, field_rules in range_rules.items()),
+            cross_row_rules=tuple(cross_row_rules),
+        )
 
     @staticmethod
     def validate_required(row: Dict[str, Any], required_fields: List[str]) -> None:
@@ -257,35 +233,9 @@ class Validator:
         Raises:
             ValidationError: 当必填字段缺失或为空时抛出
         """
-        logger.debug(f"开始验证必填字段: {required_fields}")
-
-        for field in required_fields:
-            if field not in row:
-                error_msg = f"必填字段 '{field}' 不存在"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            value = row[field]
-
-            # 检查值为空的情况
-            if value is None:
-                error_msg = f"必填字段 '{field}' 的值为 None"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            # 检查空字符串
-            if isinstance(value, str) and not value.strip():
-                error_msg = f"必填字段 '{field}' 的值为空字符串"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            # 检查空列表/字典
-            if isinstance(value, (list, dict)) and len(value) == 0:
-                error_msg = f"必填字段 '{field}' 的值为空 {type(value).__name__}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-        logger.info(f"必填字段验证通过: {required_fields}")
+        logger.debug("开始验证必填字段: %s", required_fields)
+        _cached_plan("required_fields", required_fields).validate_required(row)
+        logger.debug("必填字段验证通过: %s", required_fields)
 
     @staticmethod
     def validate_data_types(row: Dict[str, Any], type_rules: Mapping[str, Any]) -> None:
@@ -302,212 +252,749 @@ class Validator:
         Raises:
             ValidationError: 当字段值类型不匹配时抛出
         """
-        logger.debug(f"开始验证数据类型: {type_rules}")
+        logger.debug("开始验证数据类型: %s", type_rules)
+        _cached_plan("data_types", type_rules).validate_data_types(row)
+        logger.debug("数据类型验证通过")
+
+    @staticmethod
+    def validate_value_ranges(row: Dict[str, Any], range_rules: Dict[str, Dict[str, Any]]) -> None:
+        """
+        验证值范围
+
+        检查字段值是否在允许的范围内
+        支持的范围规则：
+        - min: 最小值（包含）
+        - max: 最大值（包含）
+        - min_length: 最小长度（用于字符串、列表、字典）
+        - max_length: 最大长度（用于字符串、列表、字典）
+        - allowed_values: 允许的值列表（枚举）
+
+        Args:
+            row: 数据行（字典）
+            range_rules: 范围规则字典，格式为 {字段名: {规则名: 规则值}}
+
+        Raises:
+            ValidationError: 当字段值超出范围时抛出
+        """
+        logger.debug("开始验证值范围: %s", range_rules)
+        _cached_plan("value_ranges", range_rules).validate_value_ranges(row)
+        logger.debug("值范围验证通过")
+
+
+def _freeze_rules(value: Any) -> Hashable:
+    """将规则配置转换为可哈希的缓存键；标量带上类型，避免 1、1.0 与 True 互相命中。"""
+    if isinstance(value, Mapping):
+        return (dict, tuple((key, _freeze_rules(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze_rules(item) for item in value))
+    return (type(value), value)
+
+
+def _cached_plan(kind: str, rules: Any) -> "ValidationPlan":
+    """
+    取得旧版逐行接口使用的校验计划
+
+    按规则内容缓存，同一规则逐行调用时只编译一次；规则在两次调用之间被修改会得到新的缓存键。
+    规则包含不可哈希的值时退回为每次编译。
+    """
+    try:
+        key = (kind, _freeze_rules(rules))
+        plan = _plan_cache.get(key)
+    except TypeError:
+        return Validator.compile({kind: rules})
+    if plan is None:
+        if len(_plan_cache) >= _PLAN_CACHE_SIZE:
+            _plan_cache.clear()
+        plan = _plan_cache[key] = Validator.compile({kind: rules})
+    return plan
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _type_mismatch(field: str, type_name: str, value: Any) -> ValidationError:
+    return ValidationError(
+        template="字段 '{field}' 的类型应为 {rule}，实际为 {actual_type}",
+        field=field,
+        value=value,
+        rule=type_name,
+        actual_type=type(value).__name__,
+    )
+
+
+def _check_numeric(field: str, value: Any) -> None:
+    if Validator._is_numeric_value(value):
+        return
+    if isinstance(value, str):
+        Validator._parse_numeric_string(field, value)
+        return
+    raise _type_mismatch(field, "numeric", value)
+
+
+def _check_integer(field: str, value: Any) -> None:
+    if isinstance(value, bool):
+        raise _type_mismatch(field, "integer", value)
+    if isinstance(value, int):
+        return
+    if isinstance(value, float) and value.is_integer():
+        return
+    if isinstance(value, Decimal) and value == value.to_integral_value():
+        return
+    if isinstance(value, FixedAmount) and value.units % 10**value.scale == 0:
+        return
+    if isinstance(value, str):
+        numeric_value = Validator._parse_numeric_string(field, value)
+        if numeric_value == numeric_value.to_integral_value():
+            return
+    raise _type_mismatch(field, "integer", value)
+
+
+def _make_date_checker(type_name: str) -> TypeChecker:
+    def check_date(field: str, value: Any) -> None:
+        if isinstance(value, (datetime, date)):
+            return
+        if isinstance(value, str):
+            Validator._parse_date_string(field, value)
+            return
+        raise _type_mismatch(field, type_name, value)
 
-        type_map = {
+    return check_date
+
+
+def _make_isinstance_checker(type_name: str, expected_py_type: type | tuple[type, ...]) -> TypeChecker:
+    def check_instance(field: str, value: Any) -> None:
+        if not isinstance(value, expected_py_type):
+            raise _type_mismatch(field, type_name, value)
+
+    return check_instance
+
+
+def _make_config_error_checker(error_msg: str) -> TypeChecker:
+    def raise_config_error(field: str, value: Any) -> None:
+        raise ValidationError(error_msg, field=field, value=value, rule="data_types")
+
+    return raise_config_error
+
+
+# 规范化类型名到类型检查函数的映射，模块加载时构建一次
+_TYPE_CHECKERS: dict[str, TypeChecker] = {
+    "numeric": _check_numeric,
+    "int": _check_integer,
+    "integer": _check_integer,
+    "date": _make_date_checker("date"),
+    "datetime": _make_date_checker("datetime"),
+    **{
+        type_name: _make_isinstance_checker(type_name, py_type)
+        for type_name, py_type in {
             "string": str,
             "str": str,
-            "int": int,
-            "integer": int,
-            "float": float,
+            # 金额转换产出的定点金额按小数处理
+            "float": (float, FixedAmount),
             "bool": bool,
             "boolean": bool,
             "list": list,
             "dict": dict,
-        }
+        }.items()
+    },
+}
+
+
+def _resolve_type_checker(field: str, expected_type: Any) -> TypeChecker:
+    if not isinstance(expected_type, str):
+        return _make_config_error_checker(f"字段 '{field}' 的类型配置必须为字符串")
+    checker = _TYPE_CHECKERS.get(expected_type.strip().lower())
+    if checker is None:
+        return _make_config_error_checker(f"字段 '{field}' 的类型不支持: {expected_type}")
+    return checker
+
+
+class _AllowedValues:
+    """
+    已编译的 allowed_values 查找集合
+
+    构建时把允许值分别归一化为原值、数值、日期三类 frozenset，逐行只做哈希查找。
+    匹配规则：原值相等即通过；否则值可解析为日期且允许值中含日期时按日期比较，其余情况按数值比较。
+    """
+
+    __slots__ = (
+        "field",
+        "values",
+        "raw",
+        "unhashable",
+        "numeric",
+        "dates",
+        "datetimes",
+        "has_datetime",
+    )
+
+    def __init__(self, field: str, allowed_values: Any):
+        self.field = field
+        self.values = allowed_values
+        self.numeric: frozenset[Decimal] = frozenset()
+        self.dates: frozenset[date] = frozenset()
+        self.datetimes: frozenset[datetime] = frozenset()
+        self.has_datetime = False
+        if not isinstance(allowed_values, list):
+            self.raw: frozenset[Any] = frozenset()
+            self.unhashable: tuple[Any, ...] = ()
+            return
+
+        raw: set[Any] = set()
+        unhashable: list[Any] = []
+        for item in allowed_values:
+            try:
+                raw.add(item)
+            except TypeError:
+                unhashable.append(item)
+        self.raw = frozenset(raw)
+        self.unhashable = tuple(unhashable)
+
+        parsed_dates = [(item, try_parse_date(item)) for item in allowed_values]
+        date_values = [parsed for _, parsed in parsed_dates if parsed is not None]
+        if date_values:
+            self.has_datetime = any(isinstance(item, datetime) for item in allowed_values)
+            self.dates = frozenset(_as_date_key(parsed, "date") for parsed in date_values)
+            self.datetimes = frozenset(_as_date_key(parsed, "datetime") for parsed in date_values)
+            for item, parsed in parsed_dates:
+                if parsed is None:
+                    logger.warning("字段 '%s' 的 allowed_values 日期值无法解析，按日期比较时将忽略: %s", field, item)
+
+        numeric: set[Decimal] = set()
+        unparsed_numeric: list[Any] = []
+        for item in allowed_values:
+            normalized_item = Validator._try_coerce_numeric(item)
+            if normalized_item is None:
+                unparsed_numeric.append(item)
+            elif not normalized_item.is_nan():
+                numeric.add(normalized_item)
+        self.numeric = frozenset(numeric)
+        if numeric:
+            for item in unparsed_numeric:
+                logger.warning("字段 '%s' 的 allowed_values 数值无法解析，按数值比较时将忽略: %s", field, item)
+
+    def contains(self, value: Any) -> bool:
+        """判断值是否在允许的值列表中。"""
+        if not isinstance(self.values, list):
+            return value in self.values
+
+        try:
+            if value in self.raw:
+                return True
+        except TypeError:
+            return value in self.values
+        if self.unhashable and value in self.unhashable:
+            return True
+
+        if self.dates:
+            value_date = try_parse_date(value)
+            if value_date is not None:
+                if self.has_datetime or isinstance(value, datetime):
+                    return _as_date_key(value_date, "datetime") in self.datetimes
+                return _as_date_key(value_date, "date") in self.dates
+
+        if not self.numeric:
+            return False
+        normalized_value = Validator._try_coerce_numeric(value)
+        if normalized_value is None:
+            logger.warning("字段 '%s' 的 allowed_values 数值归一化失败，已回退原值比较: %s", self.field, value)
+            return False
+        return not normalized_value.is_nan() and normalized_value in self.numeric
+
+
+def _as_date_key(value: datetime | date, date_mode: str) -> date:
+    if isinstance(value, datetime):
+        return value if date_mode == "datetime" else value.date()
+    return datetime.combine(value, time.min) if date_mode == "datetime" else value
+
+
+class _RangeCheck:
+    """单个字段的已编译范围规则，min/max 边界在构建时解析一次。"""
+
+    __slots__ = (
+        "field",
+        "has_bounds",
+        "min_val",
+        "max_val",
+        "kind",
+        "date_mode",
+        "min_cmp",
+        "max_cmp",
+        "bound_error",
+        "min_length",
+        "max_length",
+        "allowed_values",
+    )
+
+    def __init__(self, field: str, rules: Mapping[str, Any]):
+        self.field = field
+        self.has_bounds = "min" in rules or "max" in rules
+        self.min_val = rules.get("min")
+        self.max_val = rules.get("max")
+        self.kind = "numeric"
+        self.date_mode: str | None = None
+        self.min_cmp: Any = None
+        self.max_cmp: Any = None
+        self.bound_error: TypeError | None = None
+        if self.has_bounds:
+            try:
+                self.kind, self.date_mode, self.min_cmp, self.max_cmp = Validator._coerce_comparison_bounds(
+                    self.min_val, self.max_val
+                )
+            except TypeError as e:
+                self.bound_error = e
+        self.min_length = rules.get("min_length", _MISSING)
+        self.max_length = rules.get("max_length", _MISSING)
+        self.allowed_values = _AllowedValues(field, rules["allowed_values"]) if "allowed_values" in rules else None
+
+    @property
+    def numeric_bounds_only(self) -> bool:
+        """是否只包含有效的数值 min/max 规则，可用于向量化预筛。"""
+        return (
+            self.has_bounds
+            and self.bound_error is None
+            and self.kind == "numeric"
+            and self.min_length is _MISSING
+            and self.max_length is _MISSING
+            and self.allowed_values is None
+        )
+
+    def check(self, value: Any) -> None:
+        field = self.field
+
+        if self.has_bounds:
+            if self.bound_error is not None:
+                raise ValidationError(
+                    template="字段 '{field}' 的范围规则无效: {cause}",
+                    field=field,
+                    value=value,
+                    rule="value_ranges",
+                    cause=self.bound_error,
+                ) from self.bound_error
+            try:
+                value_cmp = Validator._coerce_value_for_range(field, value, self.kind, self.date_mode)
+            except ValidationError:
+                raise
+            except TypeError as e:
+                logger.warning("字段 '%s' 的值无法与范围规则比较，已跳过: %s", field, e)
+                return
+
+            if self.min_cmp is not None and value_cmp < self.min_cmp:
+                raise ValidationError(
+                    template="字段 '{field}' 的值 {value} 小于最小值 {bound}",
+                    field=field,
+                    value=value,
+                    rule="min",
+                    bound=self.min_val,
+                )
 
-        for field, expected_type in type_rules.items():
-            if field not in row:
-                # 字段不存在，跳过验证（可选）
-                logger.warning(f"字段 '{field}' 不存在，跳过类型验证")
-                continue
+            if self.max_cmp is not None and value_cmp > self.max_cmp:
+                raise ValidationError(
+                    template="字段 '{field}' 的值 {value} 大于最大值 {bound}",
+                    field=field,
+                    value=value,
+                    rule="max",
+                    bound=self.max_val,
+                )
 
-            value = row[field]
-            if value is None or (isinstance(value, str) and not value.strip()):
-                logger.debug(f"字段 '{field}' 值为空，跳过类型验证")
-                continue
+        # 验证最小长度（用于字符串、列表、字典）
+        if self.min_length is not _MISSING:
+            min_len = self.min_length
+            try:
+                if len(value) < min_len:
+                    raise ValidationError(
+                        template="字段 '{field}' 的长度 {length} 小于最小长度 {bound}",
+                        field=field,
+                        value=value,
+                        rule="min_length",
+                        length=len(value),
+                        bound=min_len,
+                    )
+            except TypeError:
+                logger.warning("字段 '%s' 不支持长度校验，已跳过 min_length", field)
+
+        # 验证最大长度（用于字符串、列表、字典）
+        if self.max_length is not _MISSING:
+            max_len = self.max_length
+            try:
+                if len(value) > max_len:
+                    raise ValidationError(
+                        template="字段 '{field}' 的长度 {length} 大于最大长度 {bound}",
+                        field=field,
+                        value=value,
+                        rule="max_length",
+                        length=len(value),
+                        bound=max_len,
+                    )
+            except TypeError:
+                logger.warning("字段 '%s' 不支持长度校验，已跳过 max_length", field)
+
+        # 验证允许的值（枚举）
+        if self.allowed_values is not None and not self.allowed_values.contains(value):
+            raise ValidationError(
+                template="字段 '{field}' 的值 {value} 不在允许的值列表中: {allowed}",
+                field=field,
+                value=value,
+                rule="allowed_values",
+                allowed=self.allowed_values.values,
+            )
 
-            if not isinstance(expected_type, str):
-                error_msg = f"字段 '{field}' 的类型配置必须为字符串"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
 
-            type_name = expected_type.strip().lower()
+class CrossRowRule(ABC):
+    """
+    跨行规则基类
 
-            if type_name == "numeric":
-                if Validator._is_numeric_value(value):
-                    continue
-                if isinstance(value, str):
-                    Validator._parse_numeric_string(field, value)
-                    continue
-                error_msg = f"字段 '{field}' 的类型应为 numeric，实际为 {type(value).__name__}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            if type_name in ("int", "integer"):
-                if isinstance(value, bool):
-                    error_msg = f"字段 '{field}' 的类型应为 integer，实际为 bool"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg)
-                if isinstance(value, int):
-                    continue
-                if isinstance(value, float) and value.is_integer():
-                    continue
-                if isinstance(value, Decimal) and value == value.to_integral_value():
-                    continue
-                if isinstance(value, str):
-                    numeric_value = Validator._parse_numeric_string(field, value)
-                    if numeric_value == numeric_value.to_integral_value():
-                        continue
-                error_msg = f"字段 '{field}' 的类型应为 integer，实际为 {type(value).__name__}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
-
-            if type_name in ("date", "datetime"):
-                if isinstance(value, (datetime, date)):
-                    continue
-                if isinstance(value, str):
-                    Validator._parse_date_string(field, value)
-                    continue
-                error_msg = f"字段 '{field}' 的类型应为 {type_name}，实际为 {type(value).__name__}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
+    规则本身只保存编译后的配置；每次遍历数据时调用 start 创建独立的状态，
+    状态以哈希集合或累加器增量维护，每行只增加 O(1) 的工作量。
+    子类必须实现 start，否则在实例化时即报错。
+    """
 
-            expected_py_type = type_map.get(type_name)
-            if expected_py_type is None:
-                error_msg = f"字段 '{field}' 的类型不支持: {expected_type}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
+    __slots__ = ("field",)
 
-            if not isinstance(value, expected_py_type):
-                error_msg = f"字段 '{field}' 的类型应为 {type_name}，实际为 {type(value).__name__}"
-                logger.error(error_msg)
-                raise ValidationError(error_msg)
+    def __init__(self, field: str | None):
+        self.field = field
 
-        logger.info("数据类型验证通过")
+    @abstractmethod
+    def start(self) -> CrossRowStep:
+        """创建一次遍历的状态，返回按行调用的检查函数。"""
 
-    @staticmethod
-    def validate_value_ranges(row: Dict[str, Any], range_rules: Dict[str, Dict[str, Any]]) -> None:
-        """
-        验证值范围
 
-        检查字段值是否在允许的范围内
-        支持的范围规则：
-        - min: 最小值（包含）
-        - max: 最大值（包含）
-        - min_length: 最小长度（用于字符串、列表、字典）
-        - max_length: 最大长度（用于字符串、列表、字典）
-        - allowed_values: 允许的值列表（枚举）
+class _UniqueRule(CrossRowRule):
+    """字段值在同一组数据中不得重复，空值不参与比较。"""
+
+    __slots__ = ()
+
+    def start(self) -> CrossRowStep:
+        field = self.field
+        first_rows: dict[Any, int] = {}
+        row_number = 0
+
+        def step(value: Any) -> ValidationError | None:
+            nonlocal row_number
+            row_number += 1
+            if _is_blank(value):
+                return None
+            try:
+                first_row = first_rows.setdefault(value, row_number)
+            except TypeError:
+                # 列表、字典等不可哈希的值不参与唯一性比较
+                return None
+            if first_row == row_number:
+                return None
+            return ValidationError(
+                template="字段 '{field}' 的值 {value} 与第 {first_row} 条数据重复",
+                field=field,
+                value=value,
+                rule="unique",
+                first_row=first_row,
+            )
+
+        return step
+
+
+class _MaxTotalRule(CrossRowRule):
+    """字段累计值不得超过上限，非数值与空值不计入累计。"""
+
+    __slots__ = ("limit", "limit_cmp", "bound_error")
+
+    def __init__(self, field: str, limit: Any):
+        super().__init__(field)
+        self.limit = limit
+        self.limit_cmp: Decimal | None = None
+        self.bound_error: TypeError | None = None
+        try:
+            self.limit_cmp = Validator._coerce_numeric_bound(limit)
+        except TypeError as e:
+            self.bound_error = e
+
+    def start(self) -> CrossRowStep:
+        field = self.field
+        limit = self.limit
+        limit_cmp = self.limit_cmp
+        bound_error = self.bound_error
+        total = Decimal(0)
+        exceeded = False
+
+        def step(value: Any) -> ValidationError | None:
+            nonlocal total, exceeded
+            if exceeded or _is_blank(value):
+                return None
+            if bound_error is not None:
+                exceeded = True
+                return ValidationError(
+                    template="字段 '{field}' 的累计上限规则无效: {cause}",
+                    field=field,
+                    value=value,
+                    rule="max_total",
+                    cause=bound_error,
+                )
+            amount = Validator._try_coerce_numeric(value)
+            if amount is None or not amount.is_finite():
+                return None
+            total += amount
+            if total <= limit_cmp:
+                return None
+            # 超出上限后只报告一次，后续行的累计值必然同样超限
+            exceeded = True
+            return ValidationError(
+                template="字段 '{field}' 的累计值 {total} 超过上限 {limit}",
+                field=field,
+                value=value,
+                rule="max_total",
+                total=total,
+                limit=limit,
+            )
+
+        return step
+
+
+class _MaxRowsRule(CrossRowRule):
+    """单个输出文件的数据行数上限。"""
+
+    __slots__ = ("limit",)
+
+    def __init__(self, limit: int):
+        super().__init__(None)
+        self.limit = limit
+
+    def start(self) -> CrossRowStep:
+        limit = self.limit
+        row_count = 0
+
+        def step(value: Any) -> ValidationError | None:
+            nonlocal row_count
+            del value
+            row_count += 1
+            if row_count != limit + 1:
+                return None
+            return ValidationError(
+                template="数据行数超过单个文件上限 {limit}",
+                value=row_count,
+                rule="max_rows_per_file",
+                limit=limit,
+            )
+
+        return step
+
+
+class CrossRowPass:
+    """跨行规则的一次逐行遍历，与逐行规则在同一次遍历中调用。"""
+
+    __slots__ = ("_steps",)
+
+    def __init__(self, rules: tuple[CrossRowRule, ...]):
+        self._steps = tuple((rule.field, rule.start()) for rule in rules)
+
+    def collect(self, row: Mapping[str, Any]) -> list[ValidationError]:
+        """处理下一行，返回该行违反的全部跨行规则。"""
+        violations: list[ValidationError] = []
+        for field, step in self._steps:
+            error = step(None if field is None else row.get(field))
+            if error is not None:
+                violations.append(error)
+        return violations
+
+    def check(self, row: Mapping[str, Any]) -> None:
+        """处理下一行，违反跨行规则时抛出首个错误。"""
+        for field, step in self._steps:
+            error = step(None if field is None else row.get(field))
+            if error is not None:
+                raise error
+
+
+class ValidationPlan:
+    """
+    已编译的校验计划
+
+    由 Validator.compile 生成，逐行执行时只做字段值本身的检查。
+    检查顺序与 Validator.validate_required / validate_data_types / validate_value_ranges 一致。
+    跨行规则依赖行间状态，需通过 start_cross_row 创建遍历状态后逐行调用。
+    """
+
+    __slots__ = ("required_fields", "type_checks", "range_checks", "cross_row_rules")
+
+    def __init__(
+        self,
+        required_fields: tuple[str, ...] = (),
+        type_checks: tuple[tuple[str, TypeChecker], ...] = (),
+        range_checks: tuple[_RangeCheck, ...] = (),
+        cross_row_rules: tuple[CrossRowRule, ...] = (),
+    ):
+        self.required_fields = required_fields
+        self.type_checks = type_checks
+        self.range_checks = range_checks
+        self.cross_row_rules = cross_row_rules
+
+    def __bool__(self) -> bool:
+        return bool(self.required_fields or self.type_checks or self.range_checks or self.cross_row_rules)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """计划涉及的字段（去重并保持首次出现顺序）。"""
+        fields = [*self.required_fields, *(field for field, _ in self.type_checks)]
+        fields.extend(range_check.field for range_check in self.range_checks)
+        fields.extend(rule.field for rule in self.cross_row_rules if rule.field is not None)
+        return tuple(dict.fromkeys(fields))
+
+    def start_cross_row(self) -> CrossRowPass:
+        """创建跨行规则的一次遍历状态。"""
+        return CrossRowPass(self.cross_row_rules)
+
+    def per_row(self) -> "ValidationPlan":
+        """只包含逐行规则的计划。"""
+        return ValidationPlan(self.required_fields, self.type_checks, self.range_checks)
+
+    def cross_row_only(self) -> "ValidationPlan":
+        """只包含跨行规则的计划。"""
+        return ValidationPlan(cross_row_rules=self.cross_row_rules)
+
+    def validate(self, row: Mapping[str, Any]) -> None:
+        """
+        按计划校验一行数据
 
         Args:
             row: 数据行（字典）
-            range_rules: 范围规则字典，格式为 {字段名: {规则名: 规则值}}
 
         Raises:
-            ValidationError: 当字段值超出范围时抛出
+            ValidationError: 当任一规则不满足时抛出
         """
-        logger.debug(f"开始验证值范围: {range_rules}")
-
-        for field, rules in range_rules.items():
-            if field not in row:
-                # 字段不存在，跳过验证
-                logger.warning(f"字段 '{field}' 不存在，跳过范围验证")
-                continue
-
-            value = row[field]
-
-            if value is None or (isinstance(value, str) and not value.strip()):
-                logger.debug(f"字段 '{field}' 值为空，跳过范围验证")
-                continue
-
-            # 验证最小值
-            if "min" in rules:
-                min_val = rules["min"]
-                max_val = rules.get("max")
-                try:
-                    kind, date_mode, min_cmp, max_cmp = Validator._coerce_comparison_bounds(min_val, max_val)
-                except TypeError as e:
-                    error_msg = f"字段 '{field}' 的范围规则无效: {e}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg) from e
-                try:
-                    value_cmp = Validator._coerce_value_for_range(field, value, kind, date_mode)
-                except ValidationError:
-                    raise
-                except TypeError as e:
-                    logger.warning(f"字段 '{field}' 的值无法与范围规则比较，已跳过: {e}")
-                    continue
+        if self.required_fields:
+            self.validate_required(row)
+        if self.type_checks:
+            self.validate_data_types(row)
+        if self.range_checks:
+            self.validate_value_ranges(row)
+
+    def collect(self, row: Mapping[str, Any]) -> list[ValidationError]:
+        """
+        按计划校验一行数据，收集全部违规项而不在首个错误处中止
+
+        Args:
+            row: 数据行（字典）
+
+        Returns:
+            list[ValidationError]: 各字段的首个错误（携带 field/value/rule），无违规时为空
+        """
+        violations: list[ValidationError] = []
+        for field in self.required_fields:
+            try:
+                _check_required_field(row, field)
+            except ValidationError as exc:
+                violations.append(exc)
+        for field, checker in self.type_checks:
+            try:
+                _check_field_type(row, field, checker)
+            except ValidationError as exc:
+                violations.append(exc)
+        for range_check in self.range_checks:
+            try:
+                _check_field_range(row, range_check)
+            except ValidationError as exc:
+                violations.append(exc)
+        return violations
+
+    def row_checker(self) -> Callable[[Mapping[str, Any]], None]:
+        """
+        创建逐行校验函数，供单次遍历的分组处理使用
+
+        行为与 validate 相同，但与列式校验一样，字段不存在的警告每个字段只输出一次。
 
-                if min_cmp is not None and value_cmp < min_cmp:
-                    error_msg = f"字段 '{field}' 的值 {value} 小于最小值 {min_val}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg)
-
-                if max_cmp is not None and value_cmp > max_cmp:
-                    error_msg = f"字段 '{field}' 的值 {value} 大于最大值 {max_val}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg)
-
-            # 验证最大值
-            if "max" in rules and "min" not in rules:
-                max_val = rules["max"]
-                try:
-                    kind, date_mode, min_cmp, max_cmp = Validator._coerce_comparison_bounds(None, max_val)
-                except TypeError as e:
-                    error_msg = f"字段 '{field}' 的范围规则无效: {e}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg) from e
-                try:
-                    value_cmp = Validator._coerce_value_for_range(field, value, kind, date_mode)
-                except ValidationError:
-                    raise
-                except TypeError as e:
-                    logger.warning(f"字段 '{field}' 的值无法与范围规则比较，已跳过: {e}")
+        Returns:
+            接收数据行、校验失败时抛出 ValidationError 的函数
+        """
+        required_fields = self.required_fields
+        type_checks = self.type_checks
+        range_checks = self.range_checks
+        warned_missing: set[tuple[str, str]] = set()
+
+        def warn_missing(field: str, kind: str) -> None:
+            if (field, kind) not in warned_missing:
+                warned_missing.add((field, kind))
+                logger.warning("字段 '%s' 不存在，跳过%s验证", field, kind)
+
+        def check(row: Mapping[str, Any]) -> None:
+            for field in required_fields:
+                _check_required_field(row, field)
+            for field, checker in type_checks:
+                if field not in row:
+                    warn_missing(field, "类型")
+                    continue
+                value = row[field]
+                if not _is_blank(value):
+                    checker(field, value)
+            for range_check in range_checks:
+                if range_check.field not in row:
+                    warn_missing(range_check.field, "范围")
                     continue
+                _check_field_range(row, range_check)
 
-                if max_cmp is not None and value_cmp > max_cmp:
-                    error_msg = f"字段 '{field}' 的值 {value} 大于最大值 {max_val}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg)
-
-            # 验证最小长度（用于字符串、列表、字典）
-            if "min_length" in rules:
-                min_len = rules["min_length"]
-                try:
-                    if len(value) < min_len:
-                        error_msg = f"字段 '{field}' 的长度 {len(value)} 小于最小长度 {min_len}"
-                        logger.error(error_msg)
-                        raise ValidationError(error_msg)
-                except TypeError:
-                    logger.warning(f"字段 '{field}' 不支持长度校验，已跳过 min_length")
-
-            # 验证最大长度（用于字符串、列表、字典）
-            if "max_length" in rules:
-                max_len = rules["max_length"]
-                try:
-                    if len(value) > max_len:
-                        error_msg = f"字段 '{field}' 的长度 {len(value)} 大于最大长度 {max_len}"
-                        logger.error(error_msg)
-                        raise ValidationError(error_msg)
-                except TypeError:
-                    logger.warning(f"字段 '{field}' 不支持长度校验，已跳过 max_length")
-
-            # 验证允许的值（枚举）
-            if "allowed_values" in rules:
-                allowed = rules["allowed_values"]
-                normalized_value, normalized_allowed, use_normalized = Validator._normalize_allowed_values(
-                    field, value, allowed
-                )
-                if use_normalized:
-                    if normalized_value in normalized_allowed or value in allowed:
-                        continue
-                    error_msg = f"字段 '{field}' 的值 {value} 不在允许的值列表中: {allowed}"
-                    logger.error(error_msg)
-                    raise ValidationError(error_msg)
-                else:
-                    if value not in allowed:
-                        error_msg = f"字段 '{field}' 的值 {value} 不在允许的值列表中: {allowed}"
-                        logger.error(error_msg)
-                        raise ValidationError(error_msg)
-
-        logger.info("值范围验证通过")
+        return check
+
+    def validate_required(self, row: Mapping[str, Any]) -> None:
+        """校验必填字段。"""
+        for field in self.required_fields:
+            _check_required_field(row, field)
+
+    def validate_data_types(self, row: Mapping[str, Any]) -> None:
+        """校验数据类型。"""
+        for field, checker in self.type_checks:
+            _check_field_type(row, field, checker)
+
+    def validate_value_ranges(self, row: Mapping[str, Any]) -> None:
+        """校验值范围。"""
+        for range_check in self.range_checks:
+            _check_field_range(row, range_check)
+
+
+def _check_required_field(row: Mapping[str, Any], field: str) -> None:
+    if field not in row:
+        raise ValidationError(template="必填字段 '{field}' 不存在", field=field, rule="required")
+
+    value = row[field]
+
+    # 检查值为空的情况
+    if value is None:
+        raise ValidationError(template="必填字段 '{field}' 的值为 None", field=field, rule="required")
+
+    # 检查空字符串
+    if isinstance(value, str) and not value.strip():
+        raise ValidationError(template="必填字段 '{field}' 的值为空字符串", field=field, value=value, rule="required")
+
+    # 检查空列表/字典
+    if isinstance(value, (list, dict)) and len(value) == 0:
+        raise ValidationError(
+            template="必填字段 '{field}' 的值为空 {actual_type}",
+            field=field,
+            value=value,
+            rule="required",
+            actual_type=type(value).__name__,
+        )
+
+
+def _check_field_type(row: Mapping[str, Any], field: str, checker: TypeChecker) -> None:
+    if field not in row:
+        # 字段不存在，跳过验证（可选）
+        logger.warning("字段 '%s' 不存在，跳过类型验证", field)
+        return
+
+    value = row[field]
+    if _is_blank(value):
+        logger.debug("字段 '%s' 值为空，跳过类型验证", field)
+        return
+
+    checker(field, value)
+
+
+def _check_field_range(row: Mapping[str, Any], range_check: _RangeCheck) -> None:
+    field = range_check.field
+    if field not in row:
+        # 字段不存在，跳过验证
+        logger.warning("字段 '%s' 不存在，跳过范围验证", field)
+        return
+
+    value = row[field]
+    if _is_blank(value):
+        logger.debug("字段 '%s' 值为空，跳过范围验证", field)
+        return
+
+    range_check.check(value)
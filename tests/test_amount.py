@@ -0,0 +1,99 @@
+"""amount 定点金额测试。"""
+
+from __future__ import annotations
+
+import copy
+import pickle
+from decimal import Decimal
+
+import pytest
+
+from bank_template_processing.amount import AmountAccumulator, FixedAmount
+
+
+def test_fixed_amount_keeps_exact_units():
+    amount = FixedAmount.from_decimal(Decimal("123.45"))
+
+    assert (amount.units, amount.scale) == (12345, 2)
+    assert not isinstance(amount, float)
+    assert amount.to_decimal() == Decimal("123.45")
+    assert float(amount) == 123.45
+
+
+def test_fixed_amount_formats_as_decimal_text():
+    assert str(FixedAmount(12345, 2)) == "123.45"
+    assert str(FixedAmount(-5, 3)) == "-0.005"
+    assert str(FixedAmount(1000, 0)) == "1000"
+    assert f"{FixedAmount(12345, 2):.2f}" == "123.45"
+    assert f"{FixedAmount(100, 0)}" == "100"
+    # 按四舍五入显示，而非银行家舍入或二进制浮点舍入
+    assert f"{FixedAmount(1005, 3):.2f}" == "1.01"
+    assert f"{FixedAmount(1015, 3):.2f}" == "1.02"
+
+
+def test_fixed_amount_compares_by_exact_value():
+    assert FixedAmount(100, 2) == FixedAmount(1, 0) == 1 == Decimal("1.000")
+    assert hash(FixedAmount(100, 2)) == hash(FixedAmount(1, 0)) == hash(1)
+    assert FixedAmount(15, 1) < FixedAmount(151, 2) < 2
+    assert FixedAmount(1, 1) != 0.1
+    assert not FixedAmount(0, 2)
+    with pytest.raises(TypeError):
+        FixedAmount(1, 0) + 1  # type: ignore[operator]
+
+
+def test_fixed_amount_from_decimal_handles_sign_and_positive_exponent():
+    assert FixedAmount.from_decimal(Decimal("-0.001")).to_decimal() == Decimal("-0.001")
+    assert (FixedAmount.from_decimal(Decimal("1E+3")).units, FixedAmount.from_decimal(Decimal("1E+3")).scale) == (
+        1000,
+        0,
+    )
+    with pytest.raises(ValueError, match="有限数值"):
+        FixedAmount.from_decimal(Decimal("NaN"))
+
+
+def test_fixed_amount_try_from_value():
+    amount = FixedAmount(100, 2)
+
+    assert FixedAmount.try_from_value(amount) is amount
+    assert FixedAmount.try_from_value(0.1).to_decimal() == Decimal("0.1")
+    assert FixedAmount.try_from_value("12.50").units == 1250
+    assert FixedAmount.try_from_value(True) is None
+    assert FixedAmount.try_from_value("abc") is None
+    assert FixedAmount.try_from_value("inf") is None
+    assert FixedAmount.try_from_value("1e999999999") is None
+
+
+@pytest.mark.parametrize("text", ["1e400", "1e999999999", "0e999999999", "1e-999999999", "1" * 29])
+def test_fixed_amount_from_decimal_rejects_out_of_range_values(text):
+    with pytest.raises(ValueError, match="超出支持范围"):
+        FixedAmount.from_decimal(Decimal(text))
+
+
+def test_fixed_amount_accepts_values_at_range_limits():
+    assert FixedAmount.from_decimal(Decimal("9" * 28)).units == int("9" * 28)
+    assert FixedAmount.from_decimal(Decimal("1E-28")).scale == 28
+    with pytest.raises(ValueError, match="小数位数超出支持范围"):
+        FixedAmount(1, 29)
+
+
+def test_fixed_amount_rescale_and_copy():
+    amount = FixedAmount(125, 1)
+
+    assert amount.rescale(3) == 12500
+    with pytest.raises(ValueError, match="损失精度"):
+        amount.rescale(0)
+    with pytest.raises(ValueError, match="不能为负数"):
+        FixedAmount(1, -1)
+
+    for clone in (copy.deepcopy(amount), pickle.loads(pickle.dumps(amount))):
+        assert (clone.units, clone.scale) == (125, 1)
+
+
+def test_amount_accumulator_sums_exactly_across_scales():
+    accumulator = AmountAccumulator()
+    for value in ("0.1", "0.2", 3, "1.005"):
+        accumulator.add(FixedAmount.try_from_value(value))
+
+    total = accumulator.total()
+    assert total == FixedAmount(4305, 3)
+    assert total.to_decimal() == Decimal("4.305")
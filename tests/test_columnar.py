@@ -0,0 +1,142 @@
+"""columnar 列式校验测试。"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, strategies as st
+
+import bank_template_processing.columnar as columnar
+from bank_template_processing.columnar import MISSING, find_first_invalid_row, rows_to_columns, validate_columns
+from bank_template_processing.validator import ValidationError, Validator
+
+
+RULES = {
+    "required_fields": ["姓名"],
+    "data_types": {"金额": "numeric", "日期": "date"},
+    "value_ranges": {"金额": {"min": 0, "max": 1000}, "代码": {"allowed_values": ["A", "B"]}},
+}
+
+
+def _row_major_first_error(plan, rows):
+    cross_row = plan.start_cross_row()
+    for index, row in enumerate(rows):
+        try:
+            plan.validate(row)
+            cross_row.check(row)
+        except ValidationError as exc:
+            return index, str(exc)
+    return None
+
+
+def _column_major_first_error(plan, rows):
+    columns = rows_to_columns(rows, plan.fields)
+    index = find_first_invalid_row(plan, columns, len(rows))
+    if index is None:
+        return None
+    with pytest.raises(ValidationError) as exc_info:
+        validate_columns(plan, columns, len(rows))
+    return index, str(exc_info.value)
+
+
+def test_rows_to_columns_marks_missing_fields():
+    columns = rows_to_columns([{"a": 1}, {"a": None, "b": 2}], ["a", "b"])
+
+    assert columns == {"a": [1, None], "b": [MISSING, 2]}
+
+
+def test_first_failing_row_and_message_match_row_major():
+    plan = Validator.compile(RULES)
+    rows = [
+        {"姓名": "张三", "金额": "10", "日期": "2024-01-01", "代码": "A"},
+        {"姓名": "李四", "金额": 2000, "代码": "C"},
+        {"姓名": "", "金额": "x"},
+    ]
+
+    assert _column_major_first_error(plan, rows) == (1, "字段 '金额' 的值 2000 大于最大值 1000")
+    assert _column_major_first_error(plan, rows) == _row_major_first_error(plan, rows)
+
+
+def test_missing_column_fails_required_and_skips_other_rules(caplog):
+    caplog.set_level("WARNING")
+    plan = Validator.compile({"required_fields": ["姓名"], "data_types": {"金额": "numeric"}})
+
+    assert find_first_invalid_row(plan, {"姓名": ["张三", "李四"]}, 2) is None
+    assert caplog.text.count("字段 '金额' 不存在，跳过类型验证") == 1
+    assert find_first_invalid_row(plan, {}, 2) == 0
+
+
+def test_numeric_bounds_use_vector_prefilter_when_numpy_available(monkeypatch):
+    pytest.importorskip("numpy")
+    plan = Validator.compile({"value_ranges": {"金额": {"min": "0.1", "max": 100}}})
+    checked: list[object] = []
+    original_check = plan.range_checks[0].check.__func__
+
+    def counting_check(self, value):
+        checked.append(value)
+        return original_check(self, value)
+
+    monkeypatch.setattr(type(plan.range_checks[0]), "check", counting_check)
+
+    values = [50, 0.1, 100, 99.5, 100.0000001]
+    assert find_first_invalid_row(plan, {"金额": values}, len(values)) == 4
+    # 只有落在边界上或边界外的候选值需要逐值精确比较
+    assert checked == [0.1, 100, 100.0000001]
+
+
+def test_vector_prefilter_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(columnar, "numpy", None)
+    plan = Validator.compile({"value_ranges": {"金额": {"min": 0}}})
+
+    assert find_first_invalid_row(plan, {"金额": [1, Decimal("-1")]}, 2) == 1
+    assert find_first_invalid_row(plan, {"金额": [1, -1]}, 2) == 1
+
+
+_cell_values = st.one_of(
+    st.none(),
+    st.just(""),
+    st.sampled_from(["A", "B", "C", "x", "2024-01-01", "2024-13-01", "-1", "10", "1e3", "1000.5"]),
+    st.integers(min_value=-10, max_value=2000),
+    st.floats(min_value=-10, max_value=2000, allow_nan=False),
+    st.booleans(),
+)
+
+
+@given(
+    st.lists(
+        st.dictionaries(st.sampled_from(["姓名", "金额", "日期", "代码"]), _cell_values, max_size=4),
+        max_size=8,
+    )
+)
+def test_column_major_matches_row_major(rows):
+    plan = Validator.compile(RULES)
+
+    assert _column_major_first_error(plan, rows) == _row_major_first_error(plan, rows)
+
+
+CROSS_ROW_RULES = {
+    **RULES,
+    "unique_fields": ["代码"],
+    "max_total": {"金额": 1500},
+    "max_rows_per_file": 6,
+}
+
+
+def test_cross_row_failure_reports_earliest_row():
+    plan = Validator.compile({"unique_fields": ["卡号"], "max_total": {"金额": 10}})
+    rows = [{"卡号": "1", "金额": 6}, {"卡号": "2", "金额": 5}, {"卡号": "1", "金额": 1}]
+
+    assert _column_major_first_error(plan, rows) == (1, "字段 '金额' 的累计值 11 超过上限 10")
+
+
+@given(
+    st.lists(
+        st.dictionaries(st.sampled_from(["姓名", "金额", "日期", "代码"]), _cell_values, max_size=4),
+        max_size=8,
+    )
+)
+def test_column_major_matches_row_major_with_cross_row_rules(rows):
+    plan = Validator.compile(CROSS_ROW_RULES)
+
+    assert _column_major_first_error(plan, rows) == _row_major_first_error(plan, rows)
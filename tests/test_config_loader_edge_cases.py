@@ -95,6 +95,29 @@ def test_validate_validation_rules_error_paths():
         )
 
 
+def test_validate_cross_row_rules_error_paths():
+    _validate_validation_rules(
+        "单位A",
+        {"unique_fields": ["卡号"], "max_total": {"金额": "1000000.00"}, "max_rows_per_file": 500},
+    )
+
+    with pytest.raises(ConfigError, match="unique_fields 必须是字符串列表"):
+        _validate_validation_rules("单位A", {"unique_fields": "卡号"})
+
+    with pytest.raises(ConfigError, match="max_total 必须是字典"):
+        _validate_validation_rules("单位A", {"max_total": 100})
+
+    with pytest.raises(ConfigError, match="max_total 中 '金额' 必须是数值"):
+        _validate_validation_rules("单位A", {"max_total": {"金额": "2024-01-01"}})
+
+    with pytest.raises(ConfigError, match="max_total 中 '金额' 无效"):
+        _validate_validation_rules("单位A", {"max_total": {"金额": True}})
+
+    for invalid in (0, "500", True):
+        with pytest.raises(ConfigError, match="max_rows_per_file 必须是正整数"):
+            _validate_validation_rules("单位A", {"max_rows_per_file": invalid})
+
+
 def test_validate_legacy_unit_config_error_paths():
     base = make_basic_unit_config(template_path="a.xlsx", field_mappings={"姓名": {"source_column": "姓名"}})
 
@@ -184,6 +207,64 @@ def test_validate_template_selector_error_paths():
         _validate_template_selector("单位A", {"special_template": []})
 
 
+def test_validate_template_selector_routes_error_paths():
+    unit_config = {"default": {}, "crossbank": {}, "icbc": {}}
+    base = {"enabled": True, "default_bank": "中国农业银行"}
+
+    _validate_template_selector("单位A", {**base, "routes": {"中国工商银行": "icbc", "工行": "icbc"}}, unit_config)
+
+    with pytest.raises(ConfigError, match="template_selector.routes 必须是字典"):
+        _validate_template_selector("单位A", {**base, "routes": []}, unit_config)
+    with pytest.raises(ConfigError, match="routes 的银行名称必须是非空字符串"):
+        _validate_template_selector("单位A", {**base, "routes": {" ": "icbc"}}, unit_config)
+    with pytest.raises(ConfigError, match=r"routes\['中国工商银行'\] 必须是非空字符串"):
+        _validate_template_selector("单位A", {**base, "routes": {"中国工商银行": 1}}, unit_config)
+    with pytest.raises(ConfigError, match="不能引用保留字段: special"):
+        _validate_template_selector("单位A", {**base, "routes": {"中国工商银行": "special"}}, unit_config)
+    with pytest.raises(ConfigError, match="规则组 'ccb' 未在单位配置中定义"):
+        _validate_template_selector("单位A", {**base, "routes": {"中国建设银行": "ccb"}}, unit_config)
+    with pytest.raises(ConfigError, match="同时指向规则组 'default' 和 'icbc'"):
+        _validate_template_selector("单位A", {**base, "routes": {"中国农业银行　": "icbc"}}, unit_config)
+
+
+def test_validate_template_selector_routes_resolves_bank_aliases():
+    unit_config = {"default": {}, "crossbank": {}, "icbc": {}}
+    aliases = {"中国工商银行": ["工行", "工商银行*"], "中国农业银行": ["农行"]}
+    base = {"enabled": True, "default_bank": "中国农业银行", "bank_aliases": aliases}
+
+    _validate_template_selector("单位A", {**base, "routes": {"工行": "icbc", "工商银行北京分行": "icbc"}}, unit_config)
+
+    with pytest.raises(ConfigError, match="银行 '工商银行北京分行'（标准名称 '中国工商银行'）同时指向规则组 'icbc' 和 'crossbank'"):
+        _validate_template_selector(
+            "单位A", {**base, "routes": {"工行": "icbc", "工商银行北京分行": "crossbank"}}, unit_config
+        )
+    with pytest.raises(ConfigError, match="银行 '农行'（标准名称 '中国农业银行'）同时指向规则组 'default' 和 'icbc'"):
+        _validate_template_selector("单位A", {**base, "routes": {"农行": "icbc"}}, unit_config)
+
+
+def test_validate_template_selector_bank_aliases_error_paths():
+    base = {"enabled": True, "default_bank": "中国农业银行"}
+
+    _validate_template_selector("单位A", {**base, "bank_aliases": {"中国农业银行": ["农行", "农业银行*", "*农行"]}})
+
+    with pytest.raises(ConfigError, match="template_selector.bank_aliases 必须是字典"):
+        _validate_template_selector("单位A", {**base, "bank_aliases": ["农行"]})
+    with pytest.raises(ConfigError, match="bank_aliases 的银行名称必须是非空字符串"):
+        _validate_template_selector("单位A", {**base, "bank_aliases": {"": ["农行"]}})
+    with pytest.raises(ConfigError, match=r"bank_aliases\['中国农业银行'\] 必须是列表"):
+        _validate_template_selector("单位A", {**base, "bank_aliases": {"中国农业银行": "农行"}})
+    with pytest.raises(ConfigError, match="中的别名必须是非空字符串"):
+        _validate_template_selector("单位A", {**base, "bank_aliases": {"中国农业银行": [" "]}})
+    for pattern in ["*", "*农行*", "农*行"]:
+        with pytest.raises(ConfigError, match="只能在开头或结尾使用一个"):
+            _validate_template_selector("单位A", {**base, "bank_aliases": {"中国农业银行": [pattern]}})
+    with pytest.raises(ConfigError, match="别名 '农行' 同时指向 '中国农业银行' 和 '中国工商银行'"):
+        _validate_template_selector(
+            "单位A",
+            {**base, "bank_aliases": {"中国农业银行": ["农行"], "中国工商银行": ["农行"]}},
+        )
+
+
 def test_validate_config_rejects_invalid_template_selector():
     with pytest.raises(ConfigError, match="template_selector.bank_column 必须是非空字符串"):
         validate_config(
@@ -0,0 +1,43 @@
+"""error_report 数据错误收集测试。"""
+
+from __future__ import annotations
+
+import csv
+
+import pytest
+
+from bank_template_processing.error_report import ErrorCollector, Violation
+
+
+def _violation(row_number: int) -> Violation:
+    return Violation("数据校验", row_number, "金额", "data_types", "abc", f"第{row_number}行错误", "单位=单位A")
+
+
+def test_collector_keeps_at_most_limit_violations():
+    errors = ErrorCollector(limit=2)
+    for row_number in range(1, 5):
+        errors.add(_violation(row_number))
+
+    assert len(errors) == 4
+    assert errors.omitted == 2
+    assert [violation.row_number for violation in errors] == [1, 2]
+    assert errors.summary("report.csv") == "共发现 4 处数据错误（报告记录前 2 处），详见报告：report.csv"
+
+
+def test_collector_rejects_non_positive_limit():
+    with pytest.raises(ValueError, match="正整数"):
+        ErrorCollector(limit=0)
+
+
+def test_write_report_outputs_compact_csv(tmp_path):
+    errors = ErrorCollector(limit=1)
+    errors.add(_violation(3))
+    errors.add(Violation("数据转换", None, None, "card_number", None, "卡号无效"))
+
+    report_path = errors.write_report(tmp_path / "nested" / "report.csv")
+
+    with report_path.open(encoding="utf-8-sig", newline="") as report_file:
+        rows = list(csv.reader(report_file))
+    assert rows[0] == ["阶段", "位置", "行号", "字段", "规则", "值", "错误信息"]
+    assert rows[1] == ["数据校验", "单位=单位A", "3", "金额", "data_types", "abc", "第3行错误"]
+    assert rows[2][-1] == "另有 1 处错误超过记录上限 1，未写入报告"
@@ -0,0 +1,69 @@
+"""errors 结构化数据错误测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from bank_template_processing.errors import DataError
+from bank_template_processing.pipeline import ProcessingContext, enrich_error_context
+from bank_template_processing.transformer import TransformError, Transformer
+from bank_template_processing.validator import ValidationError, Validator
+
+
+class CountingValue:
+    def __init__(self) -> None:
+        self.formatted = 0
+
+    def __format__(self, spec: str) -> str:
+        self.formatted += 1
+        return "计数值"
+
+
+def test_template_message_is_formatted_lazily_once():
+    value = CountingValue()
+    error = ValidationError(template="字段 '{field}' 的值 {value} 无效", field="金额", value=value, rule="min")
+
+    assert value.formatted == 0
+    assert str(error) == "字段 '金额' 的值 计数值 无效"
+    assert error.message == str(error)
+    assert value.formatted == 1
+    assert (error.field, error.value, error.rule, error.row) == ("金额", value, "min", None)
+
+
+def test_construction_does_not_log(caplog):
+    caplog.set_level("DEBUG")
+
+    with pytest.raises(ValidationError):
+        Validator.validate_value_ranges({"金额": 5}, {"金额": {"max": 1}})
+    with pytest.raises(TransformError):
+        Transformer().transform_amount("abc")
+
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_errors_carry_structured_fields():
+    with pytest.raises(ValidationError) as validation_info:
+        Validator.validate_value_ranges({"代码": "C"}, {"代码": {"allowed_values": ["A", "B"]}})
+    with pytest.raises(TransformError) as transform_info:
+        Transformer().transform_card_number("123")
+
+    assert (validation_info.value.field, validation_info.value.rule) == ("代码", "allowed_values")
+    assert str(validation_info.value) == "字段 '代码' 的值 C 不在允许的值列表中: ['A', 'B']"
+    assert (transform_info.value.value, transform_info.value.rule) == ("123", "card_number")
+
+
+def test_enrich_error_context_keeps_structured_fields():
+    error = ValidationError(template="字段 '{field}' 为空", field="姓名", rule="required")
+
+    enriched = enrich_error_context(error, "数据校验", ProcessingContext(unit_name="单位A"), 3)
+
+    assert isinstance(enriched, ValidationError)
+    assert str(enriched) == "数据校验失败（单位=单位A，第3条数据）：字段 '姓名' 为空"
+    assert (enriched.field, enriched.rule, enriched.row) == ("姓名", "required", 3)
+
+
+def test_plain_message_is_kept_verbatim():
+    error = DataError("包含 {花括号} 的消息")
+
+    assert str(error) == "包含 {花括号} 的消息"
+    assert error.args == ("包含 {花括号} 的消息",)
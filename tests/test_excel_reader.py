@@ -160,3 +160,26 @@ class TestExcelReader:
 
         with pytest.raises(ExcelError, match="不支持的文件格式"):
             ExcelReader().read_excel(str(file_path))
+
+    def test_iter_excel_yields_same_rows_as_read_excel(self):
+        """测试逐行读取与整体读取结果一致"""
+        reader = ExcelReader()
+        for file_path in ("tests/fixtures/test_input.xlsx", "tests/fixtures/test_input.xls"):
+            rows = reader.iter_excel(file_path)
+
+            assert not isinstance(rows, list)
+            assert list(rows) == reader.read_excel(file_path)
+
+    def test_iter_excel_checks_file_eagerly_and_wraps_read_errors(self, tmp_path):
+        """测试逐行读取时文件检查立即执行，读取错误在迭代时包装为 ExcelError"""
+        with pytest.raises(FileNotFoundError):
+            ExcelReader().iter_excel(str(tmp_path / "missing.xlsx"))
+        with pytest.raises(ExcelError, match="不支持的文件格式"):
+            (tmp_path / "input.csv").write_text("姓名\n", encoding="utf-8")
+            ExcelReader().iter_excel(str(tmp_path / "input.csv"))
+
+        invalid_path = tmp_path / "invalid.xlsx"
+        invalid_path.write_text("This is not a valid Excel file", encoding="utf-8")
+        rows = ExcelReader().iter_excel(str(invalid_path))
+        with pytest.raises(ExcelError):
+            next(rows)
@@ -2,8 +2,10 @@
 
 import openpyxl
 import pytest
+import xlrd
 
-from bank_template_processing.excel_writer import ExcelError, ExcelWriter
+import bank_template_processing.excel_writer as excel_writer_module
+from bank_template_processing.excel_writer import ExcelError, ExcelWriter, TemplateStream
 from tests.spreadsheet_factories import write_xls_rows, write_xlsx_rows
 
 
@@ -716,3 +718,81 @@ class TestExcelWriter:
         assert ws_result.cell(1, 2).font.bold  # 表头格式被保留
 
         wb_result.close()
+
+
+class TestTemplateStream:
+    """ExcelWriter.open_stream 分批写出的测试用例"""
+
+    @staticmethod
+    def _sheet_values(path):
+        workbook = openpyxl.load_workbook(path)
+        values = [list(row) for row in workbook.active.iter_rows(values_only=True)]
+        workbook.close()
+        return values
+
+    def test_stream_subclass_must_implement_write_and_save(self):
+        """未实现写出或保存的子类在实例化时即报错"""
+
+        class Incomplete(TemplateStream):
+            def _save(self):
+                pass
+
+        with pytest.raises(TypeError, match="abstract method '_write_projection'"):
+            Incomplete(lambda _row: None, "template.xlsx", "out.xlsx", 2)
+
+    @pytest.mark.parametrize("row_count", [1, 2, 7])
+    def test_xlsx_stream_matches_write_excel(self, tmp_path, monkeypatch, row_count):
+        """数据区不足时分批预留行，结果与一次性写出相同"""
+        monkeypatch.setattr(excel_writer_module, "STREAM_RESERVE_ROWS", 2)
+        template_path = write_xlsx_rows(
+            tmp_path / "template.xlsx",
+            [["序号", "姓名"], [None, "旧数据1"], [None, "旧数据2"], ["合计", None], ["制表人", None]],
+        )
+        data = [{"姓名": f"员工{index}"} for index in range(row_count)]
+        options = {
+            "template_path": str(template_path),
+            "field_mappings": {"姓名": {"source_column": "姓名"}},
+            "header_row": 1,
+            "start_row": 2,
+            "mapping_mode": "column_name",
+            "auto_number": {"enabled": True, "column_name": "序号", "start_from": 1},
+            "clear_rows": {"start_row": 2, "end_row": 3},
+        }
+
+        ExcelWriter().write_excel(data=data, output_path=str(tmp_path / "expected.xlsx"), **options)
+        stream = ExcelWriter().open_stream(output_path=str(tmp_path / "streamed.xlsx"), **options)
+        for start in range(0, row_count, 3):
+            stream.write_rows(data[start : start + 3])
+        stream.save()
+
+        assert stream.row_count == row_count
+        assert self._sheet_values(tmp_path / "streamed.xlsx") == self._sheet_values(tmp_path / "expected.xlsx")
+
+    def test_xls_stream_writes_rows_and_rejects_overflow(self, tmp_path):
+        """XLS 写出流与 write_excel 一致：数据区不足时报错"""
+        from bank_template_processing.config_loader import ConfigError
+
+        template_path = write_xls_rows(tmp_path / "template.xls", [["姓名"], ["旧数据1"]])
+        options = {
+            "template_path": str(template_path),
+            "field_mappings": {"姓名": {"source_column": "姓名"}},
+            "header_row": 1,
+            "start_row": 2,
+            "mapping_mode": "column_name",
+        }
+
+        stream = ExcelWriter().open_stream(output_path=str(tmp_path / "output.xls"), **options)
+        stream.write_rows([{"姓名": "张三"}])
+        stream.write_rows([{"姓名": "李四"}])
+        stream.save()
+        sheet = xlrd.open_workbook(str(tmp_path / "output.xls")).sheet_by_index(0)
+        assert [sheet.cell_value(row, 0) for row in range(sheet.nrows)] == ["姓名", "张三", "李四"]
+
+        stream = ExcelWriter().open_stream(
+            output_path=str(tmp_path / "overflow.xls"),
+            clear_rows={"start_row": 2, "end_row": 2},
+            **options,
+        )
+        stream.write_rows([{"姓名": "张三"}])
+        with pytest.raises(ConfigError, match="clear_rows 范围不足"):
+            stream.write_rows([{"姓名": "李四"}])
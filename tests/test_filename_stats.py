@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 import pytest
 
 from bank_template_processing.main import ValidationError, generate_output_filename, _calculate_stats
@@ -74,3 +76,21 @@ def test_generate_output_filename_with_custom_template_ext_placeholder():
 
     expected = "TestUnit_TemplateA.xlsx"
     assert filename == expected
+
+
+def test_calculate_stats_sums_amounts_exactly():
+    data = [{"金额": 0.1}, {"金额": "0.2"}, {"金额": "1,000.10"}, {"金额": ""}]
+    field_mappings = {"模板金额列": {"source_column": "金额", "transform": "amount_decimal"}}
+
+    count, amount = _calculate_stats(data, field_mappings, {})
+
+    assert count == 4
+    assert amount.to_decimal() == Decimal("1000.40")
+
+
+@pytest.mark.parametrize("value", ["1e400", "1e999999999", 1e300])
+def test_calculate_stats_rejects_out_of_range_amount(value):
+    field_mappings = {"模板金额列": {"source_column": "金额", "transform": "amount_decimal"}}
+
+    with pytest.raises(ValidationError, match="金额统计字段 '金额' 的值无法解析为数值"):
+        _calculate_stats([{"金额": value}], field_mappings, {})
@@ -3,6 +3,7 @@
 """
 
 import sys
+from decimal import Decimal
 from pathlib import Path
 
 import pytest
@@ -159,10 +160,10 @@ class TestDataTransformation:
         transformer = Transformer()
 
         result = transformer.transform_amount("1000.50", 2)
-        assert result == 1000.50
+        assert result == Decimal("1000.50")
 
         result = transformer.transform_amount(2000, 2)
-        assert result == 2000.00
+        assert result == Decimal("2000.00")
 
     def test_card_number_transformation(self):
         """测试卡号转换"""
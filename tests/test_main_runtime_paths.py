@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import json
 import logging
 import sys
+from decimal import Decimal
 from pathlib import Path
 from types import SimpleNamespace
 from typing import TypedDict
 
+import openpyxl
 import pytest
 
 from bank_template_processing import main as main_module
 from bank_template_processing import pipeline as pipeline_module
+from tests.spreadsheet_factories import write_xlsx_rows
 
 
 class FieldMappingEntry(TypedDict, total=False):
@@ -248,7 +253,43 @@ def test_prepare_group_rows_transforms_before_type_validation():
 
     assert prepared_rows[0]["工资卡卡号"] == "6222021234567890128"
     assert count == 1
-    assert amount == 0.0
+    assert amount == 0
+
+
+def test_prepare_group_rows_transforms_in_place_without_copying_group():
+    context = main_module.ProcessingContext(unit_name="单位A", rule_group="default", template_name="模板A")
+    group_config = _make_amount_rule_group_config()
+    data = [{"实发工资": "100.456"}, {"实发工资": "20"}]
+
+    prepared_rows, count, amount = main_module._prepare_group_rows(
+        data, group_config, context, logging.getLogger(__name__)
+    )
+
+    assert prepared_rows is data
+    assert [row["实发工资"] for row in data] == [Decimal("100.46"), Decimal("20.0")]
+    assert (count, amount) == (2, Decimal("120.46"))
+
+
+def test_write_output_group_uses_prepared_stats(monkeypatch, tmp_path):
+    captured = {}
+    monkeypatch.setattr(
+        main_module,
+        "_calculate_stats",
+        lambda *_args: pytest.fail("写出时不应重新统计"),
+    )
+    monkeypatch.setattr(
+        main_module,
+        "process_group",
+        lambda data, _cfg, _template, output_path, _month, _logger: captured.update(data=data, path=output_path),
+    )
+    rows = [{"实发工资": 1.0}]
+
+    main_module._write_output_group(
+        rows, 3, 12.5, {}, "单位A", "01", None, "模板A.xlsx", tmp_path, None, logging.getLogger(__name__)
+    )
+
+    expected = main_module.generate_output_filename("单位A", "01", None, "模板A.xlsx", 3, 12.5, None)
+    assert captured == {"data": rows, "path": tmp_path / expected}
 
 
 def test_prepare_group_rows_validates_ranges_after_transform():
@@ -341,6 +382,187 @@ def test_main_non_selector_runtime_paths_and_validation(monkeypatch, tmp_path):
     assert captured["process_called"] is True
 
 
+def test_main_collect_errors_writes_report_and_fails_once(monkeypatch, tmp_path):
+    args = _make_runtime_args(tmp_path)
+    args.collect_errors = 5
+    default_cfg = _make_amount_rule_group_config()
+    config = {"version": "2.0", "organization_units": {"单位A": default_cfg}}
+    captured = {"process_called": False}
+
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    monkeypatch.setattr(main_module, "get_unit_config", lambda _cfg, _unit, _key=None: default_cfg)
+    monkeypatch.setattr(
+        main_module,
+        "ExcelReader",
+        lambda **_kwargs: SimpleNamespace(read_excel=lambda _p: [{"实发工资": "abc"}, {"实发工资": "-5"}]),
+    )
+    monkeypatch.setattr(
+        main_module,
+        "process_group",
+        lambda *_args, **_kwargs: captured.__setitem__("process_called", True),
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        main_module.main([])
+
+    assert exc_info.value.code == 1
+    assert captured["process_called"] is False
+    report_lines = (tmp_path / "out" / "数据错误报告.csv").read_text(encoding="utf-8-sig").splitlines()
+    # abc：转换失败、类型校验失败、范围校验失败；-5：范围校验失败
+    assert len(report_lines) == 1 + 4
+    assert [line.split(",")[2] for line in report_lines[1:]] == ["1", "1", "1", "2"]
+
+
+def test_main_row_cache_reuses_rows_from_previous_run(monkeypatch, tmp_path, caplog):
+    caplog.set_level("INFO")
+    args = _make_runtime_args(tmp_path)
+    args.row_cache = str(tmp_path / "cache")
+    default_cfg = _make_amount_rule_group_config()
+    config = {"version": "2.0", "organization_units": {"单位A": default_cfg}}
+    written: list[list[dict]] = []
+    inputs = [[{"实发工资": "100"}, {"实发工资": "20"}], [{"实发工资": "100"}, {"实发工资": "30"}]]
+
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    monkeypatch.setattr(main_module, "get_unit_config", lambda _cfg, _unit, _key=None: default_cfg)
+    monkeypatch.setattr(
+        main_module,
+        "ExcelReader",
+        lambda **_kwargs: SimpleNamespace(read_excel=lambda _p: inputs.pop(0)),
+    )
+    monkeypatch.setattr(main_module, "process_group", lambda rows, *_args, **_kwargs: written.append(rows))
+
+    main_module.main([])
+    main_module.main([])
+
+    assert [[row["实发工资"] for row in rows] for rows in written] == [
+        [Decimal("100.00"), Decimal("20.00")],
+        [Decimal("100.00"), Decimal("30.00")],
+    ]
+    assert (tmp_path / "cache" / "单位A_default.pkl").exists()
+    assert "增量处理：复用 1 行，重新处理 1 行；与上次相比新增 0 行，删除 0 行，变更 1 行" in caplog.text
+
+
+def test_collect_errors_cli_option_parsing():
+    assert main_module.parse_args(["a.xlsx", "单位", "01"]).collect_errors is None
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--collect-errors"]).collect_errors == 100
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--collect-errors=7"]).collect_errors == 7
+    with pytest.raises(SystemExit):
+        main_module.parse_args(["a.xlsx", "单位", "01", "--collect-errors=0"])
+
+    args = main_module.parse_args(["--merge-folder", "out", "--collect-errors"])
+    with pytest.raises(ValueError, match="--collect-errors 仅支持普通模式"):
+        main_module.validate_cli_mode_args(args)
+
+
+def _patch_check_mode(monkeypatch, tmp_path, args, config, rows):
+    input_path = write_xlsx_rows(tmp_path / "input.xlsx", rows)
+    args.excel_path = str(input_path)
+    args.check = True
+    calls = {"write": 0}
+
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    monkeypatch.setattr(
+        main_module,
+        "process_group",
+        lambda *_args, **_kwargs: calls.__setitem__("write", calls["write"] + 1),
+    )
+    return calls
+
+
+def test_main_check_mode_reports_group_stats_without_writing(monkeypatch, tmp_path, caplog):
+    caplog.set_level("INFO")
+    args = _make_runtime_args(tmp_path)
+    base_group_cfg = _make_amount_rule_group_config()
+    config = {
+        "version": "2.0",
+        "organization_units": {
+            "单位A": {
+                "template_selector": {
+                    "enabled": True,
+                    "default_bank": "A",
+                    "bank_column": "开户银行",
+                    "special_group_name": "跨行",
+                },
+                "default": dict(base_group_cfg),
+                "crossbank": {**base_group_cfg, "template_path": "templates/crossbank.xlsx"},
+            }
+        },
+    }
+    rows = [
+        ["开户银行", "实发工资"],
+        ["A", "100.10"],
+        ["Ｂ", "0"],
+        ["B", "20"],
+        ["A", "0.20"],
+    ]
+    calls = _patch_check_mode(monkeypatch, tmp_path, args, config, rows)
+
+    main_module.main([])
+
+    assert calls["write"] == 0
+    assert not (tmp_path / "out").exists()
+    assert "实发工资零值筛选完成：原始 4 行，过滤 1 行，保留 3 行" in caplog.text
+    assert "检查结果（单位=单位A，规则组=default，模板=default）：2 人，金额 100.30，数据错误 0 处" in caplog.text
+    assert "检查结果（单位=单位A，规则组=crossbank，模板=跨行）：1 人，金额 20.00，数据错误 0 处" in caplog.text
+    assert "检查通过：共 2 个分组，3 行数据" in caplog.text
+
+
+def test_main_check_mode_collects_errors_and_fails(monkeypatch, tmp_path):
+    args = _make_runtime_args(tmp_path)
+    default_cfg = _make_amount_rule_group_config(
+        validation_rules={"data_types": {"实发工资": "numeric"}, "max_rows_per_file": 1}
+    )
+    config = {"version": "2.0", "organization_units": {"单位A": {"default": default_cfg}}}
+    calls = _patch_check_mode(monkeypatch, tmp_path, args, config, [["实发工资"], ["abc"], ["5"]])
+
+    with pytest.raises(SystemExit) as exc_info:
+        main_module.main([])
+
+    assert exc_info.value.code == 1
+    assert calls["write"] == 0
+    report_lines = (tmp_path / "out" / "数据错误报告.csv").read_text(encoding="utf-8-sig").splitlines()
+    # abc：转换失败、类型校验失败；第 2 行超过单文件行数上限
+    assert [line.split(",")[2:5] for line in report_lines[1:]] == [
+        ["1", "实发工资", "amount_decimal"],
+        ["1", "实发工资", "numeric"],
+        ["2", "", "max_rows_per_file"],
+    ]
+
+
+def test_check_cli_option_parsing():
+    assert main_module.parse_args(["a.xlsx", "单位", "01"]).check is False
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--check"]).check is True
+
+    args = main_module.parse_args(["--merge-folder", "out", "--check"])
+    with pytest.raises(ValueError, match="--check 仅支持普通模式"):
+        main_module.validate_cli_mode_args(args)
+
+
+def test_row_cache_cli_option_parsing():
+    assert main_module.parse_args(["a.xlsx", "单位", "01"]).row_cache is None
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--row-cache", "cache"]).row_cache == "cache"
+
+    args = main_module.parse_args(["--merge-folder", "out", "--row-cache", "cache"])
+    with pytest.raises(ValueError, match="--row-cache 仅支持普通模式"):
+        main_module.validate_cli_mode_args(args)
+
+    args = main_module.parse_args(["a.xlsx", "单位", "01", "--check", "--row-cache", "cache"])
+    with pytest.raises(ValueError, match="--row-cache 不能与 --check 同时使用"):
+        main_module.validate_cli_mode_args(args)
+
+
 def test_main_dynamic_selector_paths_with_template_fallback_and_transform(monkeypatch, tmp_path):
     args = _make_runtime_args(tmp_path)
 
@@ -407,6 +629,281 @@ def test_main_dynamic_selector_paths_with_template_fallback_and_transform(monkey
     assert called["process"] == 2
 
 
+def test_main_selector_routes_write_one_file_per_rule_group(monkeypatch, tmp_path):
+    args = _make_runtime_args(tmp_path)
+    base_group_cfg = _make_amount_rule_group_config()
+    config = {
+        "version": "2.0",
+        "organization_units": {
+            "单位A": {
+                "template_selector": {
+                    "enabled": True,
+                    "default_bank": "农业银行",
+                    "special_group_name": "跨行",
+                    "routes": {"工商银行": "icbc", "建设银行": "ccb"},
+                },
+                "default": dict(base_group_cfg),
+                "crossbank": {**base_group_cfg, "template_path": "templates/跨行.xlsx"},
+                "icbc": {**base_group_cfg, "template_path": "templates/工行.xlsx"},
+                "ccb": {**base_group_cfg, "template_path": "templates/建行.xlsx"},
+            }
+        },
+    }
+    rows = [
+        {"实发工资": "1", "开户银行": "工商银行"},
+        {"实发工资": "2", "开户银行": "农业银行"},
+        {"实发工资": "3", "开户银行": "招商银行"},
+        {"实发工资": "4", "开户银行": "工商银行"},
+    ]
+    written: dict[str, list[object]] = {}
+
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    monkeypatch.setattr(main_module, "ExcelReader", lambda **_kwargs: SimpleNamespace(read_excel=lambda _p: rows))
+    monkeypatch.setattr(
+        main_module,
+        "process_group",
+        lambda data, _cfg, _template, output_path, *_args: written.__setitem__(
+            Path(output_path).name, [row["实发工资"] for row in data]
+        ),
+    )
+
+    main_module.main([])
+
+    assert written == {
+        "单位A_default_1人_金额2.00元.xlsx": [Decimal("2.0")],
+        "单位A_跨行_1人_金额3.00元.xlsx": [Decimal("3.0")],
+        "单位A_工行_2人_金额5.00元.xlsx": [Decimal("1.0"), Decimal("4.0")],
+    }
+
+
+def test_main_selector_spill_mode_streams_input_and_writes_each_group(monkeypatch, tmp_path, caplog):
+    caplog.set_level("INFO")
+    args = _make_runtime_args(tmp_path)
+    args.excel_path = str(
+        write_xlsx_rows(
+            tmp_path / "input.xlsx",
+            [["开户银行", "实发工资"], ["A", "1"], ["B", "2"], ["A", "0"], ["A", "3"], ["B", "4"]],
+        )
+    )
+    args.spill_threshold = 1
+    base_group_cfg = _make_amount_rule_group_config()
+    config = {
+        "version": "2.0",
+        "organization_units": {
+            "单位A": {
+                "template_selector": {"enabled": True, "default_bank": "A", "special_group_name": "跨行"},
+                "default": dict(base_group_cfg),
+                "crossbank": {**base_group_cfg, "template_path": "templates/跨行.xlsx"},
+            }
+        },
+    }
+    written: dict[str, list[object]] = {}
+
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    monkeypatch.setattr(
+        main_module,
+        "process_group",
+        lambda data, _cfg, _template, output_path, *_args: written.__setitem__(
+            Path(output_path).name, [row["实发工资"] for row in data]
+        ),
+    )
+
+    main_module.main([])
+
+    assert written == {
+        "单位A_default_2人_金额4.00元.xlsx": [Decimal("1.0"), Decimal("3.0")],
+        "单位A_跨行_2人_金额6.00元.xlsx": [Decimal("2.0"), Decimal("4.0")],
+    }
+    assert "实发工资零值筛选完成：原始 5 行，过滤 1 行，保留 4 行" in caplog.text
+    assert "溢写到临时文件 4 行" in caplog.text
+
+
+def test_spill_threshold_cli_option_parsing():
+    assert main_module.parse_args(["a.xlsx", "单位", "01"]).spill_threshold is None
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--spill-threshold", "5000"]).spill_threshold == 5000
+    with pytest.raises(SystemExit):
+        main_module.parse_args(["a.xlsx", "单位", "01", "--spill-threshold", "0"])
+
+    args = main_module.parse_args(["--merge-folder", "out", "--spill-threshold", "10"])
+    with pytest.raises(ValueError, match="--spill-threshold 仅支持普通模式"):
+        main_module.validate_cli_mode_args(args)
+
+
+def _patch_stream_mode(monkeypatch, tmp_path, input_rows, **arg_overrides):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    for name in ("default", "跨行"):
+        write_xlsx_rows(templates / f"{name}.xlsx", [["金额"], ["旧数据"], ["合计"]])
+    args = _make_runtime_args(tmp_path)
+    args.excel_path = str(write_xlsx_rows(tmp_path / "input.xlsx", [["开户银行", "实发工资"], *input_rows]))
+    args.stream = 2
+    vars(args).update(arg_overrides)
+    base_group_cfg = _make_amount_rule_group_config(clear_rows={"start_row": 2, "end_row": 2})
+    config = {
+        "version": "2.0",
+        "organization_units": {
+            "单位A": {
+                "template_selector": {"enabled": True, "default_bank": "A", "special_group_name": "跨行"},
+                "default": dict(base_group_cfg),
+                "crossbank": {**base_group_cfg, "template_path": "templates/跨行.xlsx"},
+            }
+        },
+    }
+    monkeypatch.setattr(main_module, "setup_logging", lambda: None)
+    monkeypatch.setattr(main_module, "parse_args", lambda _argv=None: args)
+    monkeypatch.setattr(main_module, "get_executable_dir", lambda: tmp_path)
+    monkeypatch.setattr(main_module, "load_config", lambda _path: config)
+    monkeypatch.setattr(main_module, "validate_config", lambda _cfg: None)
+    return Path(args.output_dir)
+
+
+def test_main_stream_mode_writes_groups_and_renames_by_stats(monkeypatch, tmp_path):
+    output_dir = _patch_stream_mode(
+        monkeypatch,
+        tmp_path,
+        [["A", "1"], ["B", "2"], ["A", "0"], ["A", "3"], ["B", "4.5"], ["A", "5"]],
+    )
+    monkeypatch.setattr(
+        main_module,
+        "_read_input_rows",
+        lambda *_args: pytest.fail("流式模式不应读取完整输入"),
+    )
+
+    main_module.main([])
+
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "单位A_default_3人_金额9.00元.xlsx",
+        "单位A_跨行_2人_金额6.50元.xlsx",
+    ]
+    sheet = openpyxl.load_workbook(output_dir / "单位A_default_3人_金额9.00元.xlsx").active
+    assert [row[0] for row in sheet.iter_rows(values_only=True)] == ["金额", 1, 3, 5, "合计"]
+
+
+def test_main_stream_mode_rejects_missing_salary_column_before_routing(monkeypatch, tmp_path, caplog):
+    output_dir = _patch_stream_mode(monkeypatch, tmp_path, [["A", "1"], ["B", "2"]])
+    write_xlsx_rows(Path(main_module.parse_args().excel_path), [["开户银行", "金额"], ["A", "1"], ["B", "2"]])
+    monkeypatch.setattr(
+        main_module.TemplateSelector,
+        "row_classifier",
+        lambda *_args: lambda *_row: pytest.fail("缺少实发工资列时不应分类任何行"),
+    )
+
+    with pytest.raises(SystemExit):
+        main_module.main([])
+
+    assert "零工资筛选失败（单位=单位A" in caplog.text
+    assert "缺少'实发工资'列" in caplog.text
+    assert list(output_dir.iterdir()) == []
+
+
+def test_main_stream_mode_reports_first_error_and_leaves_no_files(monkeypatch, tmp_path, caplog):
+    # 第 1 行转换失败、第 3 行转换前校验失败：与普通模式一样报告转换前校验错误
+    output_dir = _patch_stream_mode(
+        monkeypatch,
+        tmp_path,
+        [["A", "abc"], ["B", "2"], ["A", None], ["B", "4"]],
+    )
+    with pytest.raises(SystemExit):
+        main_module.main([])
+
+    assert "数据校验失败（单位=单位A，规则组=default，模板=default，第2条数据）" in caplog.text
+    assert list(output_dir.iterdir()) == []
+
+
+def test_stream_cli_option_parsing():
+    assert main_module.parse_args(["a.xlsx", "单位", "01"]).stream is None
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--stream"]).stream == main_module.DEFAULT_STREAM_BATCH_ROWS
+    assert main_module.parse_args(["a.xlsx", "单位", "01", "--stream", "50"]).stream == 50
+
+    args = main_module.parse_args(["a.xlsx", "单位", "01", "--stream", "--check"])
+    with pytest.raises(ValueError, match="--stream 不能与 --check 同时使用"):
+        main_module.validate_cli_mode_args(args)
+    args = main_module.parse_args(["--merge-folder", "out", "--stream"])
+    with pytest.raises(ValueError, match="--stream 仅支持普通模式"):
+        main_module.validate_cli_mode_args(args)
+
+
+@pytest.mark.parametrize(
+    ("stream", "expected_stages"),
+    [
+        (None, ["读取", "零工资筛选", "分组", "数据校验", "数据转换", "模板加载", "填充", "保存"]),
+        (2, ["读取", "模板加载", "数据校验", "数据转换", "填充", "保存"]),
+    ],
+)
+def test_main_timings_reports_stages_and_writes_json(monkeypatch, tmp_path, caplog, stream, expected_stages):
+    json_path = tmp_path / "timings" / "run.json"
+    _patch_stream_mode(
+        monkeypatch,
+        tmp_path,
+        [["A", "1"], ["B", "2"], ["A", "0"], ["A", "3"]],
+        stream=stream,
+        timings_json=str(json_path),
+    )
+    caplog.set_level(logging.INFO)
+
+    main_module.main([])
+
+    report = json.loads(json_path.read_text(encoding="utf-8"))
+    stages = {item["name"]: item for item in report["stages"]}
+    assert set(expected_stages) <= set(stages)
+    assert stages["读取"]["rows_out"] == 4
+    assert stages["保存"]["rows_in"] == 3
+    assert sum(item["wall_seconds"] for item in report["stages"]) <= report["total"]["wall_seconds"]
+    if stream is None:
+        assert (stages["零工资筛选"]["rows_in"], stages["零工资筛选"]["rows_out"]) == (4, 3)
+    assert "阶段计时：" in caplog.text
+
+
+def test_main_timings_reports_stages_when_processing_fails(monkeypatch, tmp_path, caplog):
+    json_path = tmp_path / "timings.json"
+    _patch_stream_mode(monkeypatch, tmp_path, [["A", "1"], ["A", "abc"]], stream=None, timings_json=str(json_path))
+    caplog.set_level(logging.INFO)
+
+    with pytest.raises(SystemExit):
+        main_module.main([])
+
+    stages = {item["name"] for item in json.loads(json_path.read_text(encoding="utf-8"))["stages"]}
+    assert {"读取", "数据转换"} <= stages
+    assert caplog.text.index("阶段计时：") < caplog.text.index("错误：")
+
+
+def test_main_timings_setup_failure_reports_original_error(monkeypatch, tmp_path, caplog):
+    json_path = tmp_path / "timings.json"
+    _patch_stream_mode(monkeypatch, tmp_path, [["A", "1"]], stream=None, timings_json=str(json_path))
+
+    @contextlib.contextmanager
+    def failing_timings():
+        raise RuntimeError("计时初始化失败")
+        yield
+
+    monkeypatch.setattr(main_module, "collect_timings", failing_timings)
+    monkeypatch.setattr(main_module, "_run", lambda *_args: pytest.fail("计时未启用时不应开始处理"))
+
+    with pytest.raises(SystemExit):
+        main_module.main([])
+
+    assert "未知错误：计时初始化失败" in caplog.text
+    assert "阶段计时：" not in caplog.text
+    assert not json_path.exists()
+
+
+def test_timings_cli_option_parsing():
+    args = main_module.parse_args(["--timings", "in.xlsx", "单位", "01"])
+    assert (args.timings, args.timings_json, args.excel_path, args.unit_name) == (True, None, "in.xlsx", "单位")
+
+    args = main_module.parse_args(["in.xlsx", "单位", "01", "--timings-json", "t.json"])
+    assert (args.timings, args.timings_json, args.month) == (False, "t.json", "01")
+    assert main_module.parse_args(["in.xlsx", "单位", "01"]).timings is False
+
+
 def test_main_b01095_routing_uses_rule_group_and_skips_selector(monkeypatch, tmp_path):
     args = _make_runtime_args(tmp_path, excel_path="202603工资_B01095_批次.xlsx")
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
@@ -144,7 +145,7 @@ def test_parse_merge_filename_with_longest_unit_match():
     assert parsed.unit_name == "苏州悦鸣服务外包有限公司"
     assert parsed.template_name == "农行跨行"
     assert parsed.count == 4
-    assert parsed.amount == 26616.76
+    assert parsed.amount == Decimal("26616.76")
 
 
 def test_parse_merge_filename_invalid_format_raises():
@@ -155,6 +156,18 @@ def test_parse_merge_filename_invalid_format_raises():
         parse_merge_filename(file_path, unit_names)
 
 
+def test_parse_merge_filename_rejects_over_long_amount():
+    unit_names = ["单位A"]
+    file_path = Path("单位A_模板_3人_金额1.00000000000000000000000000001元.xlsx")
+
+    with pytest.raises(MergeFolderError, match=r"文件名中的金额无法解析: 单位A_模板_3人_金额1\.0+1元\.xlsx"):
+        parse_merge_filename(file_path, unit_names)
+    # 不符合默认命名规则、按配置回推元信息的文件名同样报告
+    inferred_path = Path("单位A 模板 金额1.00000000000000000000000000001元.xlsx")
+    with pytest.raises(MergeFolderError, match="文件名中的金额无法解析: 单位A 模板 金额"):
+        parse_merge_filename(inferred_path, unit_names, {"单位A": {"模板"}})
+
+
 def test_resolve_rule_group_prefers_group_name_then_template_stem(tmp_path):
     default_template, crossbank_template = _create_test_templates(tmp_path)
     config = _build_test_config(default_template, crossbank_template)
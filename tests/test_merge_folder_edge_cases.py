@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -34,6 +35,7 @@ from bank_template_processing.merge_folder import (
     prepare_merge_tasks,
     resolve_rule_group_for_template,
 )
+from bank_template_processing.pipeline import calculate_stats
 from tests.config_factories import make_basic_unit_config, make_config, make_field_mapping, make_multi_group_unit_config
 
 
@@ -584,3 +586,39 @@ def test_build_merge_output_group_config_branches():
     updated = _build_merge_output_group_config(cfg, keep_row_month_values=True)
     assert updated["month_type_mapping"] == {"enabled": False}
     assert "__merge_month_value__" in updated["field_mappings"]
+
+
+@pytest.mark.parametrize(("data_amount", "should_fail"), [("100.01", False), ("100.011", True), ("99.99", False)])
+def test_prepare_merge_tasks_amount_tolerance_is_exact(tmp_path, monkeypatch, data_amount, should_fail):
+    file_meta = MergeInputFile(
+        path=Path("x.xlsx"),
+        unit_name="单位A",
+        template_name="模板A",
+        count=1,
+        amount=merge_folder_module._parse_name_amount("100.00", "x.xlsx"),
+    )
+    monkeypatch.setattr(merge_folder_module, "_scan_merge_input_files", lambda *_args, **_kwargs: [file_meta])
+    monkeypatch.setattr(
+        merge_folder_module,
+        "resolve_rule_group_for_template",
+        lambda *_args, **_kwargs: (
+            "default",
+            _make_merge_rule_group(
+                "tpl.xlsx",
+                field_mappings={"金额": make_field_mapping(source_column="金额", transform="amount_decimal")},
+            ),
+        ),
+    )
+    monkeypatch.setattr(
+        merge_folder_module,
+        "_read_generated_file_rows",
+        lambda *_args, **_kwargs: ([{"金额": data_amount}], set()),
+    )
+    config = {"organization_units": {"单位A": {"template_path": "tpl.xlsx"}}}
+
+    if should_fail:
+        with pytest.raises(MergeFolderError, match="金额校验失败"):
+            _call_prepare_merge_tasks(tmp_path, config, calculate_stats_fn=calculate_stats)
+    else:
+        tasks = _call_prepare_merge_tasks(tmp_path, config, calculate_stats_fn=calculate_stats)
+        assert tasks[0].amount.to_decimal() == Decimal(data_amount)
@@ -0,0 +1,139 @@
+"""parsing 解析原语测试。"""
+
+from __future__ import annotations
+
+import pickle
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, strategies as st
+
+from bank_template_processing.parsing import (
+    DATE_INPUT_FORMATS,
+    DateText,
+    to_half_width,
+    try_parse_date,
+    try_parse_decimal,
+)
+
+
+def _strptime_reference(value: str) -> datetime | None:
+    for fmt in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _decimal_reference(value: str) -> Decimal | None:
+    try:
+        return Decimal(value)
+    except ArithmeticError:
+        return None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("123.45", Decimal("123.45")),
+        (" -1e3 ", Decimal("-1E+3")),
+        ("1_000", Decimal("1000")),
+        (".5", Decimal("0.5")),
+        (100, Decimal("100")),
+        (1.25, Decimal("1.25")),
+        (Decimal("9.99"), Decimal("9.99")),
+    ],
+)
+def test_try_parse_decimal_accepts_numeric_values(value, expected):
+    assert try_parse_decimal(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "abc", "1,000", "1e", ".", "- 1", True, None])
+def test_try_parse_decimal_returns_none_on_failure(value):
+    assert try_parse_decimal(value) is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2024-01-15", datetime(2024, 1, 15)),
+        ("2024-1-5", datetime(2024, 1, 5)),
+        ("15/01/2024", datetime(2024, 1, 15)),
+        ("01/15/2024", datetime(2024, 1, 15)),
+        ("2024年01月15日", datetime(2024, 1, 15)),
+    ],
+)
+def test_try_parse_date_accepts_supported_formats(value, expected):
+    assert try_parse_date(value) == expected
+
+
+@pytest.mark.parametrize("value", ["2024-02-30", "0000-01-01", "2024/01/15", "31/02/2024", "", 20240115, None])
+def test_try_parse_date_returns_none_on_failure(value):
+    assert try_parse_date(value) is None
+
+
+def test_try_parse_date_passes_through_date_objects():
+    today = date(2026, 1, 2)
+    now = datetime(2026, 1, 2, 3, 4, 5)
+
+    assert try_parse_date(today) is today
+    assert try_parse_date(now) is now
+
+
+@given(st.text(alphabet="0123456789-+._eEinfatyINFsN ", max_size=10))
+def test_try_parse_decimal_matches_decimal_constructor(value: str):
+    assert str(try_parse_decimal(value)) == str(_decimal_reference(value))
+
+
+@given(
+    year=st.sampled_from(["0000", "0001", "2024", "2023"]),
+    month=st.sampled_from(["0", "1", "01", "2", " 2", "12", "13"]),
+    day=st.sampled_from(["0", "1", " 1", "09", "29", "30", "31", "32"]),
+    layout=st.sampled_from(["{y}-{m}-{d}", "{d}/{m}/{y}", "{m}/{d}/{y}", "{y}年{m}月{d}日"]),
+)
+def test_try_parse_date_matches_strptime(year: str, month: str, day: str, layout: str):
+    value = layout.format(y=year, m=month, d=day)
+    assert try_parse_date(value) == _strptime_reference(value)
+
+
+def _half_width_reference(text: str) -> str:
+    result = []
+    for char in text:
+        code = ord(char)
+        if code == 0x3000:
+            result.append(" ")
+        elif 0xFF01 <= code <= 0xFF5E:
+            result.append(chr(code - 0xFEE0))
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def test_to_half_width_returns_ascii_input_unchanged():
+    text = "ICBC 6222"
+    assert to_half_width(text) is text
+
+
+@given(st.text(alphabet=st.sampled_from("ＡＢｚ０９！～　\u3001\uff5f中行 a1"), max_size=12))
+def test_to_half_width_matches_per_char_conversion(text: str):
+    assert to_half_width(text) == _half_width_reference(text)
+
+
+def test_date_text_carries_its_parsed_date():
+    text = DateText("01/05/2024", datetime(2024, 1, 5, 8, 30))
+
+    assert text == "01/05/2024"
+    assert try_parse_date(text) == datetime(2024, 1, 5)
+    # 相同的普通文本仍按输入格式优先级解析
+    assert try_parse_date("01/05/2024") == datetime(2024, 5, 1)
+    assert try_parse_date(text.strip()) == datetime(2024, 5, 1)
+    assert try_parse_date(DateText("20240115", date(2024, 1, 15))) == datetime(2024, 1, 15)
+
+
+def test_date_text_survives_pickle():
+    restored = pickle.loads(pickle.dumps(DateText("20240115", date(2024, 1, 15)), protocol=pickle.HIGHEST_PROTOCOL))
+
+    assert type(restored) is DateText
+    assert (restored, restored.parsed) == ("20240115", datetime(2024, 1, 15))
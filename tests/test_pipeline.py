@@ -3,17 +3,26 @@
 from __future__ import annotations
 
 import logging
+from decimal import Decimal
 
 import openpyxl
 import pytest
 
+from bank_template_processing import pipeline as pipeline_module
+from bank_template_processing.error_report import ErrorCollector
 from bank_template_processing.pipeline import (
     ProcessingContext,
+    StreamingGroupCheck,
+    apply_transformations,
     build_reader,
+    compile_field_transforms,
+    prepare_group_rows,
     transform_rows,
     validate_rows,
     write_group_output,
 )
+from bank_template_processing.row_cache import RowCache
+from bank_template_processing.timings import collect_timings, current_timings
 from bank_template_processing.transformer import TransformError
 from bank_template_processing.validator import ValidationError
 from tests.spreadsheet_factories import write_xlsx_rows
@@ -47,6 +56,179 @@ def test_transform_rows_adds_context():
         )
 
 
+def test_prepare_group_rows_collects_all_errors_without_raising(caplog):
+    caplog.set_level("WARNING")
+    errors = ErrorCollector(limit=10)
+    group_config = {
+        "field_mappings": {
+            "卡号": {"source_column": "卡号", "transform": "card_number"},
+            "金额": {"source_column": "金额", "transform": "amount_decimal"},
+        },
+        "transformations": {"card_number": {"luhn_validation": True}},
+        "validation_rules": {
+            "required_fields": ["姓名"],
+            "value_ranges": {"金额": {"min": 0}},
+        },
+    }
+    data = [
+        {"姓名": "", "卡号": "123", "金额": "-1"},
+        {"姓名": "李四", "卡号": "6222021234567890128", "金额": "10"},
+        {"姓名": "王五", "卡号": "6222021234567890128", "金额": "abc"},
+    ]
+
+    rows, count, amount = prepare_group_rows(
+        data,
+        group_config,
+        context=ProcessingContext(unit_name="单位A", rule_group="default"),
+        errors=errors,
+    )
+
+    assert len(rows) == 3
+    assert (count, amount) == (0, 0.0)
+    assert [(v.stage, v.row_number, v.field, v.rule) for v in errors] == [
+        ("数据校验", 1, "姓名", "required"),
+        ("数据转换", 1, "卡号", "card_number"),
+        ("数据转换", 3, "金额", "amount_decimal"),
+        ("数据校验", 1, "金额", "min"),
+        ("数据校验", 3, "金额", "numeric"),
+    ]
+    assert errors.violations[0].location == "单位=单位A，规则组=default"
+    assert rows[0]["卡号"] == "123"
+    assert "数据校验发现 2 处错误" in caplog.text
+
+
+def test_validate_rows_reports_cross_row_violation_with_row_context():
+    rows = [{"卡号": "6222"}, {"卡号": "6223"}, {"卡号": "6222"}]
+
+    with pytest.raises(ValidationError, match="第3条数据）：字段 '卡号' 的值 6222 与第 1 条数据重复") as exc_info:
+        validate_rows(rows, {"unique_fields": ["卡号"]}, context=ProcessingContext(unit_name="单位A"))
+
+    assert (exc_info.value.rule, exc_info.value.row) == ("unique", 3)
+
+
+def test_prepare_group_rows_checks_cross_row_rules_after_transform():
+    errors = ErrorCollector(limit=10)
+    group_config = {
+        "field_mappings": {
+            "卡号": {"source_column": "卡号", "transform": "card_number"},
+            "金额": {"source_column": "金额", "transform": "amount_decimal"},
+        },
+        "transformations": {"card_number": {"luhn_validation": False}},
+        "validation_rules": {
+            "unique_fields": ["卡号"],
+            "max_total": {"金额": 100},
+            "max_rows_per_file": 2,
+        },
+    }
+    # 去除格式后两张卡号相同
+    data = [
+        {"卡号": "6222 0212 3456 7890 128", "金额": "60"},
+        {"卡号": "6222021234567890128", "金额": "50"},
+        {"卡号": "6222021234567890129", "金额": "1"},
+    ]
+
+    prepare_group_rows(data, group_config, errors=errors)
+
+    assert [(v.row_number, v.field, v.rule) for v in errors] == [
+        (2, "卡号", "unique"),
+        (2, "金额", "max_total"),
+        (3, None, "max_rows_per_file"),
+    ]
+
+
+def test_streaming_group_check_matches_prepare_group_rows_collect_mode():
+    group_config = {
+        "field_mappings": {
+            "卡号": {"source_column": "卡号", "transform": "card_number"},
+            "金额": {"source_column": "金额", "transform": "amount_decimal"},
+        },
+        "transformations": {"card_number": {"luhn_validation": True}},
+        "validation_rules": {
+            "required_fields": ["姓名"],
+            "value_ranges": {"金额": {"min": 0}},
+            "unique_fields": ["卡号"],
+        },
+    }
+    data = [
+        {"姓名": "", "卡号": "123", "金额": "-1"},
+        {"姓名": "李四", "卡号": "6222021234567890128", "金额": "10.5"},
+        {"姓名": "王五", "卡号": "6222021234567890128", "金额": "abc"},
+        {"姓名": "赵六", "卡号": "6222 0212 3456 7890 128", "金额": "2"},
+    ]
+    context = ProcessingContext(unit_name="单位A", rule_group="default")
+    expected = ErrorCollector()
+    prepare_group_rows([dict(row) for row in data], group_config, context=context, errors=expected)
+
+    errors = ErrorCollector()
+    check = StreamingGroupCheck(group_config, errors, context=context)
+    for row in data:
+        check.check_row(row)
+    result = check.result()
+
+    def key(violation):
+        return violation.stage, violation.row_number, violation.field, violation.rule, violation.location
+
+    assert sorted(map(key, errors)) == sorted(map(key, expected))
+    assert (result.count, result.amount, result.error_count) == (4, Decimal("11.5"), len(expected))
+    # 输入行不被修改
+    assert data[1]["金额"] == "10.5"
+
+
+def test_prepare_group_rows_post_transform_checks_reuse_transformed_dates():
+    group_config = {
+        "field_mappings": {
+            "日期": {"source_column": "日期", "transform": "date_format"},
+            "金额": {"source_column": "金额", "transform": "amount_decimal"},
+        },
+        "transformations": {"date_format": {"output_format": "MM/DD/YYYY"}},
+        "validation_rules": {
+            "data_types": {"日期": "date"},
+            "value_ranges": {"日期": {"min": "2024-01-10"}},
+        },
+    }
+    # 01/05/2024 按输入格式优先级会被解析为 5 月 1 日，共享缓存保证校验看到的是转换前的 1 月 5 日
+    data = [{"日期": "2024-01-05", "金额": "1"}]
+
+    with pytest.raises(ValidationError, match="小于最小值") as exc_info:
+        prepare_group_rows(data, group_config)
+
+    assert exc_info.value.rule == "min"
+
+
+def test_prepare_group_rows_reads_other_fields_with_same_text_as_input():
+    group_config = {
+        "field_mappings": {
+            "日期": {"source_column": "日期", "transform": "date_format"},
+            "生效日期": {"source_column": "生效日期"},
+        },
+        "transformations": {"date_format": {"output_format": "MM/DD/YYYY"}},
+        "validation_rules": {"value_ranges": {"日期": {"max": "2024-01-15"}, "生效日期": {"max": "2024-01-15"}}},
+    }
+    # 日期转换输出 01/02/2024 表示 1 月 2 日；未转换的生效日期同样是 01/02/2024，仍按输入格式解析为 2 月 1 日
+    data = [{"日期": "2024-01-02", "生效日期": "01/02/2024"}]
+
+    with pytest.raises(ValidationError, match="生效日期") as exc_info:
+        prepare_group_rows(data, group_config)
+
+    assert exc_info.value.rule == "max"
+
+
+def test_prepare_group_rows_accepts_compact_date_output():
+    group_config = {
+        "field_mappings": {
+            "日期": {"source_column": "日期", "transform": "date_format"},
+            "金额": {"source_column": "金额", "transform": "amount_decimal"},
+        },
+        "transformations": {"date_format": {"output_format": "YYYYMMDD"}},
+        "validation_rules": {"data_types": {"日期": "date"}},
+    }
+
+    rows, count, _ = prepare_group_rows([{"日期": "2024-01-15", "金额": "1"}], group_config)
+
+    assert rows[0]["日期"] == "20240115"
+    assert count == 1
+
+
 def test_write_group_output_uses_shared_writer(tmp_path):
     template_path = write_xlsx_rows(tmp_path / "template.xlsx", [["姓名", "金额"]])
 
@@ -74,3 +256,205 @@ def test_write_group_output_uses_shared_writer(tmp_path):
     assert sheet.cell(2, 1).value == "张三"
     assert sheet.cell(2, 2).value == 100
     result.close()
+
+
+def test_compile_field_transforms_keeps_only_configured_transforms_in_order():
+    field_mappings = {
+        "姓名": {"source_column": "姓名"},
+        "旧格式": "卡号",
+        "无转换": {"source_column": "备注", "transform": "none"},
+        "金额": {"source_column": "实发工资", "transform": "amount_decimal"},
+        "卡号": {"transform": "card_number"},
+    }
+
+    compiled = compile_field_transforms(field_mappings, {"card_number": {"luhn_validation": False}})
+
+    assert [(source_field, transform_type) for source_field, _, transform_type in compiled] == [
+        ("实发工资", "amount_decimal"),
+        ("卡号", "card_number"),
+    ]
+    assert compiled[1][1]("6222 0212 3456 7890 128") == "6222021234567890128"
+
+
+def test_transform_rows_copies_rows_unless_in_place():
+    field_mappings = {"金额": {"source_column": "金额", "transform": "amount_decimal"}}
+    rows = [{"姓名": "张三", "金额": "10.5"}]
+
+    copied = transform_rows(rows, {}, field_mappings)
+    assert copied[0] is not rows[0]
+    assert rows[0]["金额"] == "10.5"
+
+    transformed = transform_rows(rows, {}, field_mappings, in_place=True)
+    assert transformed[0] is rows[0]
+    assert rows[0] == {"姓名": "张三", "金额": Decimal("10.50")}
+
+
+@pytest.mark.parametrize("collect_errors", [False, True])
+def test_prepare_group_rows_in_place_reuses_input_rows(collect_errors):
+    group_config = {
+        "field_mappings": {"金额": {"source_column": "金额", "transform": "amount_decimal"}},
+        "validation_rules": {"value_ranges": {"金额": {"min": 0}}},
+    }
+    rows = [{"姓名": "张三", "金额": "10"}, {"姓名": "李四", "金额": "20.5"}]
+    errors = ErrorCollector(limit=10) if collect_errors else None
+
+    prepared, count, amount = prepare_group_rows(rows, group_config, errors=errors, in_place=True)
+
+    assert (count, amount) == (2, Decimal("30.5"))
+    assert all(prepared_row is row for prepared_row, row in zip(prepared, rows))
+    assert [row["金额"] for row in rows] == [Decimal("10"), Decimal("20.5")]
+
+
+def test_validate_and_transform_rows_log_one_summary_per_stage(caplog):
+    caplog.set_level("INFO")
+    rows = [{"姓名": f"员工{index}", "金额": str(index)} for index in range(1, 51)]
+
+    validate_rows(rows, {"required_fields": ["姓名"], "data_types": {"金额": "numeric"}})
+    transform_rows(rows, {}, {"金额": {"source_column": "金额", "transform": "amount_decimal"}})
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == ["数据校验通过：50 行（必填字段、数据类型）", "数据转换完成：50 行"]
+
+
+def test_prepare_group_rows_with_row_cache_reprocesses_only_changed_rows(tmp_path):
+    group_config = {
+        "field_mappings": {"金额": {"source_column": "金额", "transform": "amount_decimal"}},
+        "validation_rules": {"value_ranges": {"金额": {"min": 0}}, "unique_fields": ["姓名"]},
+    }
+    transformed: list[list[int]] = []
+
+    def tracking_transform(data, transformations, field_mappings, **kwargs):
+        transformed.append(list(kwargs.get("indices", range(len(data)))))
+        return transform_rows(data, transformations, field_mappings, **kwargs)
+
+    def run(data):
+        cache = RowCache.load(tmp_path, "单位A", "default", group_config)
+        return prepare_group_rows(data, group_config, transform_fn=tracking_transform, row_cache=cache)
+
+    first = [{"姓名": "张三", "金额": "10"}, {"姓名": "李四", "金额": "20"}, {"姓名": "王五", "金额": "30"}]
+    _, count, amount = run(first)
+    assert (count, amount) == (3, Decimal("60"))
+
+    second = [dict(row) for row in first]
+    second[1]["金额"] = "25"
+    rows, count, amount = run(second)
+
+    assert transformed == [[0, 1, 2], [1]]
+    assert (count, amount) == (3, Decimal("65"))
+    assert [row["金额"] for row in rows] == [Decimal("10"), Decimal("25"), Decimal("30")]
+
+    # 复用的行仍参与跨行规则
+    duplicated = second + [{"姓名": "张三", "金额": "1"}]
+    with pytest.raises(ValidationError, match="重复") as exc_info:
+        run(duplicated)
+    assert exc_info.value.row == 4
+
+
+def _prepare_in_stages(data, group_config, **kwargs):
+    # 未带单次遍历能力标记的自定义转换函数会让 prepare_group_rows 退回分阶段执行
+    def staged_transform(*args, **transform_kwargs):
+        return transform_rows(*args, **transform_kwargs)
+
+    return prepare_group_rows(data, group_config, transform_fn=staged_transform, **kwargs)
+
+
+def test_prepare_group_rows_chooses_single_pass_by_capability(monkeypatch):
+    calls = []
+
+    def fused(data, *_args, **_kwargs):
+        calls.append("fused")
+        return data, len(data), 0.0
+
+    monkeypatch.setattr(pipeline_module, "_prepare_group_rows_fused", fused)
+    group_config = {"field_mappings": {"金额": {"source_column": "金额", "transform": "amount_decimal"}}}
+    rows = [{"金额": "1"}]
+
+    prepare_group_rows(rows, group_config)
+    prepare_group_rows(rows, group_config, transform_fn=apply_transformations)
+    assert calls == ["fused", "fused"]
+
+    _prepare_in_stages([{"金额": "1"}], group_config)
+    prepare_group_rows([{"金额": "1"}], group_config, stats_fn=lambda data, _m, _t: (len(data), 0.0))
+    assert calls == ["fused", "fused"]
+
+
+_FUSED_GROUP_CONFIG = {
+    "field_mappings": {
+        "姓名": {"source_column": "姓名"},
+        "卡号": {"source_column": "卡号", "transform": "card_number"},
+        "金额": {"source_column": "金额", "transform": "amount_decimal"},
+    },
+    "transformations": {"card_number": {"luhn_validation": False}},
+    "validation_rules": {
+        "required_fields": ["姓名"],
+        "value_ranges": {"金额": {"max": 100}},
+        "unique_fields": ["卡号"],
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        # 全部通过
+        [{"姓名": "张三", "卡号": "6222 0212", "金额": "10.5"}, {"姓名": "李四", "卡号": "6223", "金额": "20"}],
+        # 第 1 行转换失败，第 2 行转换前校验失败：转换前校验优先
+        [{"姓名": "张三", "卡号": "6222", "金额": "abc"}, {"姓名": "", "卡号": "6223", "金额": "1"}],
+        # 第 1 行转换后校验失败，第 2 行转换失败：转换优先
+        [{"姓名": "张三", "卡号": "6222", "金额": "500"}, {"姓名": "李四", "卡号": "6223", "金额": "abc"}],
+        # 转换后跨行规则失败
+        [{"姓名": "张三", "卡号": "6222 0212", "金额": "1"}, {"姓名": "李四", "卡号": "62220212", "金额": "2"}],
+    ],
+)
+def test_prepare_group_rows_single_pass_matches_staged_execution(rows):
+    context = ProcessingContext(unit_name="单位A")
+
+    def outcome(prepare):
+        try:
+            return prepare(rows, _FUSED_GROUP_CONFIG, context=context)
+        except (TransformError, ValidationError) as exc:
+            return type(exc), str(exc), exc.row
+
+    def timed_single_pass(*args, **kwargs):
+        with collect_timings():
+            return prepare_group_rows(*args, **kwargs)
+
+    assert outcome(prepare_group_rows) == outcome(_prepare_in_stages) == outcome(timed_single_pass)
+
+
+def test_prepare_group_rows_records_stage_timings():
+    rows = [
+        {"姓名": "张三", "卡号": "6222020200000000001", "金额": "10"},
+        {"姓名": "李四", "卡号": "6222020200000000002", "金额": "abc"},
+    ]
+
+    for prepare in (prepare_group_rows, _prepare_in_stages):
+        with collect_timings() as timings, pytest.raises(TransformError):
+            prepare(rows, _FUSED_GROUP_CONFIG)
+        records = timings.records
+        assert (records["数据转换"].rows_in, records["数据转换"].rows_out) == (2, 2 if prepare is _prepare_in_stages else 1)
+        assert records["数据校验"].rows_in >= 2
+
+    assert current_timings() is None
+
+
+def _identity_factory(options, transformer):
+    return lambda value: value
+
+
+def test_prepare_group_rows_single_pass_reports_validation_before_stats_failure():
+    group_config = {
+        "field_mappings": {"金额": {"source_column": "金额", "transform": "amount_decimal"}},
+        "transformations": {"amount_decimal": {"factory": "tests.test_pipeline:_identity_factory"}},
+        "validation_rules": {"value_ranges": {"序号": {"max": 10}}},
+    }
+    context = ProcessingContext(unit_name="单位A")
+
+    # 第 1 行只在统计时失败，第 2 行转换后校验失败：校验错误优先
+    rows = [{"金额": True, "序号": 1}, {"金额": "1", "序号": 50}]
+    with pytest.raises(ValidationError, match="数据校验失败（单位=单位A，第2条数据）") as exc_info:
+        prepare_group_rows(rows, group_config, context=context)
+    assert exc_info.value.row == 2
+
+    with pytest.raises(ValidationError, match="金额统计失败（单位=单位A）：第1条数据中金额统计字段 '金额'"):
+        prepare_group_rows(rows[:1], group_config, context=context)
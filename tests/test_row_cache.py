@@ -0,0 +1,111 @@
+"""row_cache 增量处理缓存测试。"""
+
+from __future__ import annotations
+
+import logging
+
+from bank_template_processing import row_cache as row_cache_module
+from bank_template_processing.row_cache import RowCache, RowDiff, config_fingerprint, row_fingerprint
+
+
+GROUP_CONFIG = {"field_mappings": {"金额": {"source_column": "金额", "transform": "amount_decimal"}}}
+
+
+def test_row_fingerprint_depends_on_values_and_column_order():
+    row = {"姓名": "张三", "金额": "10"}
+
+    assert row_fingerprint(row) == row_fingerprint(dict(row))
+    assert row_fingerprint(row) != row_fingerprint({"姓名": "张三", "金额": "10.0"})
+    assert row_fingerprint(row) != row_fingerprint({"金额": "10", "姓名": "张三"})
+    assert row_fingerprint({"金额": 10}) != row_fingerprint({"金额": "10"})
+
+
+def test_config_fingerprint_changes_with_config():
+    changed = {"field_mappings": {"金额": {"source_column": "实发", "transform": "amount_decimal"}}}
+
+    assert config_fingerprint(GROUP_CONFIG) == config_fingerprint(dict(GROUP_CONFIG))
+    assert config_fingerprint(GROUP_CONFIG) != config_fingerprint(changed)
+
+
+def test_row_diff_reports_added_removed_and_changed_rows():
+    diff = RowDiff([b"a", b"b", b"c", b"d"], [b"a", b"x", b"c", b"d", b"e"])
+
+    assert (diff.added, diff.removed, diff.changed, diff.unchanged) == ([5], [], [2], 3)
+    assert diff.describe() == "新增 1 行，删除 0 行，变更 1 行，未变 3 行；新增行号 5；变更行号 2"
+
+    removed = RowDiff([b"a", b"b", b"c"], [b"a", b"c"])
+    assert (removed.added, removed.removed, removed.changed) == ([], [2], [])
+
+
+def test_row_diff_matches_moved_and_duplicate_rows_by_fingerprint():
+    diff = RowDiff([b"a", b"b", b"a", b"c"], [b"b", b"a", b"a", b"a", b"d"])
+
+    assert (diff.added, diff.removed, diff.changed, diff.unchanged) == ([5], [], [4], 3)
+
+
+def test_row_diff_is_linear_for_scattered_changes():
+    previous = [index.to_bytes(4, "big") for index in range(200_000)]
+    current = [fingerprint if index % 2 else b"changed" + fingerprint for index, fingerprint in enumerate(previous)]
+
+    diff = RowDiff(previous, current)
+
+    assert (len(diff.changed), len(diff.added), len(diff.removed), diff.unchanged) == (100_000, 0, 0, 100_000)
+    assert diff.changed[:3] == [1, 3, 5]
+
+
+def test_config_fingerprint_changes_with_code(monkeypatch):
+    before = config_fingerprint(GROUP_CONFIG)
+    assert len(row_cache_module.code_fingerprint()) == 32
+
+    monkeypatch.setattr(row_cache_module, "code_fingerprint", lambda: "changed")
+    assert config_fingerprint(GROUP_CONFIG) != before
+
+
+def test_row_diff_describe_truncates_long_row_lists():
+    diff = RowDiff([], [bytes([index]) for index in range(25)])
+
+    assert diff.describe().endswith("新增行号 1、2、3、4、5、6、7、8、9、10、11、12、13、14、15、16、17、18、19、20 等 25 行")
+
+
+def test_row_cache_round_trip_reuses_unchanged_rows(tmp_path):
+    rows = [{"姓名": "张三", "金额": "10"}, {"姓名": "李四", "金额": "20"}]
+    outputs = [{"姓名": "张三", "金额": 10.0}, {"姓名": "李四", "金额": 20.0}]
+    cache = RowCache.load(tmp_path, "单位A", "default", GROUP_CONFIG)
+    first = cache.match(rows)
+    assert first.hits == 0
+    cache.save(first.fingerprints, outputs)
+
+    reloaded = RowCache.load(tmp_path, "单位A", "default", GROUP_CONFIG)
+    changed_rows = [rows[0], {"姓名": "李四", "金额": "25"}]
+    match = reloaded.match(changed_rows)
+
+    assert match.hits == 1
+    assert match.misses == [1]
+    assert match.diff.changed == [2]
+    assert match.merge(changed_rows) == [outputs[0], changed_rows[1]]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["单位A_default.pkl"]
+
+
+def test_row_cache_drops_outputs_when_config_changes(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    rows = [{"金额": "10"}]
+    cache = RowCache.load(tmp_path, "单位A", "default", GROUP_CONFIG)
+    cache.save(cache.match(rows).fingerprints, [{"金额": 10.0}])
+
+    changed = RowCache.load(tmp_path, "单位A", "default", {"field_mappings": {}})
+    match = changed.match(rows)
+
+    assert match.hits == 0
+    # 差异基准仍保留，日志能说明输入未变
+    assert match.diff.unchanged == 1
+    assert "增量缓存的转换结果已失效" in caplog.text
+
+
+def test_row_cache_treats_corrupt_file_as_empty(tmp_path, caplog):
+    caplog.set_level(logging.WARNING)
+    (tmp_path / "单位A_default.pkl").write_bytes(b"not a pickle")
+
+    cache = RowCache.load(tmp_path, "单位A", None, GROUP_CONFIG)
+
+    assert cache.match([{"金额": "10"}]).hits == 0
+    assert "增量缓存读取失败" in caplog.text
@@ -0,0 +1,50 @@
+"""row_spill 分组溢写测试。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from bank_template_processing.row_spill import RowSpool, SpillingPartitioner
+
+
+def test_row_spool_round_trips_spilled_and_buffered_rows(tmp_path):
+    spool = RowSpool(tmp_path / "group.bin")
+    rows = [
+        {"姓名": "张三", "金额": 1.5, "日期": datetime(2024, 1, 2)},
+        {"姓名": "李四", "金额": None, "日期": "2024-01-03"},
+        {"姓名": "王五", "备注": "列不同"},
+    ]
+    for row in rows[:2]:
+        spool.append(row)
+    assert spool.spill() == 2
+    spool.append(rows[2])
+    spool.spill()
+    spool.append({"姓名": "赵六"})
+
+    assert len(spool) == 4
+    assert spool.spilled == 3
+    assert spool.load() == rows + [{"姓名": "赵六"}]
+    assert [list(row) for row in spool.load()] == [list(row) for row in rows + [{"姓名": "赵六"}]]
+    assert spool.spill() == 1
+    assert spool.spill() == 0
+
+
+def test_spilling_partitioner_spills_when_threshold_reached_and_cleans_up(tmp_path):
+    with SpillingPartitioner(["a", "b"], threshold=3, directory=tmp_path) as partitioner:
+        for index in range(7):
+            partitioner.add("a" if index % 2 else "b", {"序号": index})
+        spool_dir = partitioner.spools["a"].path.parent
+
+        assert partitioner.spilled == 6
+        assert [row["序号"] for row in partitioner.spools["a"]] == [1, 3, 5]
+        assert [row["序号"] for row in partitioner.spools["b"]] == [0, 2, 4, 6]
+        assert spool_dir.exists()
+
+    assert not spool_dir.exists()
+
+
+def test_spilling_partitioner_rejects_non_positive_threshold():
+    with pytest.raises(ValueError, match="溢写阈值必须为正整数"):
+        SpillingPartitioner(["a"], threshold=0)
@@ -3,7 +3,7 @@
 """
 
 import pytest
-from bank_template_processing.template_selector import TemplateSelector, ValidationError
+from bank_template_processing.template_selector import BankAliasIndex, RowView, TemplateSelector, ValidationError
 
 
 class TestIsEnabled:
@@ -360,3 +360,194 @@ class TestGroupData:
 
         assert len(result["default"]["data"]) == 1
         assert len(result["special"]["data"]) == 1
+
+
+class TestRowView:
+    """测试分组视图"""
+
+    def test_group_data_returns_views_over_shared_rows(self):
+        """分组结果只记录下标，行对象与输入相同"""
+        selector = TemplateSelector({"template_selector": {}})
+        data = [{"开户银行": bank, "序号": index} for index, bank in enumerate(["农业银行", "工商银行", "农业银行"])]
+
+        result = selector.group_data(data, default_bank="农业银行")
+        default_rows = result["default"]["data"]
+
+        assert isinstance(default_rows, RowView)
+        assert len(default_rows) == 2
+        assert default_rows[0] is data[0]
+        assert default_rows[-1] is data[2]
+        assert [row["序号"] for row in default_rows] == [0, 2]
+        assert list(default_rows[1:]) == [data[2]]
+        assert repr(default_rows) == "RowView(2 行)"
+        assert not RowView(data)
+
+
+class TestSpillGroupData:
+    """测试溢写分组"""
+
+    def test_matches_group_data_and_streams_rows(self, tmp_path):
+        """溢写分组结果与 group_data 一致，输入可以是迭代器"""
+        selector = TemplateSelector(TestRoutes.CONFIG)
+        banks = ["中国工商银行", "中国农业银行", "招商银行", "工行", "中国建设银行"] * 3
+        data = [{"开户银行": bank, "序号": index} for index, bank in enumerate(banks)]
+        expected = selector.group_data(data, default_bank="中国农业银行")
+
+        with selector.spill_group_data(
+            iter(data),
+            "中国农业银行",
+            spill_threshold=4,
+            spill_dir=tmp_path,
+        ) as result:
+            assert list(result) == list(expected)
+            for key, group in result.items():
+                assert len(group["data"]) == len(expected[key]["data"])
+                assert group["data"].load() == list(expected[key]["data"])
+                assert group["group_name"] == expected[key]["group_name"]
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_classification_errors_clean_up_temp_files(self, tmp_path):
+        """分组失败时同样删除临时文件"""
+        selector = TemplateSelector({"template_selector": {}})
+        rows = [{"开户银行": "农业银行"}, {"开户银行": "农业银行"}, {"开户银行": ""}]
+
+        with pytest.raises(ValidationError, match="第3行"):
+            with selector.spill_group_data(rows, "农业银行", spill_threshold=1, spill_dir=tmp_path):
+                pass
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRoutes:
+    """测试 routes 多路分组"""
+
+    CONFIG = {
+        "template_selector": {
+            "enabled": True,
+            "default_bank": "中国农业银行",
+            "default_group_name": "农行",
+            "routes": {"中国工商银行": "icbc", "中国建设银行": "ccb", "工行": "icbc", "交通银行": "crossbank"},
+        }
+    }
+
+    def test_partitions_rows_into_route_groups_in_one_pass(self):
+        """命中 routes 的行归入对应规则组，其余归入特殊组"""
+        selector = TemplateSelector(self.CONFIG)
+        data = [
+            {"开户银行": "中国工商银行", "姓名": "张三"},
+            {"开户银行": "中国农业银行", "姓名": "李四"},
+            {"开户银行": "招商银行", "姓名": "王五"},
+            {"开户银行": " 中国建设银行 ", "姓名": "赵六"},
+            {"开户银行": "工行", "姓名": "钱七"},
+            {"开户银行": "交通银行", "姓名": "孙八"},
+        ]
+
+        result = selector.group_data(data, default_bank="中国农业银行")
+
+        assert list(result) == ["default", "special", "icbc", "ccb"]
+        assert {key: [row["姓名"] for row in group["data"]] for key, group in result.items()} == {
+            "default": ["李四"],
+            "special": ["王五", "孙八"],
+            "icbc": ["张三", "钱七"],
+            "ccb": ["赵六"],
+        }
+        assert result["default"]["group_name"] == "农行"
+        assert (result["icbc"]["template"], result["icbc"]["group_name"]) == ("", "")
+
+    def test_rule_group_mapping_and_empty_result(self):
+        """特殊组对应 crossbank，空数据也返回全部分组"""
+        selector = TemplateSelector(self.CONFIG)
+
+        assert [selector.rule_group(key) for key in selector.group_keys()] == ["default", "crossbank", "icbc", "ccb"]
+        assert list(selector.group_data([], default_bank="中国农业银行")) == ["default", "special", "icbc", "ccb"]
+
+
+class TestBankAliases:
+    """测试银行别名解析"""
+
+    ALIASES = {
+        "中国农业银行": ["农行", "农业银行*", "ＡＢＣ"],
+        "中国农业银行股份有限公司北京分行": ["农业银行北京*"],
+        "中国工商银行": ["工行", "*工商银行"],
+    }
+
+    def test_resolves_exact_prefix_and_suffix_aliases(self):
+        """精确别名优先，其次最长前缀、最长后缀，未命中返回原名称"""
+        index = BankAliasIndex(self.ALIASES)
+
+        assert index.resolve("农行") == "中国农业银行"
+        assert index.resolve("ABC") == "中国农业银行"
+        assert index.resolve("中国农业银行") == "中国农业银行"
+        assert index.resolve("农业银行股份有限公司") == "中国农业银行"
+        assert index.resolve("农业银行北京海淀支行") == "中国农业银行股份有限公司北京分行"
+        assert index.resolve("北京工商银行") == "中国工商银行"
+        assert index.resolve("建设银行") == "建设银行"
+        assert not BankAliasIndex()
+
+    def test_group_data_routes_aliases_to_canonical_bank(self):
+        """别名先解析为标准名称再分组，routes 与 default_bank 也可使用别名"""
+        selector = TemplateSelector(
+            {
+                "template_selector": {
+                    "default_bank": "农行",
+                    "routes": {"中国工商银行": "icbc"},
+                    "bank_aliases": self.ALIASES,
+                }
+            }
+        )
+        data = [{"开户银行": bank} for bank in ["中国农业银行", "农业银行股份有限公司", "工行", "北京工商银行", "建设银行"]]
+
+        result = selector.group_data(data, default_bank="农行")
+
+        assert {key: [row["开户银行"] for row in group["data"]] for key, group in result.items()} == {
+            "default": ["中国农业银行", "农业银行股份有限公司"],
+            "special": ["建设银行"],
+            "icbc": ["工行", "北京工商银行"],
+        }
+
+
+class TestRowClassifier:
+    """测试逐行分组函数"""
+
+    def test_classifies_rows_like_group_data(self):
+        """逐行分组与 group_data 的归组一致，并校验银行列"""
+        selector = TemplateSelector({"template_selector": {"special_group_name": "跨行"}})
+        classify = selector.row_classifier(" 农业银行 ", "开户银行")
+
+        assert classify({"开户银行": "农业银行"}, 1) == "default"
+        assert classify({"开户银行": "农业银行　"}, 2) == "default"
+        assert classify({"开户银行": "工商银行"}, 3) == "special"
+        with pytest.raises(ValidationError, match="第4行的'开户银行'字段为空"):
+            classify({"开户银行": " "}, 4)
+        with pytest.raises(ValidationError, match="缺少'开户银行'列") as exc_info:
+            classify({}, 5)
+        assert exc_info.value.row == 5
+
+    def test_normalizes_each_distinct_bank_text_once(self, monkeypatch):
+        """相同的银行文本只归一化一次，空值每次都报错"""
+        calls = []
+        monkeypatch.setattr(
+            TemplateSelector,
+            "_to_half_width",
+            staticmethod(lambda text: calls.append(text) or text),
+        )
+        selector = TemplateSelector({"template_selector": {}})
+        classify = selector.row_classifier("农业银行", "开户银行")
+
+        keys = [classify({"开户银行": bank}, index) for index, bank in enumerate(["农业银行", "工商银行"] * 3, 1)]
+
+        assert keys == ["default", "special"] * 3
+        assert calls == ["农业银行", "农业银行", "工商银行"]
+        assert classify({"开户银行": 123}, 7) == "special"
+        for row_number in (8, 9):
+            with pytest.raises(ValidationError) as exc_info:
+                classify({"开户银行": ""}, row_number)
+            assert exc_info.value.row == row_number
+
+    def test_group_name_defaults_to_group_key(self):
+        """未配置组名时使用分组键"""
+        selector = TemplateSelector({"template_selector": {"special_group_name": "跨行"}})
+
+        assert selector.group_name("special") == "跨行"
+        assert selector.group_name("default") == "default"
@@ -0,0 +1,70 @@
+"""timings 阶段计时测试。"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from bank_template_processing.timings import StageTimings, collect_timings, current_timings, stage, timed_rows
+
+
+def test_stage_is_noop_without_collector():
+    rows = [1, 2]
+    assert current_timings() is None
+    assert timed_rows(rows, "读取") is rows
+    with stage("填充", 5) as span:
+        span.rows_out = 3
+
+
+def test_nested_stages_record_exclusive_time():
+    with collect_timings() as timings:
+        with stage("分组") as outer:
+            time.sleep(0.02)
+            with stage("读取", 4) as inner:
+                time.sleep(0.05)
+                inner.rows_out = 3
+            outer.rows_in = outer.rows_out = 3
+
+    group, read = timings.records["分组"], timings.records["读取"]
+    assert list(timings.records) == ["读取", "分组"]
+    assert read.wall >= 0.05 > group.wall >= 0.02
+    assert (read.rows_in, read.rows_out, read.calls) == (4, 3, 1)
+    assert read.rows_per_second == pytest.approx(4 / read.wall)
+    assert group.wall + read.wall <= timings.total_wall
+    assert current_timings() is None
+
+
+def test_timed_rows_counts_each_row_and_records_failures():
+    def rows():
+        yield {"a": 1}
+        yield {"a": 2}
+        raise ValueError("坏行")
+
+    with collect_timings() as timings:
+        consumed = []
+        with pytest.raises(ValueError, match="坏行"):
+            for row in timed_rows(rows(), "读取"):
+                consumed.append(row)
+
+    record = timings.records["读取"]
+    assert len(consumed) == 2
+    assert (record.rows_in, record.rows_out, record.calls) == (2, 2, 3)
+
+
+def test_format_table_and_write_json(tmp_path):
+    timings = StageTimings()
+    started = timings.begin()
+    timings.end("保存", started, 10, 10)
+    timings.finish()
+
+    table = timings.format_table()
+    assert table.splitlines()[1].startswith("保存")
+    assert "其他" in table and "总计" in table
+
+    output = timings.write_json(tmp_path / "nested" / "timings.json")
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["stages"][0]["name"] == "保存"
+    assert report["stages"][0]["rows_in"] == 10
+    assert report["total"]["wall_seconds"] >= report["stages"][0]["wall_seconds"]
@@ -0,0 +1,147 @@
+"""transform_registry 转换注册表测试。"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import bank_template_processing.transform_registry as registry
+from bank_template_processing.pipeline import apply_transformations
+from bank_template_processing.transformer import TransformError
+
+
+def make_upper_factory(options, transformer):
+    del transformer
+    suffix = options.get("suffix", "")
+    return lambda value: f"{str(value).upper()}{suffix}"
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+    monkeypatch.setattr(registry, "_entry_points_loaded", False)
+    monkeypatch.setattr(registry, "entry_points", lambda group: [])
+
+
+def test_builtin_transforms_are_bound_once_with_options():
+    transform = registry.resolve_transform("amount_decimal", {"amount_decimal": {"decimal_places": 1}})
+
+    assert transform is not None
+    assert transform("12.345") == Decimal("12.3")
+    assert registry.resolve_transform("none", {}) is None
+
+
+def test_date_format_compiles_output_format_once_per_column(monkeypatch):
+    compiled = []
+    compile_date_formatter = registry.compile_date_formatter
+    monkeypatch.setattr(
+        registry,
+        "compile_date_formatter",
+        lambda output_format: compiled.append(output_format) or compile_date_formatter(output_format),
+    )
+
+    transform = registry.resolve_transform("date_format", {"date_format": {"output_format": "YYYYMMDD"}})
+
+    assert [transform("2024-01-05"), transform("15/01/2024"), transform("2024年2月3日")] == [
+        "20240105",
+        "20240115",
+        "20240203",
+    ]
+    assert compiled == ["YYYYMMDD"]
+    with pytest.raises(TransformError, match="不支持的输出格式"):
+        registry.resolve_transform("date_format", {"date_format": {"output_format": "年-月"}})
+
+
+def test_normalize_width_transform():
+    rows = apply_transformations(
+        [{"银行": "　ＩＣＢＣ　北京 ", "卡号": 6222}],
+        {},
+        {
+            "银行": {"source_column": "银行", "transform": "normalize_width"},
+            "卡号": {"source_column": "卡号", "transform": "normalize_width"},
+        },
+    )
+
+    assert rows == [{"银行": "ICBC 北京", "卡号": 6222}]
+
+    keep_spaces = registry.resolve_transform("normalize_width", {"normalize_width": {"strip": False}})
+    assert keep_spaces is not None
+    assert keep_spaces("　Ａ１　") == " A1 "
+
+
+def test_register_transform_decorator(isolated_registry):
+    registry.register_transform("upper")(make_upper_factory)
+
+    rows = apply_transformations(
+        [{"代码": "abc"}],
+        {"upper": {"suffix": "!"}},
+        {"代码": {"source_column": "代码", "transform": "upper"}},
+    )
+
+    assert rows == [{"代码": "ABC!"}]
+
+
+def test_factory_from_config(isolated_registry):
+    transform = registry.resolve_transform(
+        "upper",
+        {"upper": {"factory": f"{__name__}:make_upper_factory", "suffix": "?"}},
+    )
+
+    assert transform is not None
+    assert transform("x") == "X?"
+
+
+@pytest.mark.parametrize(
+    ("factory_path", "message"),
+    [
+        ("no_colon", "factory 配置无效"),
+        ("missing_module_xyz:func", "factory 无法加载"),
+        (f"{__name__}:__doc__", "factory 不可调用"),
+    ],
+)
+def test_invalid_config_factory_raises(isolated_registry, factory_path, message):
+    with pytest.raises(TransformError, match=message):
+        registry.resolve_transform("custom", {"custom": {"factory": factory_path}})
+
+
+def test_invalid_config_factory_adds_pipeline_context(isolated_registry):
+    with pytest.raises(TransformError, match="数据转换失败：转换类型 'custom' 的 factory 配置无效"):
+        apply_transformations(
+            [{"代码": "abc"}],
+            {"custom": {"factory": "bad"}},
+            {"代码": {"source_column": "代码", "transform": "custom"}},
+        )
+
+
+def test_entry_point_transforms_are_loaded_lazily(monkeypatch, isolated_registry):
+    broken = SimpleNamespace(name="broken", load=lambda: (_ for _ in ()).throw(ImportError("boom")))
+    plugin = SimpleNamespace(name="plugin_upper", load=lambda: make_upper_factory)
+    builtin = SimpleNamespace(name="amount_decimal", load=lambda: pytest.fail("内置类型不应被入口点覆盖"))
+    calls: list[str] = []
+
+    def fake_entry_points(group):
+        calls.append(group)
+        return [broken, plugin, builtin]
+
+    monkeypatch.setattr(registry, "entry_points", fake_entry_points)
+
+    transform = registry.resolve_transform("plugin_upper", {})
+    assert transform is not None
+    assert transform("ok") == "OK"
+    assert registry.resolve_transform("broken", {}) is None
+    assert calls == [registry.ENTRY_POINT_GROUP]
+
+
+def test_unknown_transform_is_ignored_with_warning(isolated_registry, caplog):
+    caplog.set_level("WARNING")
+
+    rows = apply_transformations(
+        [{"代码": "abc"}],
+        {},
+        {"代码": {"source_column": "代码", "transform": "does_not_exist"}},
+    )
+
+    assert rows == [{"代码": "abc"}]
+    assert "未注册的转换类型 'does_not_exist'" in caplog.text
@@ -6,7 +6,8 @@
 
 import pytest
 from datetime import datetime, date
-from bank_template_processing.transformer import Transformer, TransformError
+from decimal import Decimal
+from bank_template_processing.transformer import Transformer, TransformError, compile_date_formatter
 
 
 class TestTransformDate:
@@ -76,55 +77,55 @@ class TestTransformAmount:
         """测试整数金额转换"""
         transformer = Transformer()
         result = transformer.transform_amount(100)
-        assert result == 100.0
+        assert result == Decimal("100.0")
 
     def test_transform_amount_decimal(self):
         """测试带小数的金额转换"""
         transformer = Transformer()
         result = transformer.transform_amount(100.123)
-        assert result == 100.12  # 四舍五入
+        assert result == Decimal("100.12")  # 四舍五入
 
     def test_transform_amount_round_up(self):
         """测试四舍五入（向上）"""
         transformer = Transformer()
         result = transformer.transform_amount(100.125)
-        assert result == 100.13
+        assert result == Decimal("100.13")
 
     def test_transform_amount_round_down(self):
         """测试四舍五入（向下）"""
         transformer = Transformer()
         result = transformer.transform_amount(100.124)
-        assert result == 100.12
+        assert result == Decimal("100.12")
 
     def test_transform_amount_string(self):
         """测试字符串金额转换"""
         transformer = Transformer()
         result = transformer.transform_amount("100.567")
-        assert result == 100.57
+        assert result == Decimal("100.57")
 
     def test_transform_amount_negative(self):
         """测试负数金额转换"""
         transformer = Transformer()
         result = transformer.transform_amount(-100.456)
-        assert result == -100.46
+        assert result == Decimal("-100.46")
 
     def test_transform_amount_custom_decimal_places(self):
         """测试自定义小数位数"""
         transformer = Transformer()
         result = transformer.transform_amount(100.123456, decimal_places=4)
-        assert result == 100.1235
+        assert result == Decimal("100.1235")
 
     def test_transform_amount_rounding_floor(self):
         """测试向下取整（floor）"""
         transformer = Transformer()
         result = transformer.transform_amount(100.129, decimal_places=2, rounding="floor")
-        assert result == 100.12
+        assert result == Decimal("100.12")
 
     def test_transform_amount_rounding_ceil(self):
         """测试向上取整（ceil）"""
         transformer = Transformer()
         result = transformer.transform_amount(100.121, decimal_places=2, rounding="ceil")
-        assert result == 100.13
+        assert result == Decimal("100.13")
 
     def test_transform_amount_empty_value(self):
         """测试空值转换失败"""
@@ -268,8 +269,67 @@ class TestTransformerIntegration:
 
         # 金额转换
         amount = transformer.transform_amount("1000.456")
-        assert amount == 1000.46
+        assert amount == Decimal("1000.46")
 
         # 卡号转换
         card = transformer.transform_card_number("6222-0212-3456-7890-128")
         assert card == "6222021234567890128"
+
+
+class TestDateOutputFormat:
+    """测试日期输出格式编译"""
+
+    @pytest.mark.parametrize(
+        ("output_format", "expected"),
+        [
+            ("YYYY-MM-DD", "2024-01-05"),
+            ("YYYYMMDD", "20240105"),
+            ("YYYY/MM/DD", "2024/01/05"),
+            ("YYYY年M月D日", "2024年1月5日"),
+            ("YY.MM.DD%", "24.01.05%"),
+        ],
+    )
+    def test_transform_date_custom_output_format(self, output_format, expected):
+        """测试可配置的输出格式"""
+        transformer = Transformer()
+        assert transformer.transform_date("2024-1-5", output_format) == expected
+        assert transformer.transform_date(date(2024, 1, 5), output_format) == expected
+
+    def test_formatter_matches_strftime(self):
+        """测试格式化结果与 strftime 一致"""
+        formatter = compile_date_formatter("YYYY-MM-DD")
+        for value in (date(1, 1, 1), date(999, 12, 31), date(2024, 2, 29), datetime(9999, 12, 31, 23, 59)):
+            assert formatter(value) == f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+
+    def test_formatter_is_compiled_once(self):
+        """测试相同格式复用同一个格式化器"""
+        assert compile_date_formatter("YYYYMMDD") is compile_date_formatter("YYYYMMDD")
+
+    @pytest.mark.parametrize(
+        ("output_format", "expected"),
+        [
+            ("[Date:] YYYY-MM-DD", "Date: 2024-01-05"),
+            ("YYYY[ MD ]M[%]D", "2024 MD 1%5"),
+            ("[]YYYYMMDD[]", "20240105"),
+        ],
+    )
+    def test_bracketed_text_is_literal(self, output_format, expected):
+        """测试方括号内的文本原样输出"""
+        assert compile_date_formatter(output_format)(date(2024, 1, 5)) == expected
+
+    def test_unbracketed_token_letters_are_replaced(self):
+        """测试未加方括号的 D、M 仍按占位符替换"""
+        assert compile_date_formatter("Date: YYYY-MM-DD")(date(2024, 1, 5)) == "5ate: 2024-01-05"
+
+    @pytest.mark.parametrize("output_format", ["[Date: YYYY-MM-DD", "YYYY]MM", "[[x]]YYYY"])
+    def test_unbalanced_brackets_are_rejected(self, output_format):
+        """测试方括号不成对的格式被拒绝"""
+        with pytest.raises(TransformError, match="方括号不成对"):
+            compile_date_formatter(output_format)
+
+    @pytest.mark.parametrize("output_format", ["", "yyyy-mm-dd", None, ["YYYY"], "[YYYY-MM-DD]"])
+    def test_unsupported_output_format(self, output_format):
+        """测试不含日期占位符的格式被拒绝"""
+        transformer = Transformer()
+        with pytest.raises(TransformError, match="不支持的输出格式"):
+            transformer.transform_date("2024-01-05", output_format)
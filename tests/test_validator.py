@@ -4,7 +4,10 @@
 
 import pytest
 from datetime import datetime
-from bank_template_processing.validator import Validator, ValidationError
+from decimal import Decimal
+from bank_template_processing.amount import FixedAmount
+from bank_template_processing import validator as validator_module
+from bank_template_processing.validator import CrossRowRule, Validator, ValidationError
 
 
 class TestValidateRequired:
@@ -315,6 +318,178 @@ class TestValidateValueRanges:
         Validator.validate_value_ranges(row, range_rules)
 
 
+class TestCompiledValidationPlan:
+    """测试 Validator.compile 生成的校验计划"""
+
+    def test_bounds_are_parsed_once(self, monkeypatch):
+        """范围边界只在编译时解析一次"""
+        calls = []
+        original = Validator._coerce_comparison_bounds
+
+        def counting(min_val, max_val):
+            calls.append((min_val, max_val))
+            return original(min_val, max_val)
+
+        monkeypatch.setattr(Validator, "_coerce_comparison_bounds", staticmethod(counting))
+        plan = Validator.compile({"value_ranges": {"amount": {"min": "0", "max": "100"}}})
+
+        for amount in ("1", "50.5", 99):
+            plan.validate({"amount": amount})
+
+        assert calls == [("0", "100")]
+        with pytest.raises(ValidationError, match="大于最大值 100"):
+            plan.validate({"amount": "100.01"})
+
+    def test_plan_runs_rules_in_order(self):
+        """计划按必填字段、数据类型、值范围的顺序校验"""
+        plan = Validator.compile(
+            {
+                "required_fields": ["name"],
+                "data_types": {"age": "Integer", "joined": "date"},
+                "value_ranges": {"age": {"min": 18}},
+            }
+        )
+
+        plan.validate({"name": "张三", "age": "30", "joined": "2024-01-01"})
+        with pytest.raises(ValidationError, match="必填字段 'name' 不存在"):
+            plan.validate({"age": "x"})
+        with pytest.raises(ValidationError, match="不是有效数值"):
+            plan.validate({"name": "张三", "age": "x"})
+        with pytest.raises(ValidationError, match="小于最小值 18"):
+            plan.validate({"name": "张三", "age": 17})
+
+    def test_invalid_rules_are_reported_when_field_is_checked(self):
+        """规则配置错误在校验到对应字段时才报告"""
+        plan = Validator.compile(
+            {
+                "data_types": {"code": "unknown"},
+                "value_ranges": {"amount": {"min": 1, "max": "2024-01-01"}},
+            }
+        )
+
+        plan.validate({"code": "", "amount": None})
+        with pytest.raises(ValidationError, match="类型不支持: unknown"):
+            plan.validate({"code": "A"})
+        with pytest.raises(ValidationError, match="范围规则无效"):
+            plan.validate({"amount": 1})
+
+    def test_fixed_amount_passes_numeric_type_and_range_checks(self):
+        """金额转换产出的定点金额按数值校验"""
+        plan = Validator.compile(
+            {
+                "data_types": {"amount": "float", "total": "numeric", "count": "integer"},
+                "value_ranges": {"amount": {"max": "100.55"}},
+            }
+        )
+
+        plan.validate({"amount": FixedAmount(10055, 2), "total": FixedAmount(1, 3), "count": FixedAmount(200, 2)})
+        with pytest.raises(ValidationError, match="类型应为 integer"):
+            plan.validate({"count": FixedAmount(201, 2)})
+        with pytest.raises(ValidationError, match="大于最大值 100.55"):
+            plan.validate({"amount": FixedAmount(100551, 3)})
+
+    def test_legacy_wrappers_reuse_compiled_plan(self, monkeypatch):
+        """旧版逐行接口对同一规则只编译一次，规则被修改后重新编译"""
+        compiled = []
+        original = Validator.compile
+
+        def counting(rules):
+            compiled.append(rules)
+            return original(rules)
+
+        monkeypatch.setattr(Validator, "compile", staticmethod(counting))
+        monkeypatch.setattr(validator_module, "_plan_cache", {})
+        range_rules = {"amount": {"min": 0, "max": 100, "allowed_values": [1, 2, 99]}}
+
+        for amount in (1, 2, 99):
+            Validator.validate_value_ranges({"amount": amount}, range_rules)
+            Validator.validate_required({"name": "张三"}, ["name"])
+        assert len(compiled) == 2
+
+        range_rules["amount"]["allowed_values"].append(3)
+        Validator.validate_value_ranges({"amount": 3}, range_rules)
+        assert len(compiled) == 3
+
+        Validator.validate_data_types({"flag": True}, {"flag": "bool"})
+        with pytest.raises(ValidationError, match="类型应为 int"):
+            Validator.validate_data_types({"flag": True}, {"flag": "int"})
+
+    def test_legacy_wrappers_accept_unhashable_rule_values(self):
+        """规则包含不可哈希的值时仍可校验"""
+        with pytest.raises(ValidationError, match="不在允许的值列表中"):
+            Validator.validate_value_ranges({"code": "C"}, {"code": {"allowed_values": {"A", "B"}}})
+
+    def test_empty_plan_is_falsy(self):
+        """没有规则时计划为假值"""
+        assert not Validator.compile({})
+        assert Validator.compile({"required_fields": ["name"]})
+        assert Validator.compile({"max_rows_per_file": 10})
+
+
+class TestCrossRowRules:
+    """测试唯一性、累计上限与单文件行数上限等跨行规则"""
+
+    def test_unique_reports_every_duplicate_with_first_row(self):
+        """重复值逐个报告，并指出首次出现的行；空值不参与比较"""
+        cross_row = Validator.compile({"unique_fields": ["card"]}).start_cross_row()
+        rows = [{"card": "6222"}, {"card": ""}, {"card": ""}, {"card": "6222"}, {"card": "6222"}, {}]
+
+        errors = [cross_row.collect(row) for row in rows]
+
+        assert [len(found) for found in errors] == [0, 0, 0, 1, 1, 0]
+        assert str(errors[3][0]) == "字段 'card' 的值 6222 与第 1 条数据重复"
+        assert (errors[3][0].field, errors[3][0].rule, errors[3][0].value) == ("card", "unique", "6222")
+
+    def test_cross_row_rule_requires_start(self):
+        """未实现 start 的子类在实例化时即报错"""
+
+        class Incomplete(CrossRowRule):
+            __slots__ = ()
+
+        with pytest.raises(TypeError, match="abstract method 'start'"):
+            Incomplete("card")
+
+    def test_max_total_accumulates_exactly_and_reports_once(self):
+        """累计值精确累加，超过上限时只在越界的那一行报告一次"""
+        plan = Validator.compile({"max_total": {"amount": "0.3"}})
+        cross_row = plan.start_cross_row()
+
+        for value in (0.1, "0.2", None, "x"):
+            cross_row.check({"amount": value})
+        with pytest.raises(ValidationError, match="累计值 0.4 超过上限 0.3") as exc_info:
+            cross_row.check({"amount": Decimal("0.1")})
+        assert exc_info.value.rule == "max_total"
+        assert cross_row.collect({"amount": 5}) == []
+
+    def test_max_rows_per_file_fails_on_first_extra_row(self):
+        """行数上限在第 limit+1 行报告"""
+        cross_row = Validator.compile({"max_rows_per_file": 2}).start_cross_row()
+
+        assert cross_row.collect({}) == []
+        assert cross_row.collect({}) == []
+        (error,) = cross_row.collect({})
+        assert (str(error), error.rule, error.field) == ("数据行数超过单个文件上限 2", "max_rows_per_file", None)
+        assert cross_row.collect({}) == []
+
+    def test_each_pass_starts_with_fresh_state(self):
+        """每次遍历独立维护状态，计划本身可重复使用"""
+        plan = Validator.compile({"unique_fields": ["card"]})
+
+        for _ in range(2):
+            cross_row = plan.start_cross_row()
+            cross_row.check({"card": "1"})
+            with pytest.raises(ValidationError, match="重复"):
+                cross_row.check({"card": "1"})
+
+    def test_per_row_validation_ignores_cross_row_rules(self):
+        """plan.validate 只执行逐行规则"""
+        plan = Validator.compile({"unique_fields": ["card"], "max_rows_per_file": 1})
+
+        plan.validate({"card": "1"})
+        plan.validate({"card": "1"})
+        assert plan.fields == ("card",)
+
+
 class TestValidationErrorValidation:
     """测试 ValidationError 异常类"""
 
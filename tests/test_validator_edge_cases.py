@@ -7,7 +7,7 @@ from decimal import Decimal
 
 import pytest
 
-from bank_template_processing.validator import ValidationError, Validator
+from bank_template_processing.validator import ValidationError, Validator, _AllowedValues
 
 
 def test_parse_date_string_invalid_raises():
@@ -61,37 +61,52 @@ def test_coerce_for_comparison_uses_date_branch():
     assert max_cmp == date(2026, 1, 31)
 
 
-def test_normalize_allowed_values_non_list_returns_raw():
-    value, allowed, use_normalized = Validator._normalize_allowed_values("状态", "A", {"A": 1})
-    assert value == "A"
-    assert allowed == {"A": 1}
-    assert use_normalized is False
+def test_allowed_values_non_list_uses_raw_membership():
+    allowed = _AllowedValues("状态", {"A": 1})
+    assert allowed.contains("A")
+    assert not allowed.contains("B")
 
 
-def test_normalize_allowed_values_date_item_parse_fallback():
-    normalized_value, normalized_allowed, use_normalized = Validator._normalize_allowed_values(
-        "日期",
-        "2026-01-10",
-        ["2026-01-10", "not-a-date"],
-    )
-    assert use_normalized is True
-    assert normalized_value == date(2026, 1, 10)
-    assert normalized_allowed[0] == date(2026, 1, 10)
-    assert normalized_allowed[1] == "not-a-date"
+def test_allowed_values_date_item_parse_fallback(caplog):
+    caplog.set_level("WARNING")
+    allowed = _AllowedValues("日期", ["2026-01-10", "not-a-date"])
+
+    assert allowed.dates == frozenset({date(2026, 1, 10)})
+    assert allowed.contains("2026-01-10")
+    assert allowed.contains(date(2026, 1, 10))
+    assert allowed.contains("not-a-date")
+    assert not allowed.contains("2026-01-11")
+    assert caplog.text.count("日期值无法解析") == 1
+
+
+def test_allowed_values_numeric_fallbacks():
+    # allowed_values 中无任何可转数值项 -> 只按原值比较
+    allowed = _AllowedValues("金额", ["A", "B"])
+    assert allowed.numeric == frozenset()
+    assert not allowed.contains("100")
+
+    # value 不可归一化 -> 只按原值比较
+    allowed = _AllowedValues("金额", [100, 200])
+    assert allowed.numeric == frozenset({Decimal("100"), Decimal("200")})
+    assert allowed.contains("100.0")
+    assert not allowed.contains("ABC")
+
 
+def test_allowed_values_unhashable_items_and_values():
+    allowed = _AllowedValues("标签", [["a"], "b", float("nan")])
 
-def test_normalize_allowed_values_numeric_fallbacks():
-    # value 可归一化，但 allowed_values 中无任何可转数值项 -> 回退原值比较
-    value, allowed, use_normalized = Validator._normalize_allowed_values("金额", "100", ["A", "B"])
-    assert value == "100"
-    assert allowed == ["A", "B"]
-    assert use_normalized is False
+    assert allowed.contains(["a"])
+    assert allowed.contains("b")
+    assert not allowed.contains({"x": 1})
+    assert not allowed.contains("NaN")
 
-    # value 不可归一化 -> 直接回退原值比较
-    value, allowed, use_normalized = Validator._normalize_allowed_values("金额", "ABC", [100, 200])
-    assert value == "ABC"
-    assert allowed == [100, 200]
-    assert use_normalized is False
+
+def test_allowed_values_datetime_mode():
+    allowed = _AllowedValues("时间", [datetime(2026, 1, 10, 8, 30), "2026-01-11"])
+
+    assert allowed.contains(datetime(2026, 1, 10, 8, 30))
+    assert allowed.contains("2026-01-11")
+    assert not allowed.contains("2026-01-10")
 
 
 def test_validate_data_types_extra_error_paths():
@@ -140,3 +155,14 @@ def test_validate_value_ranges_length_type_error_and_allowed_normalized_error():
 
     with pytest.raises(ValidationError, match="不在允许的值列表"):
         Validator.validate_value_ranges({"字段": "101"}, {"字段": {"allowed_values": [100, 200]}})
+
+
+def test_date_range_bounds_do_not_raise_internal_validation_errors(caplog):
+    caplog.set_level("ERROR")
+
+    Validator.validate_value_ranges(
+        {"日期": "2026-01-10"},
+        {"日期": {"min": "2026-01-01", "max": "2026-01-31"}},
+    )
+
+    assert "验证错误" not in caplog.text